@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, TypeVar
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic_ledgers import add_generator_arguments, generate_from_args  # noqa: E402
+
+from qms_monitor.csv_io import load_csv_manifest_bundle, read_csv_rows  # noqa: E402
+from qms_monitor.ledger_reader import read_ledger_events  # noqa: E402
+from qms_monitor.models import QmsEvent  # noqa: E402
+from qms_monitor.overdue_excel_exporter import export_overdue_events_excel  # noqa: E402
+from qms_monitor.report_renderer import render_markdown_report  # noqa: E402
+from qms_monitor.stats import build_local_stats, build_topic_stats, topic_group_key  # noqa: E402
+
+
+T = TypeVar("T")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time the CSV-mode pipeline stages on synthetic ledgers")
+    parser.add_argument("--manifest", default="", help="已有的 manifest.json；不指定时按下列参数生成合成台账")
+    parser.add_argument("--work-dir", default="", help="合成台账与报告的输出目录，默认临时目录（运行后删除）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段重复次数，取最短耗时，默认 3")
+    parser.add_argument("--output", default="bench_csv_pipeline.json", help="结果JSON路径")
+    parser.add_argument("--compare", default="", help="与之前的结果JSON对比并打印各阶段耗时变化")
+    parser.add_argument(
+        "--end-to-end",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="额外计时一次完整的 main.py --input-mode csv --skip-llm 运行",
+    )
+    add_generator_arguments(parser)
+    return parser.parse_args()
+
+
+def timed(repeat: int, func: Callable[[], T]) -> tuple[float, T]:
+    best = float("inf")
+    result: Any = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.stdout.strip()
+
+
+def run_stages(manifest_path: Path, work_dir: Path, report_date: date, repeat: int) -> dict[str, dict[str, Any]]:
+    stages: dict[str, dict[str, Any]] = {}
+    configs, csv_map, csv_encodings, open_status_rules, _ = load_csv_manifest_bundle(manifest_path)
+    ledgers = [cfg for cfg in configs if cfg.row_no in csv_map]
+
+    def read_all() -> list[list[list[str]]]:
+        tables = []
+        for cfg in ledgers:
+            rows, err = read_csv_rows(csv_map[cfg.row_no], csv_encodings.get(cfg.row_no))
+            if err:
+                raise RuntimeError(err)
+            tables.append(rows)
+        return tables
+
+    seconds, tables = timed(repeat, read_all)
+    row_count = sum(len(rows) for rows in tables)
+    stages["read_csv_rows"] = {"seconds": seconds, "rows": row_count}
+
+    def parse_all() -> list[tuple[str, list[QmsEvent]]]:
+        return [(cfg.module, read_ledger_events(cfg, source_rows=rows)[0]) for cfg, rows in zip(ledgers, tables)]
+
+    seconds, parsed = timed(repeat, parse_all)
+    del tables
+    grouped: dict[str, list[QmsEvent]] = defaultdict(list)
+    for module, events in parsed:
+        grouped[module].extend(events)
+    del parsed
+    event_count = sum(len(events) for events in grouped.values())
+    stages["read_ledger_events"] = {"seconds": seconds, "events": event_count}
+
+    def local_all() -> dict[str, dict[str, Any]]:
+        return {
+            module: build_local_stats(module, events, report_date, open_status_rules)
+            for module, events in grouped.items()
+        }
+
+    seconds, module_local_results = timed(repeat, local_all)
+    stages["build_local_stats"] = {"seconds": seconds, "modules": len(module_local_results)}
+
+    topic_events: dict[str, list[QmsEvent]] = defaultdict(list)
+    for events in grouped.values():
+        for event in events:
+            topic_events[topic_group_key(event.topic)].append(event)
+
+    def topic_all() -> dict[str, dict[str, Any]]:
+        return {
+            topic: build_topic_stats(topic, events, report_date, open_status_rules)
+            for topic, events in topic_events.items()
+        }
+
+    seconds, topic_results = timed(repeat, topic_all)
+    stages["build_topic_stats"] = {"seconds": seconds, "topics": len(topic_results)}
+    del topic_events, grouped
+
+    seconds, report_text = timed(
+        repeat,
+        lambda: render_markdown_report(report_date, manifest_path, topic_results, [], len(ledgers), 0),
+    )
+    stages["render_markdown_report"] = {"seconds": seconds, "chars": len(report_text)}
+
+    excel_path = work_dir / "bench_overdue.xlsx"
+    seconds, overdue_count = timed(
+        repeat,
+        lambda: export_overdue_events_excel(excel_path, module_local_results, topic_results),
+    )
+    stages["export_overdue_events_excel"] = {
+        "seconds": seconds,
+        "overdue_events": overdue_count,
+        "bytes": excel_path.stat().st_size,
+    }
+    return stages
+
+
+def run_end_to_end(manifest_path: Path, work_dir: Path, report_date: date) -> dict[str, Any]:
+    command = [
+        sys.executable,
+        str(REPO_ROOT / "main.py"),
+        "--input-mode",
+        "csv",
+        "--csv-manifest",
+        str(manifest_path),
+        "--output-dir",
+        str(work_dir / "outputs"),
+        "--report-date",
+        report_date.isoformat(),
+        "--skip-llm",
+        "--no-event-cache",
+        "--no-profile",
+    ]
+    t0 = time.perf_counter()
+    proc = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+    return {"seconds": time.perf_counter() - t0, "returncode": proc.returncode}
+
+
+def print_comparison(current: dict[str, Any], previous_path: Path) -> None:
+    previous = json.loads(previous_path.read_text(encoding="utf-8"))
+    print(f"对比 {previous_path}（{previous.get('git_revision') or '未知版本'} -> {current['git_revision'] or '未知版本'}）:")
+    for name, stage in current["stages"].items():
+        before = previous.get("stages", {}).get(name, {}).get("seconds")
+        if not before:
+            print(f"  {name:<30} {stage['seconds']:.3f}s（无历史数据）")
+            continue
+        change = (stage["seconds"] / before - 1) * 100
+        print(f"  {name:<30} {before:.3f}s -> {stage['seconds']:.3f}s（{change:+.1f}%）")
+
+
+def run(args: argparse.Namespace, work_dir: Path) -> int:
+    try:
+        report_date = datetime.strptime(args.report_date, "%Y-%m-%d").date()
+    except ValueError:
+        print("--report-date 格式必须是 YYYY-MM-DD", file=sys.stderr)
+        return 1
+
+    if args.manifest:
+        manifest_path = Path(args.manifest)
+        generator = None
+    else:
+        t0 = time.perf_counter()
+        manifest_path = generate_from_args(work_dir / "csv_cache", args)
+        print(f"合成台账生成耗时 {time.perf_counter() - t0:.2f}s: {manifest_path}")
+        generator = json.loads(manifest_path.read_text(encoding="utf-8"))["synthetic"]
+
+    stages = run_stages(manifest_path, work_dir, report_date, args.repeat)
+    if args.end_to_end:
+        stages["end_to_end"] = run_end_to_end(manifest_path, work_dir, report_date)
+
+    result = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "manifest": str(manifest_path) if generator is None else None,
+        "synthetic": generator,
+        "report_date": report_date.isoformat(),
+        "repeat": args.repeat,
+        "stages": stages,
+    }
+    for name, stage in stages.items():
+        print(f"{name:<30} {stage['seconds']:.3f}s")
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"结果已写入 {output_path}")
+
+    if args.compare:
+        print_comparison(result, Path(args.compare))
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+    if args.work_dir:
+        work_dir = Path(args.work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        return run(args, work_dir)
+    with tempfile.TemporaryDirectory(prefix="qms_bench_") as tmp:
+        return run(args, Path(tmp))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
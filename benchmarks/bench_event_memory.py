@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from qms_monitor.ledger_reader import iter_ledger_events  # noqa: E402
+from qms_monitor.models import LedgerConfig  # noqa: E402
+from qms_monitor.parsers import get_cell, parse_date_cell  # noqa: E402
+
+
+# QmsEvent before the compact representation: dict-backed dataclass, every cell its own string.
+@dataclass
+class PlainEvent:
+    topic: str
+    module: str
+    year: str
+    event_id: str
+    content: str
+    initiated_date: date | None
+    planned_date: date | None
+    status: str
+    owner_dept: str
+    owner: str
+    qa: str
+    qa_manager: str
+    source_file: str
+    source_sheet: str
+    row_index: int
+
+
+LEDGER = LedgerConfig(
+    row_no=2,
+    topic="偏差",
+    module="偏差管理",
+    year="2024",
+    file_path="D:/ledgers/偏差管理.xlsx",
+    sheet_name="Sheet1",
+    id_col=0,
+    content_col=1,
+    initiated_col=2,
+    planned_col=3,
+    status_col=4,
+    owner_dept_col=5,
+    owner_col=6,
+    qa_col=7,
+    qa_manager_col=8,
+    open_status_value="进行中",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure retained bytes per parsed ledger event")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="合成台账行数，默认 1000000")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+def iter_rows(count: int, seed: int) -> Iterator[list[str]]:
+    # Each cell is built fresh, as csv.reader / openpyxl-style readers hand them over.
+    rng = random.Random(seed)
+    statuses = ["进行中", "已完成", "已关闭"]
+    depts = [f"部门{i}" for i in range(15)]
+    people = [f"人员{i}" for i in range(200)]
+    managers = [f"经理{i}" for i in range(20)]
+    start = date(2015, 1, 1)
+    yield ["编号", "内容", "发起日期", "计划完成日期", "状态", "责任部门", "责任人", "QA", "QA经理"]
+    for idx in range(count):
+        initiated = start + timedelta(days=rng.randint(0, 3650))
+        planned = initiated + timedelta(days=rng.randint(7, 90))
+        yield [
+            f"DEV-{idx:07d}",
+            f"偏差描述{rng.randint(0, 100000)}",
+            f"{initiated.year}/{initiated.month}/{initiated.day}",
+            f"{planned.year}/{planned.month}/{planned.day}",
+            f"{rng.choice(statuses)} ",
+            f"{rng.choice(depts)}",
+            f"{rng.choice(people)}",
+            f"{rng.choice(people[:40])}",
+            f"{rng.choice(managers)}",
+        ]
+
+
+def build_plain_events(rows: Iterator[list[str]]) -> list[PlainEvent]:
+    cfg = LEDGER
+    next(rows)
+    events: list[PlainEvent] = []
+    for row_idx, row in enumerate(rows, start=2):
+        events.append(
+            PlainEvent(
+                topic=cfg.topic,
+                module=cfg.module,
+                year=cfg.year,
+                event_id=get_cell(row, cfg.id_col),
+                content=get_cell(row, cfg.content_col),
+                initiated_date=parse_date_cell(get_cell(row, cfg.initiated_col)),
+                planned_date=parse_date_cell(get_cell(row, cfg.planned_col)),
+                status=get_cell(row, cfg.status_col),
+                owner_dept=get_cell(row, cfg.owner_dept_col),
+                owner=get_cell(row, cfg.owner_col),
+                qa=get_cell(row, cfg.qa_col),
+                qa_manager=get_cell(row, cfg.qa_manager_col),
+                source_file=cfg.file_path,
+                source_sheet=cfg.sheet_name,
+                row_index=row_idx,
+            )
+        )
+    return events
+
+
+def build_compact_events(rows: Iterator[list[str]]) -> list:
+    return list(iter_ledger_events(LEDGER, rows, []))
+
+
+def measure(build: Callable[[Iterator[list[str]]], list], rows: int, seed: int) -> tuple[float, float]:
+    # The untraced run gives the timing and warms the date memo shared by both builders,
+    # so the traced run counts only what the events themselves keep alive.
+    t0 = time.perf_counter()
+    events = build(iter_rows(rows, seed))
+    seconds = time.perf_counter() - t0
+    del events
+    gc.collect()
+
+    tracemalloc.start()
+    events = build(iter_rows(rows, seed))
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_event = retained / max(1, len(events))
+    del events
+    gc.collect()
+    return per_event, seconds
+
+
+def main() -> int:
+    args = parse_args()
+    plain_bytes, plain_seconds = measure(build_plain_events, args.rows, args.seed)
+    print(f"dataclass（无 slots，不驻留字符串）: {plain_bytes:.0f} B/事件，构建 {plain_seconds:.2f}s")
+    compact_bytes, compact_seconds = measure(build_compact_events, args.rows, args.seed)
+    print(f"QmsEvent（slots + 字符串驻留）: {compact_bytes:.0f} B/事件，构建 {compact_seconds:.2f}s")
+    print(f"内存节省: {(1 - compact_bytes / plain_bytes) * 100:.1f}%（{args.rows} 行）")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
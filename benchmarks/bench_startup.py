@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_csv_pipeline import REPO_ROOT, git_revision, print_comparison  # noqa: E402
+from synthetic_ledgers import generate_csv_cache  # noqa: E402
+
+
+# Packages only the LLM/PDF stages, the process pools (--workers/--excel-workers) and the
+# event cache need.
+HEAVY_PACKAGES = ("openai", "httpx", "pydantic", "reportlab", "markdown", "bs4", "multiprocessing", "mmap")
+LLM_PACKAGES = ("openai", "httpx", "pydantic")
+# Packages each scenario must not load; the benchmark exits non-zero if one shows up.
+MUST_NOT_LOAD = {
+    "import_app": (*LLM_PACKAGES, "multiprocessing"),
+    "import_csv_cache_exporter": (*LLM_PACKAGES, "multiprocessing"),
+    "cli_help": (*LLM_PACKAGES, "multiprocessing"),
+    "csv_skip_llm": (*LLM_PACKAGES, "multiprocessing", "mmap"),
+}
+TOP_MODULES = 10
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure CLI startup with python -X importtime")
+    parser.add_argument("--repeat", type=int, default=5, help="每个场景重复次数，取最短耗时，默认 5")
+    parser.add_argument("--output", default="bench_startup.json", help="结果JSON路径")
+    parser.add_argument("--compare", default="", help="与之前的结果JSON对比并打印各场景耗时变化")
+    parser.add_argument("--rows", type=int, default=200, help="csv 场景每个合成台账的行数，默认 200")
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    # Lines look like "import time:  self [us] |  cumulative | <indent>package"; indent is two spaces per level.
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|", 2)
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2][1:]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        modules.append((name.strip(), depth, int(parts[0]), int(parts[1])))
+    return modules
+
+
+def run_scenario(command: list[str], repeat: int, env: dict[str, str]) -> dict[str, Any]:
+    best: dict[str, Any] | None = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *command],
+            cwd=REPO_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        seconds = time.perf_counter() - t0
+        if proc.returncode != 0:
+            raise RuntimeError(f"命令失败（{proc.returncode}）: {' '.join(command)}\n{proc.stderr[-2000:]}")
+        if best is not None and seconds >= best["seconds"]:
+            continue
+        modules = parse_importtime(proc.stderr)
+        top_level = sorted((m for m in modules if m[1] == 0), key=lambda m: m[3], reverse=True)
+        loaded = {name.split(".", 1)[0] for name, _, _, _ in modules}
+        best = {
+            "seconds": seconds,
+            "import_seconds": sum(m[2] for m in modules) / 1_000_000,
+            "modules": len(modules),
+            "heavy_packages": [pkg for pkg in HEAVY_PACKAGES if pkg in loaded],
+            "top_imports": [[name, cumulative / 1_000_000] for name, _, _, cumulative in top_level[:TOP_MODULES]],
+        }
+    assert best is not None
+    return best
+
+
+def run(args: argparse.Namespace, work_dir: Path) -> int:
+    manifest_path = generate_csv_cache(work_dir / "csv_cache", configs=5, rows=args.rows)
+    scenarios = {
+        "import_app": ["-c", "import qms_monitor.app"],
+        "import_csv_cache_exporter": ["-c", "import qms_monitor.csv_cache_exporter"],
+        "cli_help": [str(REPO_ROOT / "main.py"), "--help"],
+        "csv_skip_llm": [
+            str(REPO_ROOT / "main.py"),
+            "--input-mode",
+            "csv",
+            "--csv-manifest",
+            str(manifest_path),
+            "--output-dir",
+            str(work_dir / "outputs"),
+            "--report-date",
+            "2025-06-30",
+            "--skip-llm",
+            "--no-event-cache",
+            "--no-profile",
+        ],
+    }
+
+    # Keep the PDF export cache out of the repository.
+    env = {**os.environ, "QMS_PDF_CACHE_DIR": str(work_dir / "pdf_cache")}
+    stages: dict[str, dict[str, Any]] = {}
+    unexpected: list[str] = []
+    for name, command in scenarios.items():
+        stages[name] = run_scenario(command, args.repeat, env)
+        stage = stages[name]
+        heavy = ",".join(stage["heavy_packages"]) or "-"
+        print(
+            f"{name:<30} {stage['seconds']:.3f}s  导入 {stage['import_seconds']:.3f}s"
+            f"（{stage['modules']} 个模块，重型依赖: {heavy}）"
+        )
+        loaded = [pkg for pkg in MUST_NOT_LOAD.get(name, ()) if pkg in stage["heavy_packages"]]
+        if loaded:
+            unexpected.append(f"{name}: {','.join(loaded)}")
+
+    result = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "stages": stages,
+    }
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"结果已写入 {output_path}")
+
+    if args.compare:
+        print_comparison(result, Path(args.compare))
+    if unexpected:
+        print(f"以下场景加载了本应延迟导入的依赖: {'; '.join(unexpected)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="qms_startup_") as tmp:
+        return run(args, Path(tmp))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
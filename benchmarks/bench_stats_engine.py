@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from qms_monitor.columnar_stats import (  # noqa: E402
+    EventTable,
+    build_local_stats_columnar,
+    build_overdue_event_records_columnar,
+    build_topic_stats_columnar,
+)
+from qms_monitor.event_cache import EventColumns  # noqa: E402
+from qms_monitor.models import LedgerConfig, QmsEvent  # noqa: E402
+from qms_monitor.stats import build_report_stats, topic_group_key  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare the list and columnar statistics engines")
+    parser.add_argument("--events", type=int, default=1_000_000, help="合成事件数，默认 1000000")
+    parser.add_argument("--modules", type=int, default=12, help="模块数")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--report-date", default="2025-06-30")
+    return parser.parse_args()
+
+
+def make_events(count: int, modules: int, seed: int) -> tuple[list[QmsEvent], dict[str, str]]:
+    rng = random.Random(seed)
+    topics = ["变更", "偏差", "OOS", "CAPA", " 投诉"]
+    statuses = ["进行中", "已完成", "已关闭", "进行中 "]
+    depts = [f"部门{i}" for i in range(15)]
+    people = [f"人员{i}" for i in range(200)] + [""]
+    managers = [f"经理{i}" for i in range(20)] + [""]
+    start = date(2021, 1, 1)
+    events: list[QmsEvent] = []
+    for idx in range(count):
+        module = f"模块{idx % modules}"
+        initiated = start + timedelta(days=rng.randint(0, 1600)) if rng.random() > 0.02 else None
+        planned = initiated + timedelta(days=rng.randint(-5, 90)) if initiated and rng.random() > 0.05 else None
+        events.append(
+            QmsEvent(
+                topic=topics[idx % modules % len(topics)],
+                module=module,
+                year=str(2021 + idx % 4),
+                event_id=f"E{idx:07d}",
+                content=f"内容{rng.randint(0, 5000)}",
+                initiated_date=initiated,
+                planned_date=planned,
+                status=rng.choice(statuses),
+                owner_dept=rng.choice(depts),
+                owner=rng.choice(people),
+                qa=rng.choice(people[:40] + [""]),
+                qa_manager=rng.choice(managers),
+                source_file=f"D:/ledgers/{module}.xlsx",
+                source_sheet="Sheet1",
+                row_index=idx + 2,
+            )
+        )
+    rules = {f"模块{i}": "进行中" for i in range(modules)}
+    return events, rules
+
+
+def split_ledgers(events: list[QmsEvent]) -> list[EventColumns]:
+    by_module: dict[str, list[QmsEvent]] = defaultdict(list)
+    for event in events:
+        by_module[event.module].append(event)
+    ledgers = []
+    for row_no, (module, items) in enumerate(by_module.items(), start=2):
+        first = items[0]
+        cfg = LedgerConfig(
+            row_no=row_no,
+            topic=first.topic,
+            module=module,
+            year=first.year,
+            file_path=first.source_file,
+            sheet_name=first.source_sheet,
+            id_col=0,
+            content_col=1,
+            initiated_col=2,
+        )
+        ledgers.append(EventColumns.from_events(cfg, items, []))
+    return ledgers
+
+
+def run_list_engine(events: list[QmsEvent], report_date: date, rules: dict[str, str]) -> dict:
+    grouped: dict[str, list[QmsEvent]] = defaultdict(list)
+    for event in events:
+        grouped[event.module].append(event)
+    modules, topics = build_report_stats(grouped, report_date, rules)
+    return {"modules": modules, "topics": topics}
+
+
+def run_columnar_engine(table: EventTable, report_date: date, rules: dict[str, str]) -> dict:
+    module_rows = table.group_rows("module")
+    modules = {}
+    topic_rows: dict[str, list[int]] = defaultdict(list)
+    for module, rows in module_rows.items():
+        modules[module] = build_local_stats_columnar(module, table, rows, report_date, rules)
+        for topic, topic_part in table.group_rows("topic", rows, key=topic_group_key).items():
+            topic_rows[topic].extend(topic_part)
+    topics = {
+        topic: (
+            build_topic_stats_columnar(topic, table, rows, report_date, rules),
+            build_overdue_event_records_columnar(table, rows, report_date, rules),
+        )
+        for topic, rows in topic_rows.items()
+    }
+    return {"modules": modules, "topics": topics}
+
+
+def main() -> int:
+    args = parse_args()
+    report_date = date.fromisoformat(args.report_date)
+
+    t0 = time.perf_counter()
+    events, rules = make_events(args.events, args.modules, args.seed)
+    print(f"生成 {len(events)} 条事件: {time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    list_result = run_list_engine(events, report_date, rules)
+    list_seconds = time.perf_counter() - t0
+    print(f"python 引擎（仅统计）: {list_seconds:.2f}s")
+
+    t0 = time.perf_counter()
+    table = EventTable()
+    table.append_events(events)
+    build_seconds = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    columnar_result = run_columnar_engine(table, report_date, rules)
+    columnar_seconds = time.perf_counter() - t0
+    print(f"columnar 引擎（仅统计）: {columnar_seconds:.2f}s（由事件列表建表另需 {build_seconds:.2f}s）")
+
+    identical = json.dumps(list_result, ensure_ascii=False) == json.dumps(columnar_result, ensure_ascii=False)
+    del list_result, columnar_result, table
+
+    # csv 模式命中事件缓存时的真实路径：python 引擎需先还原 QmsEvent，columnar 直接拼接列。
+    ledgers = split_ledgers(events)
+    del events
+    t0 = time.perf_counter()
+    restored = [event for ledger in ledgers for event in ledger.to_events()]
+    run_list_engine(restored, report_date, rules)
+    list_cached_seconds = time.perf_counter() - t0
+    del restored
+    t0 = time.perf_counter()
+    table = EventTable()
+    for ledger in ledgers:
+        table.append_columns(ledger)
+    run_columnar_engine(table, report_date, rules)
+    columnar_cached_seconds = time.perf_counter() - t0
+    print(f"从事件缓存加载+统计: python {list_cached_seconds:.2f}s, columnar {columnar_cached_seconds:.2f}s")
+
+    print(f"输出一致: {identical}")
+    print(f"加速比（仅统计）: {list_seconds / columnar_seconds:.2f}x")
+    print(f"加速比（缓存加载+统计）: {list_cached_seconds / columnar_cached_seconds:.2f}x")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
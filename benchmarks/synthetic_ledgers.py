@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import random
+import sys
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from qms_monitor.models import LedgerConfig  # noqa: E402
+
+
+TOPICS = ["变更", "偏差", "OOS", "CAPA", "投诉"]
+OPEN_STATUS = "进行中"
+CLOSED_STATUSES = ["已完成", "已关闭"]
+HEADER = ["编号", "内容", "发起日期", "计划完成日期", "状态", "责任部门", "责任人", "QA", "QA经理"]
+DATE_FORMATS = ("iso", "slash", "cjk", "datetime", "serial")
+ENCODINGS = ("utf-8-sig", "gb18030")
+EXCEL_EPOCH = date(1899, 12, 30)
+# Every fourth ledger has no planned-date column and derives it from initiated + N days.
+PLANNED_DUE_DAYS = 30
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a synthetic CSV cache (manifest.json + rows/*.csv)")
+    parser.add_argument("--output-dir", required=True, help="输出目录，生成 manifest.json 与 rows/")
+    add_generator_arguments(parser)
+    return parser.parse_args()
+
+
+def add_generator_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--configs", type=int, default=20, help="台账（配置行）数量，默认 20")
+    parser.add_argument("--rows", type=int, default=20_000, help="每个台账的数据行数，默认 20000")
+    parser.add_argument("--columns", type=int, default=12, help="每个台账的列数（不少于 9，多出的为备注列），默认 12")
+    parser.add_argument("--overdue-ratio", type=float, default=0.1, help="报告日期下超期事件占比，默认 0.1")
+    parser.add_argument(
+        "--date-formats",
+        default=",".join(DATE_FORMATS),
+        help=f"日期单元格格式，逗号分隔，可选 {','.join(DATE_FORMATS)}；每个台账按列固定一种格式，单元格级混用比例见 --mixed-dates",
+    )
+    parser.add_argument("--mixed-dates", type=float, default=0.0, help="单元格随机改用其它日期格式的比例，默认 0")
+    parser.add_argument(
+        "--encodings",
+        default=",".join(ENCODINGS),
+        help=f"CSV 编码，逗号分隔，按台账轮换，可选 {','.join(ENCODINGS)}",
+    )
+    parser.add_argument("--report-date", default="2025-06-30", help="计算超期比例所用的报告日期")
+    parser.add_argument("--seed", type=int, default=7)
+
+
+def _split_choices(raw: str, allowed: tuple[str, ...], label: str) -> list[str]:
+    values = [part.strip() for part in raw.split(",") if part.strip()]
+    unknown = [value for value in values if value not in allowed]
+    if unknown or not values:
+        raise SystemExit(f"{label} 取值无效: {raw}（可选 {','.join(allowed)}）")
+    return values
+
+
+def format_date(value: date, fmt: str) -> str:
+    if fmt == "iso":
+        return value.isoformat()
+    if fmt == "slash":
+        return f"{value.year}/{value.month}/{value.day}"
+    if fmt == "cjk":
+        return f"{value.year}年{value.month}月{value.day}日"
+    if fmt == "datetime":
+        return f"{value.isoformat()} 00:00:00"
+    return str((value - EXCEL_EPOCH).days)
+
+
+def _ledger_config(index: int, report_date: date) -> LedgerConfig:
+    topic = TOPICS[index % len(TOPICS)]
+    derived_due = index % 4 == 3
+    return LedgerConfig(
+        row_no=index + 2,
+        topic=topic,
+        module=f"{topic}管理{index // (len(TOPICS) * 3) + 1}",
+        year=str(report_date.year - (index // len(TOPICS)) % 3),
+        file_path=f"D:/synthetic/{topic}_{index + 1:03d}.xlsx",
+        sheet_name="Sheet1",
+        id_col=0,
+        content_col=1,
+        initiated_col=2,
+        planned_col=None if derived_due else 3,
+        planned_due_days=PLANNED_DUE_DAYS if derived_due else None,
+        status_col=4,
+        owner_dept_col=5,
+        owner_col=6,
+        qa_col=7,
+        qa_manager_col=8,
+        open_status_value=OPEN_STATUS,
+        data_start_row=2,
+    )
+
+
+def _ledger_rows(
+    cfg: LedgerConfig,
+    rng: random.Random,
+    rows: int,
+    columns: int,
+    overdue_ratio: float,
+    date_fmt: str,
+    formats: list[str],
+    mixed_dates: float,
+    report_date: date,
+) -> list[list[str]]:
+    depts = [f"部门{i}" for i in range(15)]
+    people = [f"人员{i}" for i in range(200)]
+    managers = [f"经理{i}" for i in range(20)]
+    extra = max(0, columns - len(HEADER))
+    out = [HEADER + [f"备注{i + 1}" for i in range(extra)]]
+
+    def cell(value: date) -> str:
+        fmt = rng.choice(formats) if mixed_dates and rng.random() < mixed_dates else date_fmt
+        return format_date(value, fmt)
+
+    for idx in range(rows):
+        overdue = rng.random() < overdue_ratio
+        if overdue:
+            # Open and due before the report date.
+            due = report_date - timedelta(days=rng.randint(1, 365))
+            status = OPEN_STATUS
+        elif rng.random() < 0.5:
+            due = report_date - timedelta(days=rng.randint(-60, 365))
+            status = rng.choice(CLOSED_STATUSES)
+        else:
+            due = report_date + timedelta(days=rng.randint(0, 120))
+            status = OPEN_STATUS
+        if cfg.planned_col is None:
+            initiated = due - timedelta(days=cfg.planned_due_days or 0)
+            planned_cell = ""
+        else:
+            initiated = due - timedelta(days=rng.randint(7, 90))
+            planned_cell = cell(due)
+        row = [
+            f"{cfg.topic}-{cfg.row_no:03d}-{idx:07d}",
+            f"{cfg.topic}事件描述{rng.randint(0, 100_000)}",
+            cell(initiated),
+            planned_cell,
+            status,
+            rng.choice(depts),
+            rng.choice(people),
+            rng.choice(people[:40]),
+            rng.choice(managers),
+        ]
+        row.extend(f"备注{rng.randint(0, 1000)}" for _ in range(extra))
+        out.append(row)
+    return out
+
+
+def generate_csv_cache(
+    output_dir: Path,
+    *,
+    configs: int = 20,
+    rows: int = 20_000,
+    columns: int = 12,
+    overdue_ratio: float = 0.1,
+    date_formats: list[str] | None = None,
+    mixed_dates: float = 0.0,
+    encodings: list[str] | None = None,
+    report_date: date = date(2025, 6, 30),
+    seed: int = 7,
+) -> Path:
+    formats = list(date_formats or DATE_FORMATS)
+    encoding_cycle = list(encodings or ENCODINGS)
+    columns = max(len(HEADER), columns)
+    rng = random.Random(seed)
+    rows_dir = output_dir / "rows"
+    rows_dir.mkdir(parents=True, exist_ok=True)
+
+    items = []
+    for index in range(configs):
+        cfg = _ledger_config(index, report_date)
+        encoding = encoding_cycle[index % len(encoding_cycle)]
+        ledger_rows = _ledger_rows(
+            cfg,
+            rng,
+            rows,
+            columns,
+            overdue_ratio,
+            formats[index % len(formats)],
+            formats,
+            mixed_dates,
+            report_date,
+        )
+        rel_csv = Path("rows") / f"row_{cfg.row_no:04d}.csv"
+        with (output_dir / rel_csv).open("w", encoding=encoding, newline="") as fh:
+            csv.writer(fh).writerows(ledger_rows)
+        items.append(
+            {
+                "row_no": cfg.row_no,
+                "config": asdict(cfg),
+                "module": cfg.module,
+                "year": cfg.year,
+                "source_file": cfg.file_path,
+                "source_sheet": cfg.sheet_name,
+                "ok": True,
+                "csv_path": rel_csv.as_posix(),
+                "encoding": encoding,
+                "row_count": len(ledger_rows),
+                "column_count": columns,
+            }
+        )
+
+    manifest_path = output_dir / "manifest.json"
+    manifest = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "config_path": "synthetic",
+        "output_dir": str(output_dir),
+        "synthetic": {
+            "configs": configs,
+            "rows": rows,
+            "columns": columns,
+            "overdue_ratio": overdue_ratio,
+            "date_formats": formats,
+            "mixed_dates": mixed_dates,
+            "encodings": encoding_cycle,
+            "report_date": report_date.isoformat(),
+            "seed": seed,
+        },
+        "items": items,
+    }
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest_path
+
+
+def generate_from_args(output_dir: Path, args: argparse.Namespace) -> Path:
+    try:
+        report_date = datetime.strptime(args.report_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise SystemExit("--report-date 格式必须是 YYYY-MM-DD")
+    return generate_csv_cache(
+        output_dir,
+        configs=args.configs,
+        rows=args.rows,
+        columns=args.columns,
+        overdue_ratio=args.overdue_ratio,
+        date_formats=_split_choices(args.date_formats, DATE_FORMATS, "--date-formats"),
+        mixed_dates=args.mixed_dates,
+        encodings=_split_choices(args.encodings, ENCODINGS, "--encodings"),
+        report_date=report_date,
+        seed=args.seed,
+    )
+
+
+def main() -> int:
+    args = parse_args()
+    manifest_path = generate_from_args(Path(args.output_dir), args)
+    print(f"已生成合成CSV缓存: {manifest_path}（{args.configs} 个台账 × {args.rows} 行）")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
 import sys
 from pathlib import Path
 
@@ -15,6 +17,27 @@ def parse_args() -> argparse.Namespace:
         default="artifacts/csv_cache",
         help="CSV缓存输出目录（会生成rows/和manifest.json）",
     )
+    parser.add_argument(
+        "--excel-workers",
+        type=int,
+        default=int(os.getenv("QMS_EXCEL_WORKERS", "1") or 1),
+        help="并行读取台账的Excel进程数，默认1（单进程）",
+    )
+    parser.add_argument(
+        "--all-columns",
+        action="store_true",
+        help="导出整张表的全部列（默认只导出配置中用到的列，其余列留空）",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量导出：源文件未变化的台账复用已有CSV，不再打开Excel",
+    )
+    parser.add_argument(
+        "--hash",
+        action="store_true",
+        help="判断源文件是否变化时额外比较SHA-256内容哈希（忽略仅修改时间变化的情况）",
+    )
     return parser.parse_args()
 
 
@@ -67,12 +90,23 @@ def main() -> int:
         return 1
 
     try:
-        manifest_path, warnings = export_csv_cache(config_path, output_dir)
+        manifest_path, warnings = export_csv_cache(
+            config_path,
+            output_dir,
+            excel_workers=args.excel_workers,
+            task_timeout=float(os.getenv("QMS_EXCEL_TASK_TIMEOUT", "600")),
+            all_columns=args.all_columns,
+            incremental=args.incremental,
+            content_hash=args.hash,
+        )
     except Exception as exc:
         print(f"导出CSV缓存失败: {exc}", file=sys.stderr)
         return 1
 
     print(f"CSV缓存导出完成: {manifest_path}")
+    if args.incremental:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        print(f"增量导出: 复用 {manifest.get('reused_count', 0)} 个，重新导出 {manifest.get('exported_count', 0)} 个")
     if warnings:
         print("导出告警:")
         for warning in warnings:
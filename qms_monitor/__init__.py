@@ -1,3 +1,8 @@
-from .app import main
+def main() -> int:
+    # Imported on call so `import qms_monitor.<module>` (e.g. export_csv_cache.py) does not load the app.
+    from .app import main as app_main
+
+    return app_main()
+
 
 __all__ = ["main"]
@@ -1,29 +1,264 @@
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import sys
 import time
 from collections import defaultdict
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from .cli import parse_args
+from .cli import parse_args, parse_serve_args
 from .config_loader import build_open_status_rules, load_config
-from .csv_io import load_csv_manifest_bundle, read_csv_rows
-from .excel_reader import ExcelBatchReader
-from .ledger_reader import read_ledger_events
-from .llm_client import call_llm_person_summaries, call_llm_topic_summary
-from .models import QmsEvent
-from .overdue_excel_exporter import export_overdue_events_excel
-from .pdf_exporter import export_markdown_file_to_pdf
-from .pdf_exporter_latex import export_markdown_file_to_pdf_latex
+from .csv_io import load_csv_manifest_bundle, read_csv_rows, stream_csv_rows
+from .ledger_reader import (
+    SheetRows,
+    iter_ledger_events,
+    iter_ledger_rows,
+    iter_xlsx_ledger_events,
+    read_ledger_events,
+    read_xlsx_ledger_events,
+)
+from .llm_cache import open_llm_cache_from_env
+from .models import LedgerConfig, QmsEvent
+from .profiling import RunProfile, profile_iter, profile_span, set_active_profile
 from .report_renderer import render_markdown_report
-from .stats import build_event_records, build_local_stats, build_overdue_event_records, build_topic_stats
+from .stats import ReportStatsAccumulator, build_report_stats, topic_group_key
+
+# The process pools, columnar engine, event cache and Excel COM reader are imported where
+# the options that need them are handled, so a plain run does not load multiprocessing/mmap.
+if TYPE_CHECKING:
+    from .columnar_stats import EventTable
+    from .event_cache import EventColumns
+    from .excel_pool import ExcelReaderPool
+    from .excel_reader import ExcelBatchReader
+
+
+def _log_stderr(message: str) -> None:
+    # Single write per line so messages from concurrent LLM workers do not interleave.
+    sys.stderr.write(f"{message}\n")
+    sys.stderr.flush()
+
+
+def _iter_sheet_ledger_events(
+    configs: list[LedgerConfig],
+    sheet_results: Iterable[SheetRows],
+    *,
+    streaming: bool = False,
+) -> Iterator[tuple[LedgerConfig, Iterable[QmsEvent], list[str]]]:
+    for cfg, (ok, rows, err, _, _, _) in zip(configs, sheet_results):
+        if not ok:
+            yield cfg, [], [f"模块[{cfg.module}] 文件读取失败，已跳过: {cfg.file_path} ({err})"]
+            continue
+        if streaming:
+            ledger_warnings: list[str] = []
+            yield cfg, iter_ledger_events(cfg, rows, ledger_warnings), ledger_warnings
+            continue
+        events, ledger_warnings = read_ledger_events(cfg, source_rows=rows)
+        yield cfg, events, ledger_warnings
+
+
+def _iter_cached_events(columns: EventColumns) -> Iterator[QmsEvent]:
+    try:
+        yield from columns.iter_events()
+    finally:
+        columns.close()
+
+
+def read_csv_ledger_events(
+    cfg: LedgerConfig,
+    csv_path: Path,
+    cache_dir: Path | None,
+    *,
+    encoding: str | None = None,
+    columnar: bool = False,
+    streaming: bool = False,
+) -> tuple[Iterable[QmsEvent] | EventColumns, list[str], str | None]:
+    cache_path: Path | None = None
+    fingerprint: str | None = None
+    if cache_dir is not None:
+        from .event_cache import event_cache_fingerprint, event_cache_path, load_event_cache
+
+        cache_path = event_cache_path(cache_dir, csv_path)
+        fingerprint = event_cache_fingerprint(cfg, csv_path)
+    if cache_path is not None and fingerprint is not None:
+        with profile_span("reads", "event_cache.load", file=str(cache_path)) as span:
+            columns = load_event_cache(cache_path, fingerprint)
+            span["hit"] = columns is not None
+        if columns is not None:
+            if columnar:
+                return columns, columns.warnings, None
+            if streaming:
+                return _iter_cached_events(columns), columns.warnings, None
+            events, ledger_warnings = columns.to_events(), columns.warnings
+            columns.close()
+            return events, ledger_warnings, None
+
+    if streaming:
+        # Writing the event cache needs the whole ledger, so streaming runs only read it.
+        row_iter, err = stream_csv_rows(csv_path, encoding)
+        if err:
+            return [], [], err
+        ledger_warnings = []
+        return iter_ledger_events(cfg, row_iter, ledger_warnings), ledger_warnings, None
+
+    with profile_span("reads", "csv.decode", file=str(csv_path)) as span:
+        rows, err = read_csv_rows(csv_path, encoding)
+        span["rows"] = len(rows)
+    if err:
+        return [], [], err
+
+    events, ledger_warnings = read_ledger_events(cfg, source_rows=rows)
+    if cache_path is not None and fingerprint is not None:
+        from .event_cache import EventColumns, write_event_cache
+
+        try:
+            write_event_cache(cache_path, fingerprint, EventColumns.from_events(cfg, events, ledger_warnings))
+        except OSError:
+            pass
+    return events, ledger_warnings, None
+
+
+def _iter_csv_ledgers(
+    configs: list[LedgerConfig],
+    csv_map: dict[int, Path],
+    csv_encodings: dict[int, str],
+    cache_dir: Path | None,
+    *,
+    columnar: bool,
+    streaming: bool,
+    workers: int,
+) -> Iterator[tuple[LedgerConfig, Path | None, Iterable[QmsEvent] | EventColumns, list[str], str | None]]:
+    if workers <= 1:
+        for cfg in configs:
+            csv_path = csv_map.get(cfg.row_no)
+            if csv_path is None:
+                yield cfg, None, [], [], None
+                continue
+            yield cfg, csv_path, *read_csv_ledger_events(
+                cfg,
+                csv_path,
+                cache_dir,
+                encoding=csv_encodings.get(cfg.row_no),
+                columnar=columnar,
+                streaming=streaming,
+            )
+        return
+
+    from .csv_pool import iter_csv_ledger_columns
+
+    tasks = ((cfg, csv_map.get(cfg.row_no), csv_encodings.get(cfg.row_no)) for cfg in configs)
+    for cfg, csv_path, columns, ledger_warnings, err in iter_csv_ledger_columns(
+        tasks, workers=workers, cache_dir=cache_dir
+    ):
+        if columns is None:
+            yield cfg, csv_path, [], ledger_warnings, err
+        elif columnar:
+            yield cfg, csv_path, columns, ledger_warnings, err
+        elif streaming:
+            yield cfg, csv_path, _iter_cached_events(columns), ledger_warnings, err
+        else:
+            events = columns.to_events()
+            columns.close()
+            yield cfg, csv_path, events, ledger_warnings, err
+
+
+def _add_ledger_events(
+    grouped: dict[str, list[QmsEvent]],
+    event_table: EventTable | None,
+    report_stats: ReportStatsAccumulator | None,
+    module: str,
+    ledger: Iterable[QmsEvent] | EventColumns,
+) -> int:
+    if report_stats is not None:
+        # Streaming folds events straight into the accumulator; only overdue records are kept.
+        return report_stats.add_events(module, ledger)
+    # The columnar engine still registers the module so module order matches the list engine.
+    module_events = grouped[module]
+    if event_table is None:
+        before = len(module_events)
+        module_events.extend(ledger)
+        return len(module_events) - before
+    from .event_cache import EventColumns
+
+    if isinstance(ledger, EventColumns):
+        count = len(ledger)
+        event_table.append_columns(ledger)
+        ledger.close()
+        return count
+    event_table.append_events(ledger)
+    return len(ledger)
+
+
+def close_llm_clients() -> None:
+    # The pooled clients live for the whole process (serve keeps them across reports);
+    # llm_client is only imported once an LLM stage ran, so otherwise there is nothing to close.
+    llm_client = sys.modules.get(f"{__package__}.llm_client")
+    if llm_client is not None:
+        llm_client.close_llm_clients()
+
+
+def _ledger_profile_fields(cfg: LedgerConfig) -> dict[str, Any]:
+    return {"name": cfg.module, "row_no": cfg.row_no, "file": cfg.file_path, "sheet": cfg.sheet_name}
+
+
+def _run_topic_llm(
+    topic: str,
+    report_date: date,
+    local_stats: dict[str, Any],
+    overdue_records: list[dict[str, Any]],
+    llm_settings: dict[str, Any],
+) -> tuple[dict[str, Any], list[str]]:
+    from .llm_client import call_llm_person_summaries, call_llm_topic_summary
+
+    warnings: list[str] = []
+    merged_stats = dict(local_stats)
+
+    try:
+        llm_start = time.time()
+        _log_stderr(f"[LLM] 开始主题总结[{topic}] ...")
+        summary = call_llm_topic_summary(
+            topic=topic,
+            report_date=report_date,
+            local_stats=local_stats,
+            overdue_records=overdue_records,
+            **llm_settings,
+        )
+        merged_stats["summary"] = summary
+        elapsed = time.time() - llm_start
+        _log_stderr(f"[LLM] 主题总结[{topic}] 完成，用时 {elapsed:.1f}s")
+    except Exception as exc:
+        warnings.append(f"主题[{topic}] LLM主题总结失败，已回退本地统计: {exc}")
+        _log_stderr(f"[LLM] 主题总结[{topic}] 失败: {exc}")
+        merged_stats.setdefault("summary", local_stats.get("summary", ""))
+
+    try:
+        llm_start = time.time()
+        _log_stderr(f"[LLM] 开始人员概括[{topic}] ...")
+        merged_stats = call_llm_person_summaries(
+            topic=topic,
+            report_date=report_date,
+            local_stats=merged_stats,
+            **llm_settings,
+        )
+        elapsed = time.time() - llm_start
+        _log_stderr(f"[LLM] 人员概括[{topic}] 完成，用时 {elapsed:.1f}s")
+    except Exception as exc:
+        warnings.append(f"主题[{topic}] LLM人员概括失败，已保留现有统计: {exc}")
+        _log_stderr(f"[LLM] 人员概括[{topic}] 失败: {exc}")
+
+    return merged_stats, warnings
 
 
 def main() -> int:
+    if sys.argv[1:2] == ["serve"]:
+        from .server import serve
+
+        return serve(parse_serve_args(sys.argv[2:]))
+
     args = parse_args()
 
     config_path = Path(args.config)
@@ -34,173 +269,328 @@ def main() -> int:
         print("--report-date 格式必须是 YYYY-MM-DD", file=sys.stderr)
         return 1
 
+    profile = RunProfile()
+    profile.meta.update(
+        input_mode=args.input_mode,
+        stats_engine=args.stats_engine,
+        streaming=args.streaming,
+        report_date=report_date.isoformat(),
+    )
+    set_active_profile(profile)
+    try:
+        return _run(args, config_path, report_date, profile)
+    finally:
+        set_active_profile(None)
+        close_llm_clients()
+
+
+def load_inputs(
+    args: argparse.Namespace,
+    config_path: Path,
+) -> tuple[list[LedgerConfig], dict[int, Path], dict[int, str], dict[str, str], list[str]]:
     warnings: list[str] = []
-    configs = []
+    configs: list[LedgerConfig] = []
     csv_map: dict[int, Path] = {}
+    csv_encodings: dict[int, str] = {}
     open_status_rules: dict[str, str] = {}
 
     if args.input_mode == "csv":
         if not args.csv_manifest:
-            print("CSV模式需要提供 --csv-manifest", file=sys.stderr)
-            return 1
+            raise RuntimeError("CSV模式需要提供 --csv-manifest")
 
         manifest_path = Path(args.csv_manifest)
         if not manifest_path.exists():
-            print(f"CSV manifest不存在: {manifest_path}", file=sys.stderr)
-            return 1
+            raise RuntimeError(f"CSV manifest不存在: {manifest_path}")
 
         try:
-            manifest_configs, csv_map, open_status_rules, csv_warnings = load_csv_manifest_bundle(manifest_path)
+            manifest_configs, csv_map, csv_encodings, open_status_rules, csv_warnings = load_csv_manifest_bundle(
+                manifest_path
+            )
             warnings.extend(csv_warnings)
         except Exception as exc:
-            print(f"读取CSV manifest失败: {exc}", file=sys.stderr)
-            return 1
+            raise RuntimeError(f"读取CSV manifest失败: {exc}") from exc
 
         if manifest_configs:
             configs = manifest_configs
         else:
             if not config_path.exists():
-                print("manifest未包含有效config，且--config文件不存在", file=sys.stderr)
-                return 1
+                raise RuntimeError("manifest未包含有效config，且--config文件不存在")
             try:
                 configs, config_warnings = load_config(config_path)
                 warnings.extend(config_warnings)
                 open_status_rules = build_open_status_rules(configs)
             except Exception as exc:
-                print(f"读取配置失败: {exc}", file=sys.stderr)
-                return 1
+                raise RuntimeError(f"读取配置失败: {exc}") from exc
     else:
         if not config_path.exists():
-            print(f"配置文件不存在: {config_path}", file=sys.stderr)
-            return 1
+            raise RuntimeError(f"配置文件不存在: {config_path}")
         try:
-            configs, config_warnings = load_config(config_path)
+            config_engine = "xlsx" if args.input_mode == "xlsx" else "excel"
+            configs, config_warnings = load_config(config_path, engine=config_engine)
             warnings.extend(config_warnings)
             open_status_rules = build_open_status_rules(configs)
         except Exception as exc:
-            print(f"读取配置失败: {exc}", file=sys.stderr)
-            return 1
+            raise RuntimeError(f"读取配置失败: {exc}") from exc
+
+    return configs, csv_map, csv_encodings, open_status_rules, warnings
+
 
+def _run(args: argparse.Namespace, config_path: Path, report_date: date, profile: RunProfile) -> int:
+    stage = profile.start("stages", "config_load")
+    try:
+        configs, csv_map, csv_encodings, open_status_rules, warnings = load_inputs(args, config_path)
+    except RuntimeError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    profile.stop(stage)
+
+    stage = profile.start("stages", "ledgers")
     grouped: dict[str, list[QmsEvent]] = defaultdict(list)
+    report_stats: ReportStatsAccumulator | None = None
+    event_table: EventTable | None = None
+    if args.streaming:
+        report_stats = ReportStatsAccumulator(report_date, open_status_rules)
+        if args.stats_engine == "columnar":
+            warnings.append("流式模式使用逐事件统计，已忽略 --stats-engine columnar")
+    elif args.stats_engine == "columnar":
+        from .columnar_stats import EventTable
+
+        event_table = EventTable()
     processed_files = 0
     skipped_files = 0
     if args.input_mode == "csv":
-        for cfg in configs:
-            csv_path = csv_map.get(cfg.row_no)
+        event_cache_dir = Path(args.csv_manifest).parent / "events" if args.event_cache else None
+        csv_ledgers = _iter_csv_ledgers(
+            configs,
+            csv_map,
+            csv_encodings,
+            event_cache_dir,
+            columnar=event_table is not None,
+            streaming=args.streaming,
+            workers=args.workers,
+        )
+        for ledger_span, (cfg, csv_path, events, ledger_warnings, err) in profile_iter(
+            "ledgers", csv_ledgers, lambda item: _ledger_profile_fields(item[0])
+        ):
             if csv_path is None:
                 warnings.append(f"模块[{cfg.module}] row_no={cfg.row_no} 在manifest中未找到CSV，已跳过")
                 skipped_files += 1
                 continue
 
-            rows, err = read_csv_rows(csv_path)
             if err:
                 warnings.append(f"模块[{cfg.module}] CSV读取失败，已跳过: {csv_path} ({err})")
                 skipped_files += 1
                 continue
 
-            events, ledger_warnings = read_ledger_events(cfg, source_rows=rows)
+            # Streamed ledgers report their warnings only once their events have been consumed.
+            event_count = _add_ledger_events(grouped, event_table, report_stats, cfg.module, events)
+            ledger_span["events"] = event_count
             warnings.extend(ledger_warnings)
-            if ledger_warnings and not events:
+            if ledger_warnings and not event_count:
+                skipped_files += 1
+            else:
+                processed_files += 1
+    elif args.input_mode == "xlsx":
+        for ledger_span, cfg in profile_iter("ledgers", configs, _ledger_profile_fields):
+            if args.streaming:
+                ledger_warnings: list[str] = []
+                events = iter_xlsx_ledger_events(cfg, ledger_warnings)
+            else:
+                events, ledger_warnings = read_xlsx_ledger_events(cfg)
+            event_count = _add_ledger_events(grouped, event_table, report_stats, cfg.module, events)
+            ledger_span["events"] = event_count
+            warnings.extend(ledger_warnings)
+            if ledger_warnings and not event_count:
                 skipped_files += 1
             else:
                 processed_files += 1
-            grouped[cfg.module].extend(events)
     else:
+        from .excel_pool import ExcelReaderPool
+        from .excel_reader import ExcelBatchReader
+
+        reader_pool: ExcelReaderPool | None = None
         batch_reader: ExcelBatchReader | None = None
         try:
-            try:
-                batch_reader = ExcelBatchReader(visible=False).open()
-            except Exception as exc:
-                warnings.append(f"批量读取初始化失败，已回退单文件读取: {exc}")
-                batch_reader = None
+            if args.excel_workers > 1:
+                try:
+                    reader_pool = ExcelReaderPool(
+                        args.excel_workers,
+                        task_timeout=float(os.getenv("QMS_EXCEL_TASK_TIMEOUT", "600")),
+                    ).open()
+                except Exception as exc:
+                    warnings.append(f"并行读取初始化失败，已回退单进程批量读取: {exc}")
+                    reader_pool = None
 
-            for cfg in configs:
-                events, ledger_warnings = read_ledger_events(cfg, batch_reader=batch_reader)
+            if reader_pool is None:
+                try:
+                    batch_reader = ExcelBatchReader(visible=False).open()
+                except Exception as exc:
+                    warnings.append(f"批量读取初始化失败，已回退单文件读取: {exc}")
+                    batch_reader = None
+
+            if reader_pool is not None:
+                ledger_results = _iter_sheet_ledger_events(
+                    configs, reader_pool.imap(configs), streaming=args.streaming
+                )
+            elif batch_reader is not None:
+                ledger_results = _iter_sheet_ledger_events(
+                    configs, iter_ledger_rows(batch_reader, configs), streaming=args.streaming
+                )
+            else:
+                ledger_results = ((cfg, *read_ledger_events(cfg)) for cfg in configs)
+
+            for ledger_span, (cfg, events, ledger_warnings) in profile_iter(
+                "ledgers", ledger_results, lambda item: _ledger_profile_fields(item[0])
+            ):
+                event_count = _add_ledger_events(grouped, event_table, report_stats, cfg.module, events)
+                ledger_span["events"] = event_count
                 warnings.extend(ledger_warnings)
-                if ledger_warnings and not events:
+                if ledger_warnings and not event_count:
                     skipped_files += 1
                 else:
                     processed_files += 1
-                grouped[cfg.module].extend(events)
         finally:
+            if reader_pool is not None:
+                try:
+                    reader_pool.close()
+                except Exception:
+                    pass
             if batch_reader is not None:
                 try:
                     batch_reader.close()
                 except Exception:
                     pass
 
+    profile.stop(stage)
+
+    stage = profile.start("stages", "stats")
     module_local_results: dict[str, dict[str, Any]] = {}
-    for module, events in grouped.items():
-        module_local_results[module] = build_local_stats(module, events, report_date, open_status_rules)
+    topic_inputs: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
+    if report_stats is not None:
+        module_local_results, topic_inputs = report_stats.finish()
+    elif event_table is not None:
+        from .columnar_stats import (
+            build_local_stats_columnar,
+            build_overdue_event_records_columnar,
+            build_topic_stats_columnar,
+        )
 
-    topic_grouped: dict[str, list[QmsEvent]] = defaultdict(list)
-    for events in grouped.values():
-        for event in events:
-            topic_grouped[(event.topic or "").strip() or "未分类"].append(event)
+        module_rows = event_table.group_rows("module")
+        topic_rows: dict[str, list[int]] = defaultdict(list)
+        for module in grouped:
+            rows = module_rows.get(module, [])
+            module_local_results[module] = build_local_stats_columnar(
+                module, event_table, rows, report_date, open_status_rules
+            )
+            for topic, rows_in_topic in event_table.group_rows("topic", rows, key=topic_group_key).items():
+                topic_rows[topic].extend(rows_in_topic)
+
+        for topic, rows in topic_rows.items():
+            local_stats = build_topic_stats_columnar(topic, event_table, rows, report_date, open_status_rules)
+            overdue_records = build_overdue_event_records_columnar(event_table, rows, report_date, open_status_rules)
+            topic_inputs[topic] = (local_stats, overdue_records)
+    else:
+        module_local_results, topic_inputs = build_report_stats(grouped, report_date, open_status_rules)
+
+    profile.stop(stage)
 
+    result = write_reports(
+        args,
+        config_path,
+        report_date,
+        profile,
+        module_local_results=module_local_results,
+        topic_inputs=topic_inputs,
+        warnings=warnings,
+        processed_files=processed_files,
+        skipped_files=skipped_files,
+    )
+    if result["profile"]:
+        print(f"性能剖析已生成: {result['profile']}")
+    print(f"报告已生成: {result['report']}")
+    if result["pdf_report"]:
+        print(f"PDF已生成: {result['pdf_report']}")
+    print(f"明细已生成: {result['detail']}")
+    if result["overdue_excel"]:
+        print(f"超期事件Excel已生成: {result['overdue_excel']} (共 {result['overdue_event_count']} 条)")
+    return 0
+
+
+def write_reports(
+    args: argparse.Namespace,
+    config_path: Path,
+    report_date: date,
+    profile: RunProfile,
+    *,
+    module_local_results: dict[str, dict[str, Any]],
+    topic_inputs: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]],
+    warnings: list[str],
+    processed_files: int,
+    skipped_files: int,
+    export_pdf: bool = True,
+    timestamp: str | None = None,
+) -> dict[str, Any]:
+    stage = profile.start("stages", "llm", skipped=bool(args.skip_llm))
     topic_results: dict[str, dict[str, Any]] = {}
-    for topic, events in topic_grouped.items():
-        local_stats = build_topic_stats(topic, events, report_date, open_status_rules)
-        overdue_records = build_overdue_event_records(events, report_date, open_status_rules)
-        merged_stats = dict(local_stats)
+    if args.skip_llm:
+        for topic, (local_stats, _) in topic_inputs.items():
+            topic_results[topic] = dict(local_stats)
+    else:
+        # The OpenAI SDK (httpx/pydantic) dominates startup time; only LLM runs load it.
+        from concurrent.futures import ThreadPoolExecutor
 
-        if args.skip_llm:
-            topic_results[topic] = merged_stats
-            continue
+        from .llm_client import get_llm_connection_stats
 
-        base_url = os.getenv("QMS_LLM_BASE_URL", "https://api.openai.com/v1")
-        model = os.getenv("QMS_LLM_MODEL", "")
-        api_key = os.getenv("QMS_LLM_API_KEY", "")
-        timeout_seconds = int(os.getenv("QMS_LLM_TIMEOUT", "120"))
-        progress_interval_seconds = int(os.getenv("QMS_LLM_PROGRESS_INTERVAL", "15"))
+        # The counters are process-wide; serve mode runs many reports, so log this run's share.
+        conn_stats_before = get_llm_connection_stats()
+        concurrency = max(1, int(os.getenv("QMS_LLM_CONCURRENCY", "4")))
+        llm_settings = {
+            "base_url": os.getenv("QMS_LLM_BASE_URL", "https://api.openai.com/v1"),
+            "model": os.getenv("QMS_LLM_MODEL", ""),
+            "api_key": os.getenv("QMS_LLM_API_KEY", ""),
+            "timeout_seconds": int(os.getenv("QMS_LLM_TIMEOUT", "120")),
+            "progress_interval_seconds": int(os.getenv("QMS_LLM_PROGRESS_INTERVAL", "15")),
+            "cache": open_llm_cache_from_env() if args.llm_cache else None,
+            "pool_size": concurrency,
+        }
 
-        try:
-            llm_start = time.time()
-            print(f"[LLM] 开始主题总结[{topic}] ...", file=sys.stderr, flush=True)
-            summary = call_llm_topic_summary(
-                topic=topic,
-                report_date=report_date,
-                local_stats=local_stats,
-                overdue_records=overdue_records,
-                base_url=base_url,
-                model=model,
-                api_key=api_key,
-                timeout_seconds=timeout_seconds,
-                progress_interval_seconds=progress_interval_seconds,
-            )
-            merged_stats["summary"] = summary
-            elapsed = time.time() - llm_start
-            print(f"[LLM] 主题总结[{topic}] 完成，用时 {elapsed:.1f}s", file=sys.stderr, flush=True)
-        except Exception as exc:
-            warnings.append(f"主题[{topic}] LLM主题总结失败，已回退本地统计: {exc}")
-            print(f"[LLM] 主题总结[{topic}] 失败: {exc}", file=sys.stderr, flush=True)
-            merged_stats.setdefault("summary", local_stats.get("summary", ""))
+        # Topics run concurrently; results are collected in topic order so the
+        # report and warnings stay deterministic regardless of completion order.
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="qms-llm") as executor:
+            futures = {
+                topic: executor.submit(
+                    _run_topic_llm,
+                    topic,
+                    report_date,
+                    local_stats,
+                    overdue_records,
+                    llm_settings,
+                )
+                for topic, (local_stats, overdue_records) in topic_inputs.items()
+            }
+            for topic, future in futures.items():
+                merged_stats, llm_warnings = future.result()
+                warnings.extend(llm_warnings)
+                topic_results[topic] = merged_stats
 
-        try:
-            llm_start = time.time()
-            print(f"[LLM] 开始人员概括[{topic}] ...", file=sys.stderr, flush=True)
-            merged_stats = call_llm_person_summaries(
-                topic=topic,
-                report_date=report_date,
-                local_stats=merged_stats,
-                base_url=base_url,
-                model=model,
-                api_key=api_key,
-                timeout_seconds=timeout_seconds,
-                progress_interval_seconds=progress_interval_seconds,
+        llm_cache = llm_settings["cache"]
+        if llm_cache is not None:
+            _log_stderr(f"[LLM] 本地缓存命中 {llm_cache.hits} 次，未命中 {llm_cache.misses} 次")
+        conn_stats = {
+            key: value - conn_stats_before.get(key, 0) for key, value in get_llm_connection_stats().items()
+        }
+        if conn_stats["requests"]:
+            _log_stderr(
+                f"[LLM] HTTP请求 {conn_stats['requests']} 次，新建连接 {conn_stats['new_connections']} 次"
+                f"（TLS握手 {conn_stats['tls_handshakes']} 次），复用连接 {conn_stats['reused_connections']} 次"
             )
-            elapsed = time.time() - llm_start
-            print(f"[LLM] 人员概括[{topic}] 完成，用时 {elapsed:.1f}s", file=sys.stderr, flush=True)
-        except Exception as exc:
-            warnings.append(f"主题[{topic}] LLM人员概括失败，已保留现有统计: {exc}")
-            print(f"[LLM] 人员概括[{topic}] 失败: {exc}", file=sys.stderr, flush=True)
 
-        topic_results[topic] = merged_stats
+    profile.stop(stage)
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = output_dir / f"qms_report_{timestamp}.md"
     pdf_path = output_dir / f"qms_report_{timestamp}.pdf"
     detail_path = output_dir / f"qms_report_{timestamp}.json"
@@ -208,45 +598,60 @@ def main() -> int:
 
     overdue_event_count = 0
     overdue_excel_exported = False
-    try:
-        overdue_event_count = export_overdue_events_excel(overdue_excel_path, module_local_results)
-        overdue_excel_exported = True
-    except Exception as exc:
-        warnings.append(f"超期事件Excel导出失败: {exc}")
-        print(f"[EXPORT] 超期事件Excel导出失败: {exc}", file=sys.stderr, flush=True)
+    with profile_span("stages", "excel_export"):
+        try:
+            from .overdue_excel_exporter import export_overdue_events_excel
+
+            overdue_event_count = export_overdue_events_excel(
+                overdue_excel_path, module_local_results, topic_results
+            )
+            overdue_excel_exported = True
+        except Exception as exc:
+            warnings.append(f"超期事件Excel导出失败: {exc}")
+            print(f"[EXPORT] 超期事件Excel导出失败: {exc}", file=sys.stderr, flush=True)
+
+    with profile_span("stages", "render"):
+        report_text = render_markdown_report(
+            report_date=report_date,
+            config_path=config_path,
+            topic_results=topic_results,
+            warnings=warnings,
+            processed_files=processed_files,
+            skipped_files=skipped_files,
+        )
+        report_path.write_text(report_text, encoding="utf-8")
 
-    report_text = render_markdown_report(
-        report_date=report_date,
-        config_path=config_path,
-        topic_results=topic_results,
-        warnings=warnings,
-        processed_files=processed_files,
-        skipped_files=skipped_files,
-    )
-    report_path.write_text(report_text, encoding="utf-8")
     pdf_exported = False
-    pdf_engine = os.getenv("QMS_PDF_ENGINE", "latex").strip().lower() or "latex"
-    try:
-        if pdf_engine == "reportlab":
-            export_markdown_file_to_pdf(report_path, pdf_path)
-        else:
-            latex_result = export_markdown_file_to_pdf_latex(report_path, pdf_path)
-            if latex_result.mode == "plain":
-                reason = latex_result.fallback_reason or "增强样式导出失败"
-                fallback_msg = f"PDF已降级为基础LaTeX样式（未应用pandoc_header.tex）: {reason}"
-                warnings.append(fallback_msg)
-                print(f"[EXPORT] {fallback_msg}", file=sys.stderr, flush=True)
-        pdf_exported = True
-    except Exception as exc:
+    if export_pdf:
+        from .pdf_exporter import export_markdown_file_to_pdf
+        from .pdf_exporter_latex import export_markdown_file_to_pdf_latex
+
+        stage = profile.start("stages", "pdf")
+        pdf_engine = os.getenv("QMS_PDF_ENGINE", "latex").strip().lower() or "latex"
         try:
-            export_markdown_file_to_pdf(report_path, pdf_path)
+            if pdf_engine == "reportlab":
+                export_markdown_file_to_pdf(report_path, pdf_path)
+            else:
+                latex_result = export_markdown_file_to_pdf_latex(report_path, pdf_path)
+                if latex_result.mode == "plain":
+                    reason = latex_result.fallback_reason or "增强样式导出失败"
+                    fallback_msg = f"PDF已降级为基础LaTeX样式（未应用pandoc_header.tex）: {reason}"
+                    warnings.append(fallback_msg)
+                    print(f"[EXPORT] {fallback_msg}", file=sys.stderr, flush=True)
             pdf_exported = True
-            fallback_msg = f"PDF导出已回退到reportlab: {exc}"
-            warnings.append(fallback_msg)
-            print(f"[EXPORT] {fallback_msg}", file=sys.stderr, flush=True)
-        except Exception as fallback_exc:
-            warnings.append(f"PDF导出失败: {exc}; 回退失败: {fallback_exc}")
-            print(f"[EXPORT] PDF导出失败: {exc}; 回退失败: {fallback_exc}", file=sys.stderr, flush=True)
+        except Exception as exc:
+            try:
+                export_markdown_file_to_pdf(report_path, pdf_path)
+                pdf_exported = True
+                fallback_msg = f"PDF导出已回退到reportlab: {exc}"
+                warnings.append(fallback_msg)
+                print(f"[EXPORT] {fallback_msg}", file=sys.stderr, flush=True)
+            except Exception as fallback_exc:
+                warnings.append(f"PDF导出失败: {exc}; 回退失败: {fallback_exc}")
+                print(f"[EXPORT] PDF导出失败: {exc}; 回退失败: {fallback_exc}", file=sys.stderr, flush=True)
+
+        stage["engine"] = pdf_engine
+        profile.stop(stage)
 
     detail_payload = {
         "report_date": report_date.isoformat(),
@@ -261,10 +666,16 @@ def main() -> int:
     }
     detail_path.write_text(json.dumps(detail_payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
-    print(f"报告已生成: {report_path}")
-    if pdf_exported:
-        print(f"PDF已生成: {pdf_path}")
-    print(f"明细已生成: {detail_path}")
-    if overdue_excel_exported:
-        print(f"超期事件Excel已生成: {overdue_excel_path} (共 {overdue_event_count} 条)")
-    return 0
+    profile_path: Path | None = None
+    if args.profile:
+        profile_path = output_dir / f"qms_profile_{timestamp}.json"
+        profile.write(profile_path)
+
+    return {
+        "report": report_path,
+        "pdf_report": pdf_path if pdf_exported else None,
+        "detail": detail_path,
+        "overdue_excel": overdue_excel_path if overdue_excel_exported else None,
+        "overdue_event_count": overdue_event_count,
+        "profile": profile_path,
+    }
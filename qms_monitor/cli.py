@@ -36,31 +36,109 @@ def load_env_file(path: str | Path = ENV_FILE_DEFAULT) -> None:
         os.environ.setdefault(key, value)
 
 
-def parse_args() -> argparse.Namespace:
-    load_env_file()
-
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="QMS monitor report generator")
     parser.add_argument("--config", default="config.xlsx", help="配置文件路径")
     parser.add_argument("--output-dir", default="outputs", help="报告输出目录")
     parser.add_argument(
         "--input-mode",
-        choices=["excel", "csv"],
+        choices=["excel", "csv", "xlsx"],
         default=os.getenv("QMS_INPUT_MODE", "excel"),
-        help="数据输入模式：excel(默认) 或 csv",
+        help="数据输入模式：excel(默认，Excel COM)、csv(CSV缓存) 或 xlsx(直接解析xlsx/xlsm，无需Excel)",
     )
     parser.add_argument(
         "--csv-manifest",
         default=os.getenv("QMS_CSV_MANIFEST", ""),
         help="CSV模式下使用的manifest.json路径",
     )
+    parser.add_argument(
+        "--event-cache",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("QMS_EVENT_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"},
+        help="CSV模式下启用/禁用已解析事件的二进制列式缓存（位于manifest同目录的events/）",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("QMS_CSV_WORKERS", "1") or 1),
+        help="csv模式下并行解析台账的进程数，默认1（单进程）；结果按row_no顺序合并，与单进程一致",
+    )
+    parser.add_argument(
+        "--excel-workers",
+        type=int,
+        default=int(os.getenv("QMS_EXCEL_WORKERS", "1") or 1),
+        help="excel模式下并行读取台账的Excel进程数，默认1（单进程）",
+    )
+    parser.add_argument(
+        "--stats-engine",
+        choices=["python", "columnar"],
+        default=os.getenv("QMS_STATS_ENGINE", "python"),
+        help="统计引擎：python(默认，逐事件) 或 columnar(列式数组批量统计，结果相同，适合大台账)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("QMS_STREAMING", "0").strip().lower() in {"1", "true", "yes", "on"},
+        help="流式处理：逐行读取台账并增量统计，仅保留超期记录，内存占用与台账总量无关（使用python统计引擎）",
+    )
     parser.add_argument(
         "--report-date",
         default=date.today().isoformat(),
         help="统计基准日期，格式 YYYY-MM-DD，默认当天",
     )
+    parser.add_argument(
+        "--profile",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("QMS_PROFILE", "0").strip().lower() in {"1", "true", "yes", "on"},
+        help="额外输出性能剖析文件 qms_profile_<时间戳>.json（各阶段、各台账、各次LLM调用的耗时与CPU时间），默认关闭",
+    )
     parser.add_argument(
         "--skip-llm",
         action="store_true",
         help="跳过LLM调用，仅使用本地统计",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--llm-cache",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("QMS_LLM_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"},
+        help="启用/禁用LLM响应本地缓存（--no-llm-cache 强制重新请求）",
+    )
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    load_env_file()
+    return build_parser().parse_args(argv)
+
+
+def parse_serve_args(argv: list[str] | None = None) -> argparse.Namespace:
+    load_env_file()
+
+    parser = build_parser()
+    parser.prog = f"{parser.prog} serve"
+    parser.description = "Keep ledgers in memory and regenerate QMS reports on request"
+    parser.add_argument(
+        "--host",
+        default=os.getenv("QMS_SERVE_HOST", "127.0.0.1"),
+        help="HTTP监听地址，默认 127.0.0.1（仅本机）",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=int(os.getenv("QMS_SERVE_PORT", "8787") or 8787),
+        help="HTTP监听端口，默认 8787",
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.getenv("QMS_SERVE_SOCKET", ""),
+        help="改为监听的Unix socket路径（指定后忽略 --host/--port，仅限 Linux/macOS）",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=float(os.getenv("QMS_SERVE_WATCH_INTERVAL", "5") or 0),
+        help="检查CSV缓存/源文件变化的间隔秒数，默认 5；0 表示只在请求时检查",
+    )
+    # Without --report-date each request defaults to the day it is made.
+    parser.set_defaults(report_date="")
+    return parser.parse_args(argv)
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date
+from itertools import compress, repeat
+from operator import and_, attrgetter, itemgetter
+from typing import Any
+
+from .event_cache import DATE_COLUMNS, STRING_COLUMNS, EventColumns
+from .models import QmsEvent
+from .stats import RANKED_FIELDS, is_open_status
+
+
+__all__ = [
+    "EventTable",
+    "build_local_stats_columnar",
+    "build_topic_stats_columnar",
+    "build_event_records_columnar",
+    "build_overdue_event_records_columnar",
+]
+
+# Per-row text fields in an EventTable, including the per-ledger constants that
+# EventColumns keeps out of its rows.
+TABLE_STRING_COLUMNS = ("topic", "module", "year", "source_file", "source_sheet", *STRING_COLUMNS)
+
+
+def _take(values: Sequence[Any], indices: Sequence[int]) -> Sequence[Any]:
+    # itemgetter gathers all indices in one C call; it returns a bare item for one index.
+    if len(indices) > 1:
+        return itemgetter(*indices)(values)
+    return [values[idx] for idx in indices]
+
+
+class EventTable:
+    def __init__(self):
+        # Missing keys get the current table size, so __getitem__ interns in C.
+        self._index: defaultdict[str, int] = defaultdict()
+        self._index.default_factory = self._index.__len__
+        self._strings: list[str] = []
+        self.columns: dict[str, array] = {name: array("I") for name in TABLE_STRING_COLUMNS}
+        self.columns.update((name, array("i")) for name in DATE_COLUMNS)
+        self.columns["row_index"] = array("i")
+
+    def __len__(self) -> int:
+        return len(self.columns["row_index"])
+
+    @property
+    def strings(self) -> list[str]:
+        if len(self._strings) != len(self._index):
+            self._strings = list(self._index)
+        return self._strings
+
+    def append_events(self, events: Sequence[QmsEvent]) -> None:
+        intern = self._index.__getitem__
+        for name in TABLE_STRING_COLUMNS:
+            self.columns[name].extend(map(intern, map(attrgetter(name), events)))
+        for name in DATE_COLUMNS:
+            self.columns[name].extend(
+                value.toordinal() if value is not None else 0 for value in map(attrgetter(name), events)
+            )
+        self.columns["row_index"].extend(map(attrgetter("row_index"), events))
+
+    def append_columns(self, ledger: EventColumns) -> None:
+        count = len(ledger)
+        intern = self._index.__getitem__
+        for name, value in ledger.constants.items():
+            self.columns[name].extend(array("I", [intern(value)]) * count)
+        local_ids = array("I", map(intern, ledger.strings))
+        for name in STRING_COLUMNS:
+            self.columns[name].extend(map(local_ids.__getitem__, ledger.columns[name]))
+        for name in (*DATE_COLUMNS, "row_index"):
+            self.columns[name].frombytes(memoryview(ledger.columns[name]).cast("B"))
+
+    def group_rows(
+        self,
+        field: str,
+        rows: Iterable[int] | None = None,
+        key: Callable[[str], str] | None = None,
+    ) -> dict[str, list[int]]:
+        # Groups keep first-appearance order and row order, matching a
+        # defaultdict(list) filled event by event.
+        column = self.columns[field]
+        row_list = range(len(self)) if rows is None else list(rows)
+        ids = _take(column, row_list)
+        strings = self.strings
+        key_by_id = {value_id: strings[value_id] if key is None else key(strings[value_id]) for value_id in set(ids)}
+        keys = list(map(key_by_id.__getitem__, ids))
+        return {name: list(compress(row_list, map(name.__eq__, keys))) for name in dict.fromkeys(keys)}
+
+
+RECORD_TEXT_FIELDS = ("topic", "module", "year", "event_id", "content")
+RECORD_TAIL_FIELDS = ("status", "owner_dept", "owner", "qa", "qa_manager")
+
+
+def _gather_texts(table: EventTable, name: str, rows: Sequence[int]) -> Sequence[str]:
+    return _take(table.strings, _take(table.columns[name], rows))
+
+
+def _gather_iso_dates(table: EventTable, name: str, rows: Sequence[int]) -> list[str]:
+    ordinals = _take(table.columns[name], rows)
+    iso = {ordinal: date.fromordinal(ordinal).isoformat() if ordinal else "" for ordinal in set(ordinals)}
+    return list(map(iso.__getitem__, ordinals))
+
+
+def _record_columns(table: EventTable, rows: Sequence[int]) -> list[Sequence[Any]]:
+    columns = [_gather_texts(table, name, rows) for name in RECORD_TEXT_FIELDS]
+    columns.extend(_gather_iso_dates(table, name, rows) for name in DATE_COLUMNS)
+    columns.extend(_gather_texts(table, name, rows) for name in RECORD_TAIL_FIELDS)
+    return columns
+
+
+def _overdue_item(
+    topic: str,
+    module: str,
+    year: str,
+    event_id: str,
+    content: str,
+    initiated_date: str,
+    planned_date: str,
+    status: str,
+    owner_dept: str,
+    owner: str,
+    qa: str,
+    qa_manager: str,
+    source: str,
+) -> dict[str, Any]:
+    return {
+        "topic": topic,
+        "module": module,
+        "year": year,
+        "event_id": event_id,
+        "content": content,
+        "initiated_date": initiated_date,
+        "planned_date": planned_date,
+        "status": status,
+        "owner_dept": owner_dept,
+        "owner": owner,
+        "qa": qa,
+        "qa_manager": qa_manager,
+        "source": source,
+    }
+
+
+def _event_record(
+    topic: str,
+    module: str,
+    year: str,
+    event_id: str,
+    content: str,
+    initiated_date: str,
+    planned_date: str,
+    status: str,
+    owner_dept: str,
+    owner: str,
+    qa: str,
+    qa_manager: str,
+    status_semantic: str,
+    source_file: str,
+    source_sheet: str,
+    source_row: int,
+) -> dict[str, Any]:
+    return {
+        "topic": topic,
+        "module": module,
+        "year": year,
+        "event_id": event_id,
+        "content": content,
+        "initiated_date": initiated_date,
+        "planned_date": planned_date,
+        "status": status,
+        "owner_dept": owner_dept,
+        "owner": owner,
+        "qa": qa,
+        "qa_manager": qa_manager,
+        "status_semantic": status_semantic,
+        "source_file": source_file,
+        "source_sheet": source_sheet,
+        "source_row": source_row,
+    }
+
+
+def _overdue_items(table: EventTable, rows: Sequence[int]) -> list[dict[str, Any]]:
+    # Fields are gathered column by column; only the final dict is built per row.
+    columns = _record_columns(table, rows)
+    columns.append(
+        list(
+            map(
+                "{} | {} | row {}".format,
+                _gather_texts(table, "source_file", rows),
+                _gather_texts(table, "source_sheet", rows),
+                _take(table.columns["row_index"], rows),
+            )
+        )
+    )
+    return list(map(_overdue_item, *columns))
+
+
+def _event_records(table: EventTable, rows: Sequence[int], open_flags: Iterable[bool]) -> list[dict[str, Any]]:
+    columns = _record_columns(table, rows)
+    columns.append(["open" if is_open else "completed" for is_open in open_flags])
+    columns.append(_gather_texts(table, "source_file", rows))
+    columns.append(_gather_texts(table, "source_sheet", rows))
+    columns.append(_take(table.columns["row_index"], rows))
+    return list(map(_event_record, *columns))
+
+
+def _open_pairs(
+    table: EventTable,
+    rows: Sequence[int],
+    rules: dict[str, str],
+    module: str | None = None,
+) -> tuple[list[tuple[int, int]], set[tuple[int, int]]]:
+    status_col = table.columns["status"]
+    if module is None:
+        module_ids = _take(table.columns["module"], rows)
+    else:
+        module_ids = [table._index[module]] * len(rows)
+    pairs = list(zip(module_ids, _take(status_col, rows)))
+    strings = table.strings
+    # is_open_status runs once per distinct (module, status) pair, in row order so a
+    # missing rule raises for the same module as the per-event implementation.
+    open_pairs = {
+        pair for pair in dict.fromkeys(pairs) if is_open_status(strings[pair[0]], strings[pair[1]], rules)
+    }
+    return pairs, open_pairs
+
+
+def _overdue_rows(
+    table: EventTable,
+    rows: Sequence[int],
+    report_date: date,
+    rules: dict[str, str],
+    module: str | None = None,
+) -> list[int]:
+    planned = _take(table.columns["planned_date"], rows)
+    cutoff = report_date.toordinal()
+    dated_rows = list(compress(rows, map(and_, map(bool, planned), map(cutoff.__gt__, planned))))
+    pairs, open_pairs = _open_pairs(table, dated_rows, rules, module)
+    return list(compress(dated_rows, map(open_pairs.__contains__, pairs)))
+
+
+def _sort_overdue_rows(table: EventTable, rows: list[int]) -> list[int]:
+    planned = table.columns["planned_date"]
+    event_ids = table.columns["event_id"]
+    strings = table.strings
+    return sorted(rows, key=lambda row: (planned[row], strings[event_ids[row]]))
+
+
+def _count_by(table: EventTable, field: str, rows: Sequence[int]) -> dict[str, int]:
+    strings = table.strings
+    return {strings[value_id]: count for value_id, count in Counter(_take(table.columns[field], rows)).items()}
+
+
+def _ranked_names(table: EventTable, field: str, rows: Sequence[int]) -> tuple[list[dict[str, Any]], list[str]]:
+    strings = table.strings
+    ids = _take(table.columns[field], rows)
+    names_by_id = {value_id: strings[value_id].strip() for value_id in set(ids)}
+    counter: Counter[str] = Counter()
+    for value_id, count in Counter(ids).items():
+        name = names_by_id[value_id]
+        if name:
+            counter[name] += count
+    ranked = [{"name": name, "count": count} for name, count in sorted(counter.items(), key=lambda x: (-x[1], x[0]))]
+    return ranked, [names_by_id[value_id] for value_id in ids]
+
+
+def _top20_payload(
+    ranked_rows: list[dict[str, Any]],
+    row_names: list[str],
+    items: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    if not ranked_rows:
+        return []
+
+    top_n = max(1, math.ceil(len(ranked_rows) * 0.2))
+    threshold_count = ranked_rows[top_n - 1]["count"]
+    top_rows = [row for row in ranked_rows if row["count"] >= threshold_count]
+    wanted = {row["name"]: [] for row in top_rows}
+    for name, item in zip(row_names, items):
+        bucket = wanted.get(name)
+        if bucket is not None:
+            bucket.append(
+                {
+                    "module": item["module"],
+                    "year": item["year"],
+                    "event_id": item["event_id"],
+                    "content": item["content"],
+                    "planned_date": item["planned_date"],
+                    "status": item["status"],
+                    "owner_dept": item["owner_dept"],
+                }
+            )
+    return [{"name": row["name"], "count": row["count"], "overdue_items": wanted[row["name"]]} for row in top_rows]
+
+
+def _ranked_stats(table: EventTable, overdue_rows: list[int], items: list[dict[str, Any]]) -> dict[str, Any]:
+    ranked: dict[str, list[dict[str, Any]]] = {}
+    row_names: dict[str, list[str]] = {}
+    for field in RANKED_FIELDS:
+        ranked[field], row_names[field] = _ranked_names(table, field, overdue_rows)
+    for row in ranked["qa"]:
+        row["summary"] = ""
+    for row in ranked["qa_manager"]:
+        row["summary"] = ""
+    return {
+        "overdue_by_qa": ranked["qa"],
+        "overdue_by_qa_manager": ranked["qa_manager"],
+        "overdue_by_owner_dept": ranked["owner_dept"],
+        "overdue_by_owner": ranked["owner"],
+        "overdue_by_qa_top20": _top20_payload(ranked["qa"], row_names["qa"], items),
+        "overdue_by_qa_manager_top20": _top20_payload(ranked["qa_manager"], row_names["qa_manager"], items),
+    }
+
+
+def build_local_stats_columnar(
+    module: str,
+    table: EventTable,
+    rows: Sequence[int],
+    report_date: date,
+    open_status_rules: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    rules = open_status_rules or {}
+    overdue_rows = _sort_overdue_rows(table, _overdue_rows(table, rows, report_date, rules, module))
+    overdue_items = _overdue_items(table, overdue_rows)
+    total = len(rows)
+    overdue_count = len(overdue_items)
+    ratio = round((overdue_count / total) * 100, 2) if total else 0.0
+
+    yearly_totals = [{"year": y, "count": c} for y, c in sorted(_count_by(table, "year", rows).items(), key=lambda x: x[0])]
+    ranked = _ranked_stats(table, overdue_rows, overdue_items)
+
+    return {
+        "module": module,
+        "yearly_totals": yearly_totals,
+        "overdue": {
+            "count": overdue_count,
+            "ratio": ratio,
+            "items": overdue_items,
+        },
+        **ranked,
+    }
+
+
+def _ratio_rows(key: str, totals: dict[str, int], overdue: dict[str, int]) -> list[dict[str, Any]]:
+    result = []
+    for name, total in sorted(totals.items(), key=lambda x: x[0]):
+        overdue_count = overdue.get(name, 0)
+        ratio = round((overdue_count / total) * 100, 2) if total else 0.0
+        result.append({key: name, "count": total, "overdue_count": overdue_count, "overdue_ratio": ratio})
+    return result
+
+
+def build_topic_stats_columnar(
+    topic: str,
+    table: EventTable,
+    rows: Sequence[int],
+    report_date: date,
+    open_status_rules: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    rules = open_status_rules or {}
+    overdue_rows = _overdue_rows(table, rows, report_date, rules)
+    yearly_total_counter = _count_by(table, "year", rows)
+    yearly_overdue_counter = _count_by(table, "year", overdue_rows)
+    module_total_counter = _count_by(table, "module", rows)
+    module_overdue_counter = _count_by(table, "module", overdue_rows)
+
+    overdue_rows = _sort_overdue_rows(table, overdue_rows)
+    overdue_items = _overdue_items(table, overdue_rows)
+    total_count = len(rows)
+    overdue_count = len(overdue_items)
+    overdue_ratio = round((overdue_count / total_count) * 100, 2) if total_count else 0.0
+
+    yearly_totals = [{"year": y, "count": c} for y, c in sorted(yearly_total_counter.items(), key=lambda x: x[0])]
+    ranked = _ranked_stats(table, overdue_rows, overdue_items)
+
+    return {
+        "topic": topic,
+        "yearly_totals": yearly_totals,
+        "yearly_overdue": _ratio_rows("year", yearly_total_counter, yearly_overdue_counter),
+        "total": {"count": total_count},
+        "overdue": {
+            "count": overdue_count,
+            "ratio": overdue_ratio,
+            "items": overdue_items,
+        },
+        "by_module": _ratio_rows("module", module_total_counter, module_overdue_counter),
+        **ranked,
+    }
+
+
+def build_event_records_columnar(
+    table: EventTable,
+    rows: Sequence[int],
+    open_status_rules: dict[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    pairs, open_pairs = _open_pairs(table, rows, open_status_rules or {})
+    return _event_records(table, rows, map(open_pairs.__contains__, pairs))
+
+
+def build_overdue_event_records_columnar(
+    table: EventTable,
+    rows: Sequence[int],
+    report_date: date,
+    open_status_rules: dict[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    # The list-based version checks the status rule of every event, not only dated ones.
+    _open_pairs(table, rows, open_status_rules or {})
+    overdue_rows = _overdue_rows(table, rows, report_date, open_status_rules or {})
+    return _event_records(table, overdue_rows, repeat(True, len(overdue_rows)))
@@ -43,13 +43,24 @@ def _parse_planned_rule(raw: str, row_no: int, module: str, warnings: list[str])
     return None, None
 
 
-def load_config(config_path: Path) -> tuple[list[LedgerConfig], list[str]]:
-    warnings: list[str] = []
+def _read_config_rows(config_path: Path, engine: str) -> list[list[str]]:
+    if engine == "xlsx":
+        from .xlsx_reader import read_xlsx_rows
+
+        try:
+            return read_xlsx_rows(config_path, sheet=1)
+        except Exception as exc:
+            raise RuntimeError(f"读取配置失败: {type(exc).__name__} - {exc}") from exc
+
     result = read_excel_document(str(config_path), sheet=1)
     if not result.ok:
         raise RuntimeError(f"读取配置失败: {result.error_type} - {result.error_message}")
+    return parse_tabular_text(result.text)
 
-    rows = parse_tabular_text(result.text)
+
+def load_config(config_path: Path, *, engine: str = "excel") -> tuple[list[LedgerConfig], list[str]]:
+    warnings: list[str] = []
+    rows = _read_config_rows(config_path, engine)
     if not rows:
         raise RuntimeError("配置文件为空")
 
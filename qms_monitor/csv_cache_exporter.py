@@ -1,101 +1,186 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .config_loader import build_open_status_rules, load_config
-from .csv_io import dump_csv_manifest, write_csv_rows
-from .excel_reader import ExcelBatchReader
+from .csv_io import CSV_WRITE_ENCODING, dump_csv_manifest, write_csv_rows
+from .excel_reader import ExcelBatchReader, _normalize_excel_path
+from .ledger_reader import iter_ledger_rows
+from .models import LedgerConfig
 
+if TYPE_CHECKING:
+    from .excel_pool import ExcelReaderPool
 
-def _safe_cell_str(value: Any) -> str:
-    return "" if value is None else str(value).strip()
 
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-def _values_to_rows(values: Any) -> list[list[str]]:
-    if values is None:
-        return []
 
-    if not isinstance(values, tuple):
-        return [[_safe_cell_str(values)]]
-
-    rows: list[list[str]] = []
-    for row in values:
-        if isinstance(row, tuple):
-            rows.append([_safe_cell_str(cell) for cell in row])
-        else:
-            rows.append([_safe_cell_str(row)])
-    return rows
+def _source_fingerprint(file_path: str, content_hash: bool) -> dict[str, Any] | None:
+    path = Path(_normalize_excel_path(file_path))
+    try:
+        stat = path.stat()
+        fingerprint: dict[str, Any] = {"source_mtime": stat.st_mtime, "source_size": stat.st_size}
+        if content_hash:
+            fingerprint["source_sha256"] = _file_sha256(path)
+    except OSError:
+        return None
+    return fingerprint
 
 
-def export_csv_cache(config_path: Path, output_dir: Path) -> tuple[Path, list[str]]:
+def _load_previous_items(manifest_path: Path) -> dict[int, dict[str, Any]]:
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return {}
+    return {item["row_no"]: item for item in items if isinstance(item, dict) and isinstance(item.get("row_no"), int)}
+
+
+def _is_reusable(
+    previous: dict[str, Any] | None,
+    cfg: LedgerConfig,
+    fingerprint: dict[str, Any] | None,
+    projected_columns: list[int] | None,
+    output_dir: Path,
+) -> bool:
+    if previous is None or fingerprint is None or not previous.get("ok"):
+        return False
+    if previous.get("config") != asdict(cfg) or previous.get("projected_columns") != projected_columns:
+        return False
+    if "source_sha256" in fingerprint:
+        # With a content hash, a touched-but-identical file is still considered unchanged.
+        if previous.get("source_size") != fingerprint["source_size"]:
+            return False
+        if previous.get("source_sha256") != fingerprint["source_sha256"]:
+            return False
+    elif any(previous.get(key) != fingerprint[key] for key in ("source_mtime", "source_size")):
+        return False
+    csv_path = previous.get("csv_path")
+    return isinstance(csv_path, str) and (output_dir / csv_path).is_file()
+
+
+def export_csv_cache(
+    config_path: Path,
+    output_dir: Path,
+    *,
+    excel_workers: int = 1,
+    task_timeout: float = 600,
+    all_columns: bool = False,
+    incremental: bool = False,
+    content_hash: bool = False,
+) -> tuple[Path, list[str]]:
     configs, warnings = load_config(config_path)
     build_open_status_rules(configs)
 
-    rows_dir = output_dir / "rows"
     manifest_path = output_dir / "manifest.json"
+    previous_items = _load_previous_items(manifest_path) if incremental else {}
+
+    items_by_row: dict[int, dict[str, Any]] = {}
+    fingerprints: dict[int, dict[str, Any] | None] = {}
+    to_read: list[LedgerConfig] = []
+    for cfg in configs:
+        fingerprint = _source_fingerprint(cfg.file_path, content_hash)
+        fingerprints[cfg.row_no] = fingerprint
+        projected_columns = None if all_columns else cfg.used_columns()
+        previous = previous_items.get(cfg.row_no)
+        if incremental and _is_reusable(previous, cfg, fingerprint, projected_columns, output_dir):
+            items_by_row[cfg.row_no] = dict(previous)
+        else:
+            to_read.append(cfg)
 
-    items: list[dict[str, Any]] = []
+    reader_pool: ExcelReaderPool | None = None
     batch_reader: ExcelBatchReader | None = None
     try:
-        batch_reader = ExcelBatchReader(visible=False).open()
+        if excel_workers > 1 and len(to_read) > 1:
+            from .excel_pool import ExcelReaderPool
 
-        for cfg in configs:
-            sheet: str | int = int(cfg.sheet_name) if cfg.sheet_name.isdigit() else cfg.sheet_name
-            ok, values, err, _, last_row, last_col, sheet_name = batch_reader.read_cells_sheet(
-                cfg.file_path,
-                sheet=sheet,
-                auto_bounds=True,
-                look_in="formulas",
-            )
+            try:
+                reader_pool = ExcelReaderPool(
+                    excel_workers,
+                    task_timeout=task_timeout,
+                    all_columns=all_columns,
+                ).open()
+            except Exception as exc:
+                warnings.append(f"并行读取初始化失败，已回退单进程批量读取: {exc}")
+                reader_pool = None
+
+        if reader_pool is not None:
+            results = reader_pool.imap(to_read)
+        elif to_read:
+            batch_reader = ExcelBatchReader(visible=False).open()
+            results = iter_ledger_rows(batch_reader, to_read, all_columns=all_columns)
+        else:
+            results = iter(())
 
+        for cfg, (ok, rows, err, last_row, last_col, sheet_name) in zip(to_read, results):
             rel_csv = Path("rows") / f"row_{cfg.row_no:04d}.csv"
             csv_path = output_dir / rel_csv
 
             if not ok:
-                items.append(
-                    {
-                        "row_no": cfg.row_no,
-                        "config": asdict(cfg),
-                        "module": cfg.module,
-                        "year": cfg.year,
-                        "source_file": cfg.file_path,
-                        "source_sheet": cfg.sheet_name,
-                        "ok": False,
-                        "error": err,
-                    }
-                )
-                continue
-
-            rows = _values_to_rows(values)
-            write_csv_rows(csv_path, rows)
-            items.append(
-                {
+                items_by_row[cfg.row_no] = {
                     "row_no": cfg.row_no,
                     "config": asdict(cfg),
                     "module": cfg.module,
                     "year": cfg.year,
                     "source_file": cfg.file_path,
-                    "source_sheet": sheet_name or cfg.sheet_name,
-                    "ok": True,
-                    "csv_path": rel_csv.as_posix(),
-                    "last_row": last_row,
-                    "last_col": last_col,
+                    "source_sheet": cfg.sheet_name,
+                    "ok": False,
+                    "error": err,
                 }
-            )
+                continue
+
+            write_csv_rows(csv_path, rows)
+            item = {
+                "row_no": cfg.row_no,
+                "config": asdict(cfg),
+                "module": cfg.module,
+                "year": cfg.year,
+                "source_file": cfg.file_path,
+                "source_sheet": sheet_name or cfg.sheet_name,
+                "ok": True,
+                "csv_path": rel_csv.as_posix(),
+                "encoding": CSV_WRITE_ENCODING,
+                "row_count": len(rows),
+                "column_count": max((len(row) for row in rows), default=0),
+                "last_row": last_row,
+                "last_col": last_col,
+                "projected_columns": None if all_columns else cfg.used_columns(),
+                "exported_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            item.update(fingerprints.get(cfg.row_no) or {})
+            items_by_row[cfg.row_no] = item
     finally:
+        if reader_pool is not None:
+            try:
+                reader_pool.close()
+            except Exception:
+                pass
         if batch_reader is not None:
             try:
                 batch_reader.close()
             except Exception:
                 pass
 
+    items = [items_by_row[cfg.row_no] for cfg in configs if cfg.row_no in items_by_row]
     manifest = {
         "generated_at": datetime.now().isoformat(timespec="seconds"),
         "config_path": str(config_path),
         "output_dir": str(output_dir),
+        "incremental": incremental,
+        "reused_count": len(configs) - len(to_read),
+        "exported_count": len(to_read),
         "items": items,
     }
     dump_csv_manifest(manifest_path, manifest)
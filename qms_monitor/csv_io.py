@@ -1,16 +1,47 @@
 from __future__ import annotations
 
+import codecs
 import csv
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 from .models import LedgerConfig
 
 
-def read_csv_rows(path: Path) -> tuple[list[list[str]], str | None]:
-    encodings = ["utf-8-sig", "utf-8", "gb18030"]
-    for encoding in encodings:
+CSV_ENCODINGS = ("utf-8-sig", "utf-8", "gb18030")
+CSV_WRITE_ENCODING = "utf-8-sig"
+_DECODE_CHUNK_SIZE = 1 << 20
+_SNIFF_SIZE = 64 * 1024
+
+
+def sniff_csv_encoding(path: Path) -> str | None:
+    # Guess from the first bytes only; callers still fall back to the other encodings.
+    try:
+        with path.open("rb") as file:
+            prefix = file.read(_SNIFF_SIZE)
+    except OSError:
+        return None
+    if prefix.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+    except UnicodeDecodeError:
+        return "gb18030"
+    # utf-8-sig also reads BOM-less UTF-8, matching the trial order below.
+    return "utf-8-sig"
+
+
+def _candidate_encodings(path: Path, encoding: str | None) -> tuple[str, ...]:
+    first = encoding or sniff_csv_encoding(path)
+    if not first:
+        return CSV_ENCODINGS
+    return (first, *(candidate for candidate in CSV_ENCODINGS if candidate != first))
+
+
+def read_csv_rows(path: Path, encoding: str | None = None) -> tuple[list[list[str]], str | None]:
+    for encoding in _candidate_encodings(path, encoding):
         try:
             with path.open("r", encoding=encoding, newline="") as file:
                 rows = [[cell.strip() for cell in row] for row in csv.reader(file)]
@@ -23,9 +54,65 @@ def read_csv_rows(path: Path) -> tuple[list[list[str]], str | None]:
     return [], f"无法解码CSV文件: {path}"
 
 
+def _detect_csv_encoding(path: Path, encoding: str | None = None) -> tuple[str | None, str | None]:
+    # Decode chunk by chunk so a streamed read never has to switch encodings half way through.
+    for encoding in _candidate_encodings(path, encoding):
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            with path.open("rb") as file:
+                while chunk := file.read(_DECODE_CHUNK_SIZE):
+                    decoder.decode(chunk)
+                decoder.decode(b"", final=True)
+            return encoding, None
+        except UnicodeDecodeError:
+            continue
+        except OSError as exc:
+            return None, str(exc)
+
+    return None, f"无法解码CSV文件: {path}"
+
+
+def _iter_csv_file(path: Path, encoding: str, skip: int = 0) -> Iterator[list[str]]:
+    with path.open("r", encoding=encoding, newline="") as file:
+        for index, row in enumerate(csv.reader(file)):
+            if index >= skip:
+                yield [cell.strip() for cell in row]
+
+
+def _iter_recorded_csv_file(path: Path, encoding: str) -> Iterator[list[str]]:
+    # The manifest recorded the encoding the file was written with, so read it directly and only
+    # detect another encoding if it fails. Delimiters are ASCII in every candidate, so rows already
+    # yielded line up with the re-read and are skipped.
+    emitted = 0
+    try:
+        for row in _iter_csv_file(path, encoding):
+            yield row
+            emitted += 1
+        return
+    except UnicodeDecodeError:
+        pass
+    fallback, err = _detect_csv_encoding(path)
+    if fallback is None:
+        raise RuntimeError(err)
+    yield from _iter_csv_file(path, fallback, skip=emitted)
+
+
+def stream_csv_rows(path: Path, encoding: str | None = None) -> tuple[Iterator[list[str]], str | None]:
+    if encoding:
+        try:
+            path.stat()
+        except OSError as exc:
+            return iter(()), str(exc)
+        return _iter_recorded_csv_file(path, encoding), None
+    encoding, err = _detect_csv_encoding(path)
+    if encoding is None:
+        return iter(()), err
+    return _iter_csv_file(path, encoding), None
+
+
 def write_csv_rows(path: Path, rows: list[list[str]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8-sig", newline="") as file:
+    with path.open("w", encoding=CSV_WRITE_ENCODING, newline="") as file:
         writer = csv.writer(file)
         writer.writerows(rows)
 
@@ -156,7 +243,9 @@ def _build_open_status_rules_from_configs(configs: list[LedgerConfig]) -> dict[s
     return rules
 
 
-def load_csv_manifest_bundle(path: Path) -> tuple[list[LedgerConfig], dict[int, Path], dict[str, str], list[str]]:
+def load_csv_manifest_bundle(
+    path: Path,
+) -> tuple[list[LedgerConfig], dict[int, Path], dict[int, str], dict[str, str], list[str]]:
     warnings: list[str] = []
 
     try:
@@ -172,6 +261,8 @@ def load_csv_manifest_bundle(path: Path) -> tuple[list[LedgerConfig], dict[int,
 
     config_map: dict[int, LedgerConfig] = {}
     csv_map: dict[int, Path] = {}
+    # Manifests written before encodings were recorded leave this empty; readers then sniff.
+    csv_encodings: dict[int, str] = {}
     for item in items:
         if not isinstance(item, dict):
             continue
@@ -204,7 +295,10 @@ def load_csv_manifest_bundle(path: Path) -> tuple[list[LedgerConfig], dict[int,
         p = Path(csv_path)
         resolved = p if p.is_absolute() else (path.parent / p)
         csv_map[row_no] = resolved
+        encoding = item.get("encoding")
+        if isinstance(encoding, str) and encoding.strip():
+            csv_encodings[row_no] = encoding.strip()
 
     configs = [config_map[row_no] for row_no in sorted(config_map.keys())]
     open_status_rules = _build_open_status_rules_from_configs(configs)
-    return configs, csv_map, open_status_rules, warnings
+    return configs, csv_map, csv_encodings, open_status_rules, warnings
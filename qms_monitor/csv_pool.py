@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import multiprocessing
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from .csv_io import read_csv_rows
+from .event_cache import (
+    EventColumns,
+    event_cache_fingerprint,
+    event_cache_path,
+    load_event_cache,
+    write_event_cache,
+)
+from .ledger_reader import read_ledger_events
+from .models import LedgerConfig
+
+
+CsvLedgerResult = tuple[LedgerConfig, Optional[Path], Optional[EventColumns], list[str], Optional[str]]
+
+# Ledgers parsed ahead of the one being merged, per worker; bounds memory held in finished futures.
+PREFETCH_PER_WORKER = 2
+
+
+def read_csv_ledger_columns(
+    cfg: LedgerConfig,
+    csv_path: Path,
+    cache_dir: Path | None,
+    encoding: Optional[str] = None,
+) -> tuple[Optional[EventColumns], list[str], Optional[str]]:
+    rows, err = read_csv_rows(csv_path, encoding)
+    if err:
+        return None, [], err
+
+    events, ledger_warnings = read_ledger_events(cfg, source_rows=rows)
+    # Array columns pickle as flat buffers, far cheaper to send back than QmsEvent objects.
+    columns = EventColumns.from_events(cfg, events, ledger_warnings)
+    if cache_dir is not None:
+        fingerprint = event_cache_fingerprint(cfg, csv_path)
+        if fingerprint is not None:
+            try:
+                write_event_cache(event_cache_path(cache_dir, csv_path), fingerprint, columns)
+            except OSError:
+                pass
+    return columns, ledger_warnings, None
+
+
+def _load_cached_columns(cfg: LedgerConfig, csv_path: Path, cache_dir: Path | None) -> Optional[EventColumns]:
+    if cache_dir is None:
+        return None
+    fingerprint = event_cache_fingerprint(cfg, csv_path)
+    if fingerprint is None:
+        return None
+    return load_event_cache(event_cache_path(cache_dir, csv_path), fingerprint)
+
+
+def _resolve(
+    cfg: LedgerConfig,
+    csv_path: Optional[Path],
+    encoding: Optional[str],
+    future: Optional[Future],
+    cached: Optional[EventColumns],
+    cache_dir: Path | None,
+) -> CsvLedgerResult:
+    if csv_path is None:
+        return cfg, None, None, [], None
+    if future is None:
+        return cfg, csv_path, cached, cached.warnings if cached is not None else [], None
+    try:
+        columns, ledger_warnings, err = future.result()
+    except Exception:
+        # A crashed or unpicklable worker result is retried in-process so the run still completes.
+        columns, ledger_warnings, err = read_csv_ledger_columns(cfg, csv_path, cache_dir, encoding)
+    return cfg, csv_path, columns, ledger_warnings, err
+
+
+def iter_csv_ledger_columns(
+    tasks: Iterable[tuple[LedgerConfig, Optional[Path], Optional[str]]],
+    *,
+    workers: int,
+    cache_dir: Path | None = None,
+) -> Iterator[CsvLedgerResult]:
+    # Results come back in task order whatever order the workers finish in.
+    window = max(1, workers) * PREFETCH_PER_WORKER
+    pending: deque[
+        tuple[LedgerConfig, Optional[Path], Optional[str], Optional[Future], Optional[EventColumns]]
+    ] = deque()
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn")) as executor:
+        for cfg, csv_path, encoding in tasks:
+            if csv_path is None:
+                pending.append((cfg, None, None, None, None))
+            else:
+                cached = _load_cached_columns(cfg, csv_path, cache_dir)
+                if cached is not None:
+                    pending.append((cfg, csv_path, encoding, None, cached))
+                else:
+                    future = executor.submit(read_csv_ledger_columns, cfg, csv_path, cache_dir, encoding)
+                    pending.append((cfg, csv_path, encoding, future, None))
+            while len(pending) > window:
+                yield _resolve(*pending.popleft(), cache_dir)
+        while pending:
+            yield _resolve(*pending.popleft(), cache_dir)
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterator
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional
+
+from .models import LedgerConfig, QmsEvent
+
+
+EVENT_CACHE_VERSION = 1
+EVENT_CACHE_SUFFIX = ".qev"
+MAGIC = b"QMSEVC01"
+_PREAMBLE = struct.Struct("<8sI")
+_ALIGN = 8
+
+# Dates are stored as proleptic ordinals (date.toordinal); 0 means no date.
+DATE_COLUMNS = ("initiated_date", "planned_date")
+# Free-text and name fields are dictionary-encoded into one shared string table.
+STRING_COLUMNS = ("event_id", "content", "status", "owner_dept", "owner", "qa", "qa_manager")
+INT_COLUMNS = ("row_index",)
+# Per-ledger constants come from the config and are not stored per row.
+CONSTANT_FIELDS = ("topic", "module", "year", "source_file", "source_sheet")
+
+
+def event_cache_path(cache_dir: Path, csv_path: Path) -> Path:
+    return cache_dir / f"{csv_path.stem}{EVENT_CACHE_SUFFIX}"
+
+
+def event_cache_fingerprint(cfg: LedgerConfig, source_path: Path) -> Optional[str]:
+    try:
+        stat = source_path.stat()
+    except OSError:
+        return None
+    material = json.dumps(
+        {
+            "version": EVENT_CACHE_VERSION,
+            "config": asdict(cfg),
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _date_ordinal(value: date | None) -> int:
+    return value.toordinal() if value is not None else 0
+
+
+class EventColumns:
+    def __init__(
+        self,
+        *,
+        constants: dict[str, str],
+        strings: list[str],
+        columns: dict[str, Any],
+        warnings: list[str],
+        buffer: Optional[mmap.mmap] = None,
+    ):
+        self.constants = constants
+        self.strings = strings
+        self.columns = columns
+        self.warnings = warnings
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.columns["row_index"])
+
+    def dates(self, name: str) -> list[date | None]:
+        # Ledgers share few distinct dates, so each ordinal is converted once.
+        memo: dict[int, date | None] = {0: None}
+        result: list[date | None] = []
+        for ordinal in self.columns[name]:
+            value = memo.get(ordinal, memo)
+            if value is memo:
+                value = memo[ordinal] = date.fromordinal(ordinal)
+            result.append(value)
+        return result
+
+    def texts(self, name: str) -> list[str]:
+        strings = self.strings
+        return [strings[idx] for idx in self.columns[name]]
+
+    def iter_events(self) -> Iterator[QmsEvent]:
+        fields: dict[str, list[Any]] = {name: self.dates(name) for name in DATE_COLUMNS}
+        fields.update((name, self.texts(name)) for name in STRING_COLUMNS)
+        fields["row_index"] = list(self.columns["row_index"])
+        constants = self.constants
+        for idx in range(len(self)):
+            yield QmsEvent(
+                topic=constants["topic"],
+                module=constants["module"],
+                year=constants["year"],
+                event_id=fields["event_id"][idx],
+                content=fields["content"][idx],
+                initiated_date=fields["initiated_date"][idx],
+                planned_date=fields["planned_date"][idx],
+                status=fields["status"][idx],
+                owner_dept=fields["owner_dept"][idx],
+                owner=fields["owner"][idx],
+                qa=fields["qa"][idx],
+                qa_manager=fields["qa_manager"][idx],
+                source_file=constants["source_file"],
+                source_sheet=constants["source_sheet"],
+                row_index=fields["row_index"][idx],
+            )
+
+    def to_events(self) -> list[QmsEvent]:
+        return list(self.iter_events())
+
+    def close(self) -> None:
+        self.columns = {}
+        if self._buffer is not None:
+            try:
+                self._buffer.close()
+            except BufferError:
+                # Columns still referenced elsewhere keep the mapping alive until collected.
+                pass
+            self._buffer = None
+
+    @classmethod
+    def from_events(cls, cfg: LedgerConfig, events: list[QmsEvent], warnings: list[str]) -> "EventColumns":
+        string_ids: dict[str, int] = {}
+        columns: dict[str, Any] = {}
+        for name in DATE_COLUMNS:
+            columns[name] = array("i", (_date_ordinal(getattr(event, name)) for event in events))
+        for name in STRING_COLUMNS:
+            columns[name] = array(
+                "I",
+                (string_ids.setdefault(getattr(event, name), len(string_ids)) for event in events),
+            )
+        columns["row_index"] = array("i", (event.row_index for event in events))
+        constants = {
+            "topic": cfg.topic,
+            "module": cfg.module,
+            "year": cfg.year,
+            "source_file": cfg.file_path,
+            "source_sheet": cfg.sheet_name,
+        }
+        return cls(constants=constants, strings=list(string_ids), columns=columns, warnings=list(warnings))
+
+
+def _pad(length: int) -> int:
+    return (-length) % _ALIGN
+
+
+def write_event_cache(path: Path, fingerprint: str, columns: EventColumns) -> None:
+    offsets = array("I", [0])
+    for text in columns.strings:
+        offsets.append(offsets[-1] + len(text))
+    blobs: list[tuple[str, str, bytes]] = [
+        ("string_offsets", "I", offsets.tobytes()),
+        ("string_data", "B", "".join(columns.strings).encode("utf-8")),
+    ]
+    for name in (*DATE_COLUMNS, *STRING_COLUMNS, *INT_COLUMNS):
+        column = columns.columns[name]
+        blobs.append((name, column.typecode, column.tobytes()))
+
+    layout: dict[str, list[Any]] = {}
+    position = 0
+    for name, typecode, blob in blobs:
+        layout[name] = [typecode, position, len(blob)]
+        position += len(blob) + _pad(len(blob))
+
+    header = json.dumps(
+        {
+            "version": EVENT_CACHE_VERSION,
+            "fingerprint": fingerprint,
+            "byteorder": sys.byteorder,
+            "count": len(columns),
+            "constants": columns.constants,
+            "warnings": columns.warnings,
+            "layout": layout,
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+    header += b" " * _pad(_PREAMBLE.size + len(header))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp_path.open("wb") as file:
+        file.write(_PREAMBLE.pack(MAGIC, len(header)))
+        file.write(header)
+        for _, _, blob in blobs:
+            file.write(blob)
+            file.write(b"\0" * _pad(len(blob)))
+    os.replace(tmp_path, path)
+
+
+def load_event_cache(path: Path, fingerprint: str) -> Optional[EventColumns]:
+    try:
+        with path.open("rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, header_len = _PREAMBLE.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("bad magic")
+        header = json.loads(bytes(buffer[_PREAMBLE.size : _PREAMBLE.size + header_len]).decode("utf-8"))
+        if (
+            header.get("version") != EVENT_CACHE_VERSION
+            or header.get("fingerprint") != fingerprint
+            or header.get("byteorder") != sys.byteorder
+        ):
+            raise ValueError("stale cache")
+
+        data_start = _PREAMBLE.size + header_len
+        view = memoryview(buffer)
+        columns: dict[str, Any] = {}
+        for name, (typecode, offset, length) in header["layout"].items():
+            start = data_start + offset
+            columns[name] = view[start : start + length].cast(typecode)
+
+        offsets = columns.pop("string_offsets")
+        text = bytes(columns.pop("string_data")).decode("utf-8")
+        strings = [text[offsets[idx] : offsets[idx + 1]] for idx in range(len(offsets) - 1)]
+        if any(len(columns[name]) != header["count"] for name in (*DATE_COLUMNS, *STRING_COLUMNS, *INT_COLUMNS)):
+            raise ValueError("truncated cache")
+    except Exception:
+        try:
+            buffer.close()
+        except BufferError:
+            pass
+        return None
+
+    return EventColumns(
+        constants={name: str(header["constants"].get(name, "")) for name in CONSTANT_FIELDS},
+        strings=strings,
+        columns=columns,
+        warnings=[str(w) for w in header.get("warnings", [])],
+        buffer=buffer,
+    )
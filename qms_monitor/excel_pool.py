@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from typing import Any, Optional
+
+from .excel_reader import ExcelBatchReader, _safe_str
+from .ledger_reader import SheetRows, group_by_workbook, read_workbook_ledger_rows
+from .models import LedgerConfig
+
+
+WORKER_START_TIMEOUT = 120
+POLL_INTERVAL = 0.5
+
+
+def _worker_main(conn: Connection, visible: bool, all_columns: bool) -> None:
+    reader: ExcelBatchReader | None = None
+    try:
+        reader = ExcelBatchReader(visible=visible).open()
+    except Exception as exc:
+        conn.send(("init_error", _safe_str(exc)))
+        conn.close()
+        return
+
+    conn.send(("ready", reader.process_id()))
+    try:
+        while True:
+            task = conn.recv()
+            if task is None:
+                break
+            index, group = task
+            try:
+                results = read_workbook_ledger_rows(reader, group, all_columns=all_columns)
+            except Exception as exc:
+                results = [(False, [], _safe_str(exc), None, None, None) for _ in group]
+            conn.send(("result", (index, results)))
+    except (EOFError, OSError):
+        pass
+    finally:
+        reader.close()
+        conn.close()
+
+
+@dataclass
+class _Worker:
+    process: Any
+    conn: Connection
+    excel_pid: Optional[int] = None
+    ready: bool = False
+    started_at: float = field(default_factory=time.time)
+    task_index: Optional[int] = None
+    task_started_at: float = 0.0
+
+
+class ExcelReaderPool:
+    def __init__(
+        self,
+        workers: int,
+        *,
+        task_timeout: float = 600,
+        visible: bool = False,
+        all_columns: bool = False,
+    ):
+        self.workers = max(1, int(workers))
+        self.task_timeout = task_timeout
+        self.visible = visible
+        self.all_columns = all_columns
+        self.recycled = 0
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots: list[_Worker | None] = []
+
+    def open(self) -> "ExcelReaderPool":
+        self._slots = [self._spawn() for _ in range(self.workers)]
+        errors: list[str] = []
+        deadline = time.time() + WORKER_START_TIMEOUT
+        while any(w is not None and not w.ready for w in self._slots) and time.time() < deadline:
+            for idx, worker in enumerate(self._slots):
+                if worker is None or worker.ready or not worker.conn.poll(POLL_INTERVAL):
+                    continue
+                error = self._handle_startup_message(idx, worker)
+                if error:
+                    errors.append(error)
+
+        for idx, worker in enumerate(self._slots):
+            if worker is not None and not worker.ready:
+                errors.append("Excel工作进程启动超时")
+                self._kill(worker)
+                self._slots[idx] = None
+
+        if not any(self._slots):
+            self.close()
+            detail = "; ".join(dict.fromkeys(errors)) or "无可用工作进程"
+            raise RuntimeError(f"Excel并行读取初始化失败: {detail}")
+        return self
+
+    def close(self) -> None:
+        for worker in self._slots:
+            if worker is None:
+                continue
+            try:
+                worker.conn.send(None)
+            except Exception:
+                pass
+        for worker in self._slots:
+            if worker is None:
+                continue
+            worker.process.join(timeout=30)
+            if worker.process.is_alive():
+                self._kill(worker)
+            try:
+                worker.conn.close()
+            except Exception:
+                pass
+        self._slots = []
+
+    def imap(self, configs: Sequence[LedgerConfig]) -> Iterator[SheetRows]:
+        # One task per workbook so each file is opened once; results are yielded in config order.
+        groups = group_by_workbook(configs)
+        pending = list(range(len(groups)))
+        pending.reverse()
+        results: dict[int, SheetRows] = {}
+        next_index = 0
+
+        while next_index < len(configs):
+            live = [(idx, w) for idx, w in enumerate(self._slots) if w is not None]
+            if not live:
+                while pending:
+                    self._fail_group(groups[pending.pop()], results, "Excel工作进程不可用")
+
+            for _, worker in live:
+                if worker.ready and worker.task_index is None and pending:
+                    task_index = pending.pop()
+                    try:
+                        worker.conn.send((task_index, [configs[i] for i in groups[task_index]]))
+                    except Exception:
+                        pending.append(task_index)
+                        continue
+                    worker.task_index = task_index
+                    worker.task_started_at = time.time()
+
+            conns = [w.conn for _, w in live]
+            ready_conns = wait(conns, timeout=POLL_INTERVAL) if conns else []
+            for idx, worker in live:
+                if worker.conn in ready_conns:
+                    self._handle_message(idx, worker, groups, results)
+                elif worker.task_index is not None and self._task_expired(worker, len(groups[worker.task_index])):
+                    self._fail_group(
+                        groups[worker.task_index],
+                        results,
+                        f"读取超时（>{self.task_timeout:g}s/表），已回收Excel工作进程",
+                    )
+                    self._recycle(idx)
+                elif not worker.process.is_alive():
+                    self._fail_and_recycle(idx, worker, groups, results)
+                elif not worker.ready and time.time() - worker.started_at > WORKER_START_TIMEOUT:
+                    self._kill(worker)
+                    self._slots[idx] = None
+
+            while next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+
+    def _task_expired(self, worker: _Worker, sheet_count: int) -> bool:
+        return time.time() - worker.task_started_at > self.task_timeout * max(1, sheet_count)
+
+    @staticmethod
+    def _fail_group(indices: list[int], results: dict[int, SheetRows], error: str) -> None:
+        for index in indices:
+            results[index] = (False, [], error, None, None, None)
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child_conn, self.visible, self.all_columns), daemon=True)
+        process.start()
+        child_conn.close()
+        return _Worker(process=process, conn=parent_conn)
+
+    def _handle_startup_message(self, idx: int, worker: _Worker) -> str:
+        try:
+            kind, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            kind, payload = "init_error", "Excel工作进程异常退出"
+        if kind == "ready":
+            worker.ready = True
+            worker.excel_pid = payload
+            return ""
+        self._kill(worker)
+        self._slots[idx] = None
+        return str(payload)
+
+    def _handle_message(
+        self,
+        idx: int,
+        worker: _Worker,
+        groups: list[list[int]],
+        results: dict[int, SheetRows],
+    ) -> None:
+        if not worker.ready:
+            self._handle_startup_message(idx, worker)
+            return
+        try:
+            kind, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            self._fail_and_recycle(idx, worker, groups, results)
+            return
+        if kind == "result":
+            task_index, group_results = payload
+            results.update(zip(groups[task_index], group_results))
+            worker.task_index = None
+
+    def _fail_and_recycle(
+        self,
+        idx: int,
+        worker: _Worker,
+        groups: list[list[int]],
+        results: dict[int, SheetRows],
+    ) -> None:
+        if worker.task_index is not None:
+            self._fail_group(groups[worker.task_index], results, "Excel工作进程异常退出，已回收")
+        self._recycle(idx)
+
+    def _recycle(self, idx: int) -> None:
+        worker = self._slots[idx]
+        if worker is not None:
+            self._kill(worker)
+        self.recycled += 1
+        self._slots[idx] = self._spawn()
+
+    @staticmethod
+    def _kill(worker: _Worker) -> None:
+        # Terminating the Python worker leaves its out-of-process Excel behind; kill both.
+        if worker.excel_pid:
+            try:
+                os.kill(worker.excel_pid, signal.SIGTERM)
+            except Exception:
+                pass
+        try:
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.process.join(timeout=10)
+        except Exception:
+            pass
+        try:
+            worker.conn.close()
+        except Exception:
+            pass
@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Optional, Tuple, Union
 
+from .profiling import profile_span
 
 # Excel constants
 XL_BY_ROWS = 1
@@ -69,6 +70,24 @@ def _values_to_delimited_text(values: Any, sep: str = "\t", row_sep: str = "\n")
     return row_sep.join(lines)
 
 
+def _column_runs(columns: list[int]) -> list[tuple[int, int]]:
+    runs: list[tuple[int, int]] = []
+    for col in sorted(set(columns)):
+        if runs and col == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], col)
+        else:
+            runs.append((col, col))
+    return runs
+
+
+def _range_values_to_rows(values: Any) -> list[list[Any]]:
+    if values is None:
+        return []
+    if not isinstance(values, tuple):
+        return [[values]]
+    return [list(row) if isinstance(row, tuple) else [row] for row in values]
+
+
 def _normalize_excel_path(path: str) -> str:
     raw = Path(path).expanduser()
     try:
@@ -197,7 +216,8 @@ def read_excel_document(
             if password:
                 open_kwargs["Password"] = password
 
-            workbook = excel.Workbooks.Open(**open_kwargs)
+            with profile_span("reads", "excel.open", file=path):
+                workbook = excel.Workbooks.Open(**open_kwargs)
             worksheet = workbook.Worksheets(sheet)
             sheet_name = worksheet.Name
 
@@ -209,7 +229,8 @@ def read_excel_document(
                 effective_a1 = range_a1
             elif auto_bounds:
                 lookin_const = XL_FORMULAS if look_in.lower() == "formulas" else XL_VALUES
-                lr, lc = find_last_cell(worksheet, look_in=lookin_const)
+                with profile_span("reads", "excel.find_last_cell", file=path, sheet=str(sheet)):
+                    lr, lc = find_last_cell(worksheet, look_in=lookin_const)
                 if max_rows is not None:
                     lr = min(lr, int(max_rows))
                 if max_cols is not None:
@@ -222,7 +243,8 @@ def read_excel_document(
                 last_row, last_col = 1, 1
                 effective_a1 = "A1"
 
-            values = read_range.Value
+            with profile_span("reads", "excel.transfer", file=path, sheet=str(sheet), range=effective_a1):
+                values = read_range.Value
             text = _normalize_newlines(_values_to_delimited_text(values, sep=sep, row_sep=row_sep))
             elapsed_ms = int((time.time() - t0) * 1000)
 
@@ -307,10 +329,39 @@ class ExcelBatchReader:
         finally:
             self._pythoncom = None
 
+    def process_id(self) -> Optional[int]:
+        if self.excel is None:
+            return None
+        try:
+            import win32process  # type: ignore
+
+            _, pid = win32process.GetWindowThreadProcessId(int(self.excel.Hwnd))
+            return int(pid) or None
+        except Exception:
+            return None
+
     def _require_open(self) -> None:
         if self.excel is None:
             raise RuntimeError("ExcelBatchReader is not opened. Call .open() first.")
 
+    def open_workbook(self, path: str) -> Any:
+        self._require_open()
+        with profile_span("reads", "excel.open", file=path):
+            return self.excel.Workbooks.Open(
+                Filename=_normalize_excel_path(path),
+                ReadOnly=True,
+                UpdateLinks=0,
+                IgnoreReadOnlyRecommended=True,
+                AddToMru=False,
+            )
+
+    @staticmethod
+    def close_workbook(workbook: Any) -> None:
+        try:
+            workbook.Close(SaveChanges=False)
+        except Exception:
+            pass
+
     def read_cells_sheet(
         self,
         path: str,
@@ -320,25 +371,21 @@ class ExcelBatchReader:
         look_in: str = "formulas",
         max_rows: Optional[int] = None,
         max_cols: Optional[int] = None,
+        workbook: Any = None,
     ) -> tuple[bool, Any, str, Optional[str], Optional[int], Optional[int], Optional[str]]:
         self._require_open()
-        workbook = None
-        excel_path = _normalize_excel_path(path)
+        owned_workbook = None
 
         try:
-            workbook = self.excel.Workbooks.Open(
-                Filename=excel_path,
-                ReadOnly=True,
-                UpdateLinks=0,
-                IgnoreReadOnlyRecommended=True,
-                AddToMru=False,
-            )
+            if workbook is None:
+                owned_workbook = workbook = self.open_workbook(path)
             worksheet = workbook.Worksheets(sheet)
             sheet_name = worksheet.Name
 
             if auto_bounds:
                 lookin_const = XL_FORMULAS if look_in.lower() == "formulas" else XL_VALUES
-                last_row, last_col = find_last_cell(worksheet, look_in=lookin_const)
+                with profile_span("reads", "excel.find_last_cell", file=path, sheet=str(sheet)):
+                    last_row, last_col = find_last_cell(worksheet, look_in=lookin_const)
                 if max_rows is not None:
                     last_row = min(last_row, int(max_rows))
                 if max_cols is not None:
@@ -350,13 +397,58 @@ class ExcelBatchReader:
                 effective_a1 = "A1"
                 last_row, last_col = 1, 1
 
-            values = read_range.Value
+            with profile_span("reads", "excel.transfer", file=path, sheet=str(sheet), range=effective_a1):
+                values = read_range.Value
             return True, values, "", effective_a1, last_row, last_col, sheet_name
         except Exception as exc:
             return False, None, _safe_str(exc), None, None, None, None
         finally:
-            try:
-                if workbook is not None:
-                    workbook.Close(SaveChanges=False)
-            except Exception:
-                pass
+            if owned_workbook is not None:
+                self.close_workbook(owned_workbook)
+
+    def read_columns_sheet(
+        self,
+        path: str,
+        *,
+        sheet: Union[int, str],
+        columns: list[int],
+        look_in: str = "formulas",
+        max_rows: Optional[int] = None,
+        workbook: Any = None,
+    ) -> tuple[bool, Any, str, Optional[str], Optional[int], Optional[int], Optional[str]]:
+        self._require_open()
+        owned_workbook = None
+
+        try:
+            if workbook is None:
+                owned_workbook = workbook = self.open_workbook(path)
+            worksheet = workbook.Worksheets(sheet)
+            sheet_name = worksheet.Name
+
+            lookin_const = XL_FORMULAS if look_in.lower() == "formulas" else XL_VALUES
+            with profile_span("reads", "excel.find_last_cell", file=path, sheet=str(sheet)):
+                last_row, last_col = find_last_cell(worksheet, look_in=lookin_const)
+            if max_rows is not None:
+                last_row = min(last_row, int(max_rows))
+
+            wanted = sorted({c for c in columns if 0 <= c < last_col})
+            width = (wanted[-1] + 1) if wanted else 0
+            grid: list[list[Any]] = [[None] * width for _ in range(last_row)]
+            ranges_a1: list[str] = []
+            for start, end in _column_runs(wanted):
+                read_range = worksheet.Range(worksheet.Cells(1, start + 1), worksheet.Cells(last_row, end + 1))
+                ranges_a1.append(f"{_a1_addr(1, start + 1)}:{_a1_addr(last_row, end + 1)}")
+                with profile_span("reads", "excel.transfer", file=path, sheet=str(sheet), range=ranges_a1[-1]):
+                    run_values = read_range.Value
+                for row_idx, row_values in enumerate(_range_values_to_rows(run_values)):
+                    if row_idx >= last_row:
+                        break
+                    grid[row_idx][start : start + len(row_values)] = row_values
+
+            values = tuple(tuple(row) for row in grid)
+            return True, values, "", ",".join(ranges_a1), last_row, last_col, sheet_name
+        except Exception as exc:
+            return False, None, _safe_str(exc), None, None, None, None
+        finally:
+            if owned_workbook is not None:
+                self.close_workbook(owned_workbook)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import os
+import sys
+from collections.abc import Iterable, Iterator, Sequence
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 
-from .excel_reader import ExcelBatchReader, read_excel_document
+from .excel_reader import ExcelBatchReader, _normalize_excel_path, _safe_str, read_excel_document
 from .models import LedgerConfig, QmsEvent
-from .parsers import add_one_month, get_cell, parse_date_cell, parse_tabular_text
+from .parsers import DateColumnParser, add_one_month, get_cell, parse_tabular_text
+from .profiling import profile_span
 
 
+SheetRows = tuple[bool, list[list[str]], str, Optional[int], Optional[int], Optional[str]]
+
 HEADER_HINTS = ("申请时间", "发起日期", "计划完成日期", "完成日期", "状态", "编号", "内容", "责任人", "责任部门", "分管")
 
 
@@ -47,30 +53,93 @@ def _is_header_like_row(event_id: str, content: str, initiated_raw: str) -> bool
     return id_like or content_like
 
 
+def read_ledger_rows(
+    batch_reader: ExcelBatchReader,
+    cfg: LedgerConfig,
+    *,
+    all_columns: bool = False,
+    workbook: Any = None,
+) -> SheetRows:
+    sheet: str | int = int(cfg.sheet_name) if cfg.sheet_name.isdigit() else cfg.sheet_name
+    if all_columns:
+        ok, values, err, _, last_row, last_col, sheet_name = batch_reader.read_cells_sheet(
+            cfg.file_path,
+            sheet=sheet,
+            auto_bounds=True,
+            look_in="formulas",
+            workbook=workbook,
+        )
+    else:
+        ok, values, err, _, last_row, last_col, sheet_name = batch_reader.read_columns_sheet(
+            cfg.file_path,
+            sheet=sheet,
+            columns=cfg.used_columns(),
+            look_in="formulas",
+            workbook=workbook,
+        )
+    if not ok:
+        return False, [], err, None, None, None
+    return True, _values_to_rows(values), "", last_row, last_col, sheet_name
+
+
+def group_by_workbook(configs: Sequence[LedgerConfig]) -> list[list[int]]:
+    groups: dict[str, list[int]] = {}
+    for idx, cfg in enumerate(configs):
+        groups.setdefault(os.path.normcase(_normalize_excel_path(cfg.file_path)), []).append(idx)
+    return list(groups.values())
+
+
+def read_workbook_ledger_rows(
+    batch_reader: ExcelBatchReader,
+    configs: Sequence[LedgerConfig],
+    *,
+    all_columns: bool = False,
+) -> list[SheetRows]:
+    try:
+        workbook = batch_reader.open_workbook(configs[0].file_path)
+    except Exception as exc:
+        return [(False, [], _safe_str(exc), None, None, None) for _ in configs]
+    try:
+        return [read_ledger_rows(batch_reader, cfg, all_columns=all_columns, workbook=workbook) for cfg in configs]
+    finally:
+        batch_reader.close_workbook(workbook)
+
+
+def iter_ledger_rows(
+    batch_reader: ExcelBatchReader,
+    configs: Sequence[LedgerConfig],
+    *,
+    all_columns: bool = False,
+) -> Iterator[SheetRows]:
+    # Each workbook is opened once for all of its sheets; results still come back in config order.
+    pending: dict[int, SheetRows] = {}
+    next_index = 0
+    for indices in group_by_workbook(configs):
+        results = read_workbook_ledger_rows(batch_reader, [configs[i] for i in indices], all_columns=all_columns)
+        pending.update(zip(indices, results))
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+
 def read_ledger_events(
     cfg: LedgerConfig,
     batch_reader: ExcelBatchReader | None = None,
-    source_rows: list[list[str]] | None = None,
+    source_rows: Iterable[list[str]] | None = None,
 ) -> tuple[list[QmsEvent], list[str]]:
     warnings: list[str] = []
     events: list[QmsEvent] = []
 
     sheet: str | int = int(cfg.sheet_name) if cfg.sheet_name.isdigit() else cfg.sheet_name
-    rows: list[list[str]]
+    rows: Iterable[list[str]]
 
     if source_rows is not None:
         rows = source_rows
     elif batch_reader is not None:
-        ok, values, err, _, _, _, _ = batch_reader.read_cells_sheet(
-            cfg.file_path,
-            sheet=sheet,
-            auto_bounds=True,
-            look_in="formulas",
-        )
+        ok, rows, err, _, _, _ = read_ledger_rows(batch_reader, cfg)
         if not ok:
             warnings.append(f"模块[{cfg.module}] 文件读取失败，已跳过: {cfg.file_path} ({err})")
             return events, warnings
-        rows = _values_to_rows(values)
     else:
         result = read_excel_document(cfg.file_path, sheet=sheet)
         if not result.ok:
@@ -80,18 +149,29 @@ def read_ledger_events(
             return events, warnings
         rows = parse_tabular_text(result.text)
 
-    if len(rows) <= 1:
-        warnings.append(f"模块[{cfg.module}] 表内容为空或只有表头: {cfg.file_path} / {cfg.sheet_name}")
-        return events, warnings
+    with profile_span("parses", "ledger.parse", module=cfg.module, file=cfg.file_path, sheet=cfg.sheet_name) as span:
+        events.extend(iter_ledger_events(cfg, rows, warnings))
+        span["events"] = len(events)
+    return events, warnings
 
+
+def iter_ledger_events(
+    cfg: LedgerConfig,
+    rows: Iterable[list[str]],
+    warnings: list[str],
+) -> Iterator[QmsEvent]:
     start_idx = max(2, cfg.data_start_row) - 1
-    if start_idx >= len(rows):
-        warnings.append(
-            f"模块[{cfg.module}] 数据起始行[{cfg.data_start_row}]超出表格范围: {cfg.file_path} / {cfg.sheet_name}"
-        )
-        return events, warnings
+    row_count = 0
+    parse_initiated = DateColumnParser().parse
+    parse_planned = DateColumnParser().parse
+    intern = sys.intern
+    # Rows may be a lazy iterator (xlsx/csv streaming); bounds are checked once it is exhausted,
+    # so the range warnings reach `warnings` only after the last event has been yielded.
+    for row_idx, row in enumerate(rows, start=1):
+        row_count = row_idx
+        if row_idx <= start_idx:
+            continue
 
-    for row_idx, row in enumerate(rows[start_idx:], start=start_idx + 1):
         event_id = get_cell(row, cfg.id_col)
         content = get_cell(row, cfg.content_col)
         initiated_raw = get_cell(row, cfg.initiated_col)
@@ -99,22 +179,23 @@ def read_ledger_events(
         if not event_id and not content and not initiated_raw:
             continue
 
-        initiated_date = parse_date_cell(initiated_raw)
+        initiated_date = parse_initiated(initiated_raw)
         if cfg.planned_due_days is not None:
             planned_date = initiated_date + timedelta(days=cfg.planned_due_days) if initiated_date else None
         elif cfg.planned_col is not None:
             planned_raw = get_cell(row, cfg.planned_col)
-            planned_date = parse_date_cell(planned_raw)
+            planned_date = parse_planned(planned_raw)
         elif initiated_date is not None:
             planned_date = add_one_month(initiated_date)
         else:
             planned_date = None
 
-        status = get_cell(row, cfg.status_col)
-        owner_dept = get_cell(row, cfg.owner_dept_col)
-        owner = get_cell(row, cfg.owner_col)
-        qa = get_cell(row, cfg.qa_col)
-        qa_manager = get_cell(row, cfg.qa_manager_col)
+        # Status and people columns repeat a few dozen values; interning keeps one copy of each.
+        status = intern(get_cell(row, cfg.status_col))
+        owner_dept = intern(get_cell(row, cfg.owner_dept_col))
+        owner = intern(get_cell(row, cfg.owner_col))
+        qa = intern(get_cell(row, cfg.qa_col))
+        qa_manager = intern(get_cell(row, cfg.qa_manager_col))
 
         if initiated_date is None and _is_header_like_row(event_id, content, initiated_raw):
             continue
@@ -124,24 +205,56 @@ def read_ledger_events(
                 f"模块[{cfg.module}] 行{row_idx}发起日期解析失败: '{initiated_raw}' ({cfg.file_path}/{cfg.sheet_name})"
             )
 
-        events.append(
-            QmsEvent(
-                topic=cfg.topic,
-                module=cfg.module,
-                year=cfg.year,
-                event_id=event_id,
-                content=content,
-                initiated_date=initiated_date,
-                planned_date=planned_date,
-                status=status,
-                owner_dept=owner_dept,
-                owner=owner,
-                qa=qa,
-                qa_manager=qa_manager,
-                source_file=cfg.file_path,
-                source_sheet=cfg.sheet_name,
-                row_index=row_idx,
-            )
+        yield QmsEvent(
+            topic=cfg.topic,
+            module=cfg.module,
+            year=cfg.year,
+            event_id=event_id,
+            content=content,
+            initiated_date=initiated_date,
+            planned_date=planned_date,
+            status=status,
+            owner_dept=owner_dept,
+            owner=owner,
+            qa=qa,
+            qa_manager=qa_manager,
+            source_file=cfg.file_path,
+            source_sheet=cfg.sheet_name,
+            row_index=row_idx,
         )
 
-    return events, warnings
+    if row_count <= 1:
+        warnings.append(f"模块[{cfg.module}] 表内容为空或只有表头: {cfg.file_path} / {cfg.sheet_name}")
+        return
+
+    if start_idx >= row_count:
+        warnings.append(
+            f"模块[{cfg.module}] 数据起始行[{cfg.data_start_row}]超出表格范围: {cfg.file_path} / {cfg.sheet_name}"
+        )
+
+
+def read_xlsx_ledger_events(cfg: LedgerConfig) -> tuple[list[QmsEvent], list[str]]:
+    from .xlsx_reader import XlsxWorkbook
+
+    sheet: str | int = int(cfg.sheet_name) if cfg.sheet_name.isdigit() else cfg.sheet_name
+    try:
+        with XlsxWorkbook(cfg.file_path) as workbook:
+            rows = workbook.iter_rows(sheet, columns=cfg.used_columns())
+            return read_ledger_events(cfg, source_rows=rows)
+    except Exception as exc:
+        return [], [f"模块[{cfg.module}] 文件读取失败，已跳过: {cfg.file_path} ({exc})"]
+
+
+def iter_xlsx_ledger_events(cfg: LedgerConfig, warnings: list[str]) -> Iterator[QmsEvent]:
+    from .xlsx_reader import XlsxWorkbook
+
+    sheet: str | int = int(cfg.sheet_name) if cfg.sheet_name.isdigit() else cfg.sheet_name
+    mark = len(warnings)
+    try:
+        with XlsxWorkbook(cfg.file_path) as workbook:
+            rows = workbook.iter_rows(sheet, columns=cfg.used_columns())
+            yield from iter_ledger_events(cfg, rows, warnings)
+    except Exception as exc:
+        # Events already yielded before a mid-sheet failure have been consumed; only warnings can be rolled back.
+        del warnings[mark:]
+        warnings.append(f"模块[{cfg.module}] 文件读取失败，已跳过: {cfg.file_path} ({exc})")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+
+# Eviction goes below the limit so a full cache is not rescanned on every following write.
+PRUNE_TARGET_RATIO = 0.9
+
+
+class LlmResponseCache:
+    def __init__(self, cache_dir: Path, *, ttl_seconds: int, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Running size of the cache directory, set by prune() and kept up to date by put(),
+        # so writes only rescan the tree once the size limit is actually exceeded.
+        self._total_bytes = 0
+
+    @staticmethod
+    def make_key(model: str, messages: list[dict[str, Any]], params: dict[str, Any] | None = None) -> str:
+        material = json.dumps(
+            {"model": model, "messages": messages, "params": params or {}},
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if not isinstance(entry, dict):
+            entry = {}
+
+        created_at = entry.get("created_at", 0)
+        content = entry.get("content")
+        expired = self.ttl_seconds > 0 and time.time() - float(created_at or 0) > self.ttl_seconds
+        if expired or not isinstance(content, str):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return content
+
+    def put(self, key: str, content: str, *, model: str = "") -> None:
+        path = self._entry_path(key)
+        entry = {"created_at": time.time(), "model": model, "content": content}
+        try:
+            previous_size = path.stat().st_size
+        except OSError:
+            previous_size = 0
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            size = tmp_path.write_bytes(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            self._total_bytes += size - previous_size
+            over_limit = self.max_bytes > 0 and self._total_bytes > self.max_bytes
+        if over_limit:
+            self.prune()
+
+    def prune(self) -> None:
+        with self._lock:
+            if not self.cache_dir.exists():
+                return
+
+            now = time.time()
+            entries: list[tuple[float, int, Path]] = []
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if self.ttl_seconds > 0 and now - stat.st_mtime > self.ttl_seconds:
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            self._total_bytes = total
+            if self.max_bytes <= 0 or total <= self.max_bytes:
+                return
+
+            target = int(self.max_bytes * PRUNE_TARGET_RATIO)
+            entries.sort(key=lambda x: x[0])
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+            self._total_bytes = total
+
+
+def open_llm_cache_from_env() -> LlmResponseCache:
+    cache_dir = Path(os.getenv("QMS_LLM_CACHE_DIR", "").strip() or "artifacts/llm_cache")
+    ttl_hours = float(os.getenv("QMS_LLM_CACHE_TTL_HOURS", "168") or 0)
+    max_mb = float(os.getenv("QMS_LLM_CACHE_MAX_MB", "200") or 0)
+    cache = LlmResponseCache(
+        cache_dir,
+        ttl_seconds=int(ttl_hours * 3600),
+        max_bytes=int(max_mb * 1024 * 1024),
+    )
+    cache.prune()
+    return cache
@@ -8,11 +8,91 @@ import time
 from datetime import date
 from typing import Any
 
-from openai import OpenAI
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+from .llm_cache import LlmResponseCache
+from .profiling import profile_span
 
 
 SOURCE_KEYS = {"source", "source_file", "source_sheet", "source_row"}
 PERSON_SUMMARY_MAX_CHARS = 30
+LLM_TEMPERATURE = 0.3
+
+
+_CLIENT_LOCK = threading.Lock()
+_CLIENTS: dict[tuple[str, str, int], OpenAI] = {}
+_CONNECTION_STATS = {"requests": 0, "new_connections": 0, "tls_handshakes": 0, "reused_connections": 0}
+
+
+class _ConnectionTrace:
+    # One per HTTP request: a response that arrives without this request having opened a
+    # TCP connection was served over an existing keep-alive connection or HTTP/2 stream.
+    def __init__(self) -> None:
+        self.connected = False
+        self.answered = False
+
+    def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connected = True
+            key = "new_connections"
+        elif event_name == "connection.start_tls.complete":
+            key = "tls_handshakes"
+        elif event_name.endswith(".receive_response_headers.complete") and not self.answered:
+            self.answered = True
+            if self.connected:
+                return
+            key = "reused_connections"
+        else:
+            return
+        with _CLIENT_LOCK:
+            _CONNECTION_STATS[key] += 1
+
+
+def _attach_connection_trace(request: httpx.Request) -> None:
+    with _CLIENT_LOCK:
+        _CONNECTION_STATS["requests"] += 1
+    request.extensions["trace"] = _ConnectionTrace()
+
+
+def get_llm_client(base_url: str, api_key: str, timeout_seconds: int, pool_size: int = 1) -> OpenAI:
+    key = (base_url.rstrip("/"), api_key, timeout_seconds)
+    with _CLIENT_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            pool_size = max(1, pool_size)
+            http_client = DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=60,
+                ),
+                event_hooks={"request": [_attach_connection_trace]},
+            )
+            client = OpenAI(
+                api_key=api_key,
+                base_url=key[0],
+                timeout=timeout_seconds,
+                http_client=http_client,
+            )
+            _CLIENTS[key] = client
+        return client
+
+
+def close_llm_clients() -> None:
+    with _CLIENT_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+def get_llm_connection_stats() -> dict[str, int]:
+    with _CLIENT_LOCK:
+        return dict(_CONNECTION_STATS)
 
 
 def strip_source_fields(payload: Any) -> Any:
@@ -128,16 +208,12 @@ def _request_llm_json(
     api_key: str,
     timeout_seconds: int,
     progress_interval_seconds: int = 15,
+    cache: LlmResponseCache | None = None,
+    pool_size: int = 1,
 ) -> dict[str, Any]:
     if not model or not api_key:
         raise RuntimeError("缺少LLM配置: model/api_key")
 
-    client = OpenAI(
-        api_key=api_key,
-        base_url=base_url.rstrip("/"),
-        timeout=timeout_seconds,
-    )
-
     messages = [
         {
             "role": "system",
@@ -152,50 +228,81 @@ def _request_llm_json(
         },
     ]
 
-    completion = None
-
-    def _request_once(use_response_format: bool):
-        kwargs: dict[str, Any] = {
-            "model": model,
-            "messages": messages,
-            "temperature": 0.3,
-        }
-        if use_response_format:
-            kwargs["response_format"] = {"type": "json_object"}
-        return client.chat.completions.create(**kwargs)
-
-    def _execute_with_heartbeat(use_response_format: bool):
-        if progress_interval_seconds <= 0:
-            return _request_once(use_response_format=use_response_format)
-
-        start_ts = time.time()
-        stop_event = threading.Event()
-
-        def heartbeat() -> None:
-            while not stop_event.wait(progress_interval_seconds):
-                waited = int(time.time() - start_ts)
-                print(f"[LLM] 主题[{topic}] {stage}调用中，已等待 {waited}s ...", file=sys.stderr, flush=True)
-
-        thread = threading.Thread(target=heartbeat, daemon=True)
-        thread.start()
-        try:
-            return _request_once(use_response_format=use_response_format)
-        finally:
-            stop_event.set()
-
-    try:
-        completion = _execute_with_heartbeat(use_response_format=True)
-    except Exception as exc:
-        if "response_format" in str(exc):
+    payload_chars = len(messages[1]["content"])
+    with profile_span("llm_calls", stage, topic=topic, model=model, payload_chars=payload_chars) as call_profile:
+        cache_key = ""
+        if cache is not None:
+            # The key covers the full request, report_date included: the summaries describe
+            # overdue items relative to that date, so another day's text would be stale.
+            cache_key = cache.make_key(
+                model,
+                messages,
+                {"temperature": LLM_TEMPERATURE, "base_url": base_url.rstrip("/")},
+            )
+            cached_content = cache.get(cache_key)
+            if cached_content is not None:
+                try:
+                    result = extract_json_object(cached_content)
+                    call_profile["cache_hit"] = True
+                    sys.stderr.write(f"[LLM] 主题[{topic}] {stage}命中本地缓存\n")
+                    sys.stderr.flush()
+                    return result
+                except (ValueError, json.JSONDecodeError):
+                    pass
+
+        client = get_llm_client(base_url, api_key, timeout_seconds, pool_size=pool_size)
+        completion = None
+
+        def _request_once(use_response_format: bool):
+            kwargs: dict[str, Any] = {
+                "model": model,
+                "messages": messages,
+                "temperature": LLM_TEMPERATURE,
+            }
+            if use_response_format:
+                kwargs["response_format"] = {"type": "json_object"}
+            return client.chat.completions.create(**kwargs)
+
+        def _execute_with_heartbeat(use_response_format: bool):
+            if progress_interval_seconds <= 0:
+                return _request_once(use_response_format=use_response_format)
+
+            start_ts = time.time()
+            stop_event = threading.Event()
+
+            def heartbeat() -> None:
+                while not stop_event.wait(progress_interval_seconds):
+                    waited = int(time.time() - start_ts)
+                    sys.stderr.write(f"[LLM] 主题[{topic}] {stage}调用中，已等待 {waited}s ...\n")
+                    sys.stderr.flush()
+
+            thread = threading.Thread(target=heartbeat, daemon=True)
+            thread.start()
             try:
-                completion = _execute_with_heartbeat(use_response_format=False)
-            except Exception as fallback_exc:
-                raise RuntimeError(f"LLM请求失败: {fallback_exc}") from fallback_exc
-        else:
-            raise RuntimeError(f"LLM请求失败: {exc}") from exc
+                return _request_once(use_response_format=use_response_format)
+            finally:
+                stop_event.set()
 
-    content = completion.choices[0].message.content or ""
-    return extract_json_object(content)
+        try:
+            completion = _execute_with_heartbeat(use_response_format=True)
+        except Exception as exc:
+            if "response_format" in str(exc):
+                try:
+                    completion = _execute_with_heartbeat(use_response_format=False)
+                except Exception as fallback_exc:
+                    raise RuntimeError(f"LLM请求失败: {fallback_exc}") from fallback_exc
+            else:
+                raise RuntimeError(f"LLM请求失败: {exc}") from exc
+
+        call_profile["cache_hit"] = False
+        usage = getattr(completion, "usage", None)
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            call_profile[key] = getattr(usage, key, None)
+        content = completion.choices[0].message.content or ""
+        result = extract_json_object(content)
+        if cache is not None:
+            cache.put(cache_key, content, model=model)
+        return result
 
 
 def call_llm_topic_summary(
@@ -208,6 +315,8 @@ def call_llm_topic_summary(
     api_key: str,
     timeout_seconds: int,
     progress_interval_seconds: int = 15,
+    cache: LlmResponseCache | None = None,
+    pool_size: int = 1,
 ) -> str:
     payload = {
         "task": "根据超期项目统计生成主题分析总结",
@@ -233,6 +342,8 @@ def call_llm_topic_summary(
         api_key=api_key,
         timeout_seconds=timeout_seconds,
         progress_interval_seconds=progress_interval_seconds,
+        cache=cache,
+        pool_size=pool_size,
     )
     return str(result.get("summary", "") or "").strip()
 
@@ -246,6 +357,8 @@ def call_llm_person_summaries(
     api_key: str,
     timeout_seconds: int,
     progress_interval_seconds: int = 15,
+    cache: LlmResponseCache | None = None,
+    pool_size: int = 1,
 ) -> dict[str, Any]:
     payload = {
         "task": "根据超期项目统计生成人员超期内容概括",
@@ -276,6 +389,8 @@ def call_llm_person_summaries(
         api_key=api_key,
         timeout_seconds=timeout_seconds,
         progress_interval_seconds=progress_interval_seconds,
+        cache=cache,
+        pool_size=pool_size,
     )
 
     merged = dict(local_stats)
@@ -25,8 +25,22 @@ class LedgerConfig:
     open_status_value: str = ""
     data_start_row: int = 2
 
+    def used_columns(self) -> list[int]:
+        columns = {
+            self.id_col,
+            self.content_col,
+            self.initiated_col,
+            self.planned_col,
+            self.status_col,
+            self.owner_dept_col,
+            self.owner_col,
+            self.qa_col,
+            self.qa_manager_col,
+        }
+        return sorted(col for col in columns if col is not None and col >= 0)
 
-@dataclass
+
+@dataclass(slots=True)
 class QmsEvent:
     topic: str
     module: str
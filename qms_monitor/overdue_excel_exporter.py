@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator, Sequence
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 from zipfile import ZIP_DEFLATED, ZipFile
 
+from .stats import topic_group_key
+
 
 HEADERS = [
     "主题",
@@ -20,7 +25,26 @@ HEADERS = [
     "分管QA中层",
 ]
 
+# 1-based columns written as inline strings; every other text cell goes through the
+# shared strings table, where repeated modules, people and dates are stored once.
+INLINE_COLUMNS = frozenset(
+    col_no for col_no, header in enumerate(HEADERS, start=1) if header in {"编号", "内容"}
+)
+WRITE_BATCH_ROWS = 512
+
+EVENTS_SHEET_NAME = "超期事件"
+YEARLY_SUMMARY_SHEET_NAME = "汇总-年份"
+# (sheet name, ranked stats key, name column header, include LLM summary column)
+RANKED_SUMMARY_SHEETS = (
+    ("汇总-分管QA", "overdue_by_qa", "分管QA", True),
+    ("汇总-分管QA中层", "overdue_by_qa_manager", "分管QA中层", True),
+    ("汇总-责任部门", "overdue_by_owner_dept", "责任部门", False),
+)
+INVALID_SHEET_NAME_CHARS = set("[]:*?/\\")
+MAX_SHEET_NAME_LEN = 31
+
 
+@lru_cache(maxsize=None)
 def _a1_col(col_index: int) -> str:
     if col_index <= 0:
         return "A"
@@ -53,16 +77,40 @@ def _escape_xml_text(value: Any) -> str:
     return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
 
-def _cell_xml(row_no: int, col_no: int, value: Any) -> str:
-    ref = f"{_a1_col(col_no)}{row_no}"
+def _text_xml(value: Any) -> tuple[str, str]:
     text = _sanitize_text(value)
     escaped = _escape_xml_text(text)
     preserve = ' xml:space="preserve"' if text.startswith(" ") or text.endswith(" ") else ""
-    return f'<c r="{ref}" t="inlineStr"><is><t{preserve}>{escaped}</t></is></c>'
+    return escaped, preserve
+
+
+class _SharedStrings:
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}
+        self.references = 0
 
+    def index(self, value: str) -> int:
+        self.references += 1
+        idx = self._index.get(value)
+        if idx is None:
+            idx = len(self._index)
+            self._index[value] = idx
+        return idx
 
-def _collect_overdue_rows(module_results: dict[str, dict[str, Any]]) -> list[dict[str, str]]:
-    rows: list[dict[str, str]] = []
+    def iter_xml(self) -> Iterator[str]:
+        yield (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+            f' count="{self.references}" uniqueCount="{len(self._index)}">'
+        )
+        for value in self._index:
+            escaped, preserve = _text_xml(value)
+            yield f"<si><t{preserve}>{escaped}</t></si>"
+        yield "</sst>"
+
+
+def _collect_overdue_rows(module_results: dict[str, dict[str, Any]]) -> list[tuple[str, ...]]:
+    rows: list[tuple[str, ...]] = []
     for module in sorted(module_results.keys()):
         module_data = module_results.get(module, {})
         if not isinstance(module_data, dict):
@@ -76,56 +124,197 @@ def _collect_overdue_rows(module_results: dict[str, dict[str, Any]]) -> list[dic
         for item in items:
             if not isinstance(item, dict):
                 continue
+            # Tuples in HEADERS order; they mostly reference the item's own strings.
             rows.append(
-                {
-                    "主题": str(item.get("topic", "") or ""),
-                    "质量模块": module,
-                    "年份": str(item.get("year", "") or ""),
-                    "编号": str(item.get("event_id", "") or ""),
-                    "内容": str(item.get("content", "") or ""),
-                    "发起日期": str(item.get("initiated_date", "") or ""),
-                    "计划完成日期": str(item.get("planned_date", "") or ""),
-                    "状态": str(item.get("status", "") or ""),
-                    "责任部门": str(item.get("owner_dept", "") or ""),
-                    "责任人": str(item.get("owner", "") or ""),
-                    "分管QA": str(item.get("qa", "") or ""),
-                    "分管QA中层": str(item.get("qa_manager", "") or ""),
-                }
+                (
+                    str(item.get("topic", "") or ""),
+                    module,
+                    str(item.get("year", "") or ""),
+                    str(item.get("event_id", "") or ""),
+                    str(item.get("content", "") or ""),
+                    str(item.get("initiated_date", "") or ""),
+                    str(item.get("planned_date", "") or ""),
+                    str(item.get("status", "") or ""),
+                    str(item.get("owner_dept", "") or ""),
+                    str(item.get("owner", "") or ""),
+                    str(item.get("qa", "") or ""),
+                    str(item.get("qa_manager", "") or ""),
+                )
             )
-    rows.sort(key=lambda row: (row["质量模块"], row["计划完成日期"], row["编号"]))
+    rows.sort(key=lambda row: (row[1], row[6], row[3]))
     return rows
 
 
-def _build_sheet_xml(rows: list[dict[str, str]]) -> str:
-    xml_parts: list[str] = [
-        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
-        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">',
-        "<sheetData>",
-    ]
+def _sheet_name(raw: str, used: set[str]) -> str:
+    name = "".join("_" if ch in INVALID_SHEET_NAME_CHARS else ch for ch in _sanitize_text(raw)).strip("'")
+    name = name[:MAX_SHEET_NAME_LEN] or "Sheet"
+    candidate = name
+    suffix = 2
+    # Excel compares sheet names case-insensitively.
+    while candidate.lower() in used:
+        tail = f"({suffix})"
+        candidate = name[: MAX_SHEET_NAME_LEN - len(tail)] + tail
+        suffix += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _rows_by_topic(rows: list[tuple[str, ...]], topic_order: Iterable[str]) -> dict[str, list[tuple[str, ...]]]:
+    grouped: dict[str, list[tuple[str, ...]]] = {topic: [] for topic in topic_order}
+    for row in rows:
+        grouped.setdefault(topic_group_key(row[0]), []).append(row)
+    return {topic: topic_rows for topic, topic_rows in grouped.items() if topic_rows}
+
+
+def _ranked_summary_rows(
+    topic_results: dict[str, dict[str, Any]],
+    key: str,
+    with_summary: bool,
+) -> list[tuple[Any, ...]]:
+    rows: list[tuple[Any, ...]] = []
+    for topic, stats in topic_results.items():
+        ranked = stats.get(key, []) if isinstance(stats, dict) else []
+        for entry in ranked if isinstance(ranked, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            row: tuple[Any, ...] = (topic, str(entry.get("name", "") or ""), int(entry.get("count", 0) or 0))
+            if with_summary:
+                row += (str(entry.get("summary", "") or ""),)
+            rows.append(row)
+    return rows
+
+
+def _yearly_summary_rows(topic_results: dict[str, dict[str, Any]]) -> list[tuple[Any, ...]]:
+    rows: list[tuple[Any, ...]] = []
+    for topic, stats in topic_results.items():
+        yearly = stats.get("yearly_overdue", []) if isinstance(stats, dict) else []
+        for entry in yearly if isinstance(yearly, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            rows.append(
+                (
+                    topic,
+                    str(entry.get("year", "") or ""),
+                    int(entry.get("count", 0) or 0),
+                    int(entry.get("overdue_count", 0) or 0),
+                    float(entry.get("overdue_ratio", 0) or 0),
+                )
+            )
+    return rows
+
+
+def _write_sheet(
+    stream: IO[bytes],
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    shared: _SharedStrings,
+    inline_columns: frozenset[int],
+) -> int:
+    # Rows are encoded in small batches straight into the zip entry, so memory stays
+    # flat however many rows the sheet has. Repeated values go through the shared
+    # strings table; free text (编号, 内容) stays inline and is never retained.
+    stream.write(
+        b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        b'<sheetViews><sheetView workbookViewId="0">'
+        b'<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+        b"</sheetView></sheetViews>"
+        b"<sheetData>"
+    )
+    batch: list[str] = []
+    row_no = 0
+    for row_no, row in enumerate(chain([header], rows), start=1):
+        cells: list[str] = []
+        for col_no, value in enumerate(row, start=1):
+            ref = f"{_a1_col(col_no)}{row_no}"
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            elif col_no in inline_columns:
+                escaped, preserve = _text_xml(value)
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t{preserve}>{escaped}</t></is></c>')
+            else:
+                cells.append(f'<c r="{ref}" t="s"><v>{shared.index(value)}</v></c>')
+        batch.append(f'<row r="{row_no}">{"".join(cells)}</row>')
+        if len(batch) >= WRITE_BATCH_ROWS:
+            stream.write("".join(batch).encode("utf-8"))
+            batch.clear()
+    if batch:
+        stream.write("".join(batch).encode("utf-8"))
+    stream.write(f'</sheetData><autoFilter ref="A1:{_a1_col(len(header))}{row_no}"/></worksheet>'.encode("utf-8"))
+    return row_no
 
-    row_no = 1
-    header_cells = "".join(_cell_xml(row_no, col_no, header) for col_no, header in enumerate(HEADERS, start=1))
-    xml_parts.append(f'<row r="{row_no}">{header_cells}</row>')
 
-    for item in rows:
-        row_no += 1
-        row_cells = "".join(_cell_xml(row_no, col_no, item.get(header, "")) for col_no, header in enumerate(HEADERS, start=1))
-        xml_parts.append(f'<row r="{row_no}">{row_cells}</row>')
+def _quoted_sheet_name(name: str) -> str:
+    escaped = name.replace("'", "''")
+    return f"'{escaped}'"
 
-    xml_parts.extend(["</sheetData>", "</worksheet>"])
-    return "".join(xml_parts)
+
+def _workbook_xml(sheets: list[tuple[str, int, int]]) -> str:
+    sheet_xml = "".join(
+        f'<sheet name="{_escape_xml_text(name)}" sheetId="{idx}" r:id="rId{idx}"/>'
+        for idx, (name, _, _) in enumerate(sheets, start=1)
+    )
+    # Excel keeps each sheet's autofilter range in a hidden _FilterDatabase name.
+    defined_names = "".join(
+        f'<definedName name="_xlnm._FilterDatabase" localSheetId="{idx}" hidden="1">'
+        f"{_escape_xml_text(_quoted_sheet_name(name))}!$A$1:${_a1_col(columns)}${row_count}</definedName>"
+        for idx, (name, columns, row_count) in enumerate(sheets)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+        ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f"<sheets>{sheet_xml}</sheets><definedNames>{defined_names}</definedNames></workbook>"
+    )
 
 
-def export_overdue_events_excel(path: Path, module_results: dict[str, dict[str, Any]]) -> int:
+def export_overdue_events_excel(
+    path: Path,
+    module_results: dict[str, dict[str, Any]],
+    topic_results: dict[str, dict[str, Any]] | None = None,
+) -> int:
     rows = _collect_overdue_rows(module_results)
-    sheet_xml = _build_sheet_xml(rows)
+    topic_order = list(topic_results or {})
+    used_names: set[str] = set()
+
+    # (sheet name, header, rows, inline columns); the full list stays first so existing
+    # consumers of sheet1 keep working. Summaries reuse the ranked stats already computed.
+    sheets: list[tuple[str, Sequence[str], Iterable[Sequence[Any]], frozenset[int]]] = [
+        (_sheet_name(EVENTS_SHEET_NAME, used_names), HEADERS, rows, INLINE_COLUMNS)
+    ]
+    for topic, topic_rows in _rows_by_topic(rows, topic_order).items():
+        sheets.append((_sheet_name(f"超期-{topic}", used_names), HEADERS, topic_rows, INLINE_COLUMNS))
+    if topic_results:
+        for sheet_name, key, label, with_summary in RANKED_SUMMARY_SHEETS:
+            header = ["主题", label, "超期起数"] + (["超期内容概括"] if with_summary else [])
+            sheets.append(
+                (
+                    _sheet_name(sheet_name, used_names),
+                    header,
+                    _ranked_summary_rows(topic_results, key, with_summary),
+                    frozenset({4}) if with_summary else frozenset(),
+                )
+            )
+        sheets.append(
+            (
+                _sheet_name(YEARLY_SUMMARY_SHEET_NAME, used_names),
+                ["主题", "年份", "总起数", "超期起数", "超期占比(%)"],
+                _yearly_summary_rows(topic_results),
+                frozenset(),
+            )
+        )
 
-    content_types_xml = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+    worksheet_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+    sheet_overrides = "".join(
+        f'  <Override PartName="/xl/worksheets/sheet{idx}.xml" ContentType="{worksheet_type}"/>\n'
+        for idx in range(1, len(sheets) + 1)
+    )
+    content_types_xml = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
   <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
   <Default Extension="xml" ContentType="application/xml"/>
   <Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
-  <Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+{sheet_overrides}  <Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>
 </Types>
 """
 
@@ -135,18 +324,13 @@ def export_overdue_events_excel(path: Path, module_results: dict[str, dict[str,
 </Relationships>
 """
 
-    workbook_xml = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
-          xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
-  <sheets>
-    <sheet name="超期事件" sheetId="1" r:id="rId1"/>
-  </sheets>
-</workbook>
-"""
-
-    workbook_rels_xml = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+    sheet_rels = "".join(
+        f'  <Relationship Id="rId{idx}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{idx}.xml"/>\n'
+        for idx in range(1, len(sheets) + 1)
+    )
+    workbook_rels_xml = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
-  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+{sheet_rels}  <Relationship Id="rId{len(sheets) + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>
 </Relationships>
 """
 
@@ -154,8 +338,17 @@ def export_overdue_events_excel(path: Path, module_results: dict[str, dict[str,
     with ZipFile(path, mode="w", compression=ZIP_DEFLATED) as zf:
         zf.writestr("[Content_Types].xml", content_types_xml)
         zf.writestr("_rels/.rels", root_rels_xml)
-        zf.writestr("xl/workbook.xml", workbook_xml)
         zf.writestr("xl/_rels/workbook.xml.rels", workbook_rels_xml)
-        zf.writestr("xl/worksheets/sheet1.xml", sheet_xml)
+        shared = _SharedStrings()
+        written: list[tuple[str, int, int]] = []
+        for idx, (sheet_name, header, sheet_rows, inline_columns) in enumerate(sheets, start=1):
+            with zf.open(f"xl/worksheets/sheet{idx}.xml", mode="w") as stream:
+                row_count = _write_sheet(stream, header, sheet_rows, shared, inline_columns)
+            written.append((sheet_name, len(header), row_count))
+        # Written last: the autofilter ranges depend on the row counts above.
+        zf.writestr("xl/workbook.xml", _workbook_xml(written))
+        with zf.open("xl/sharedStrings.xml", mode="w") as stream:
+            for chunk in shared.iter_xml():
+                stream.write(chunk.encode("utf-8"))
 
     return len(rows)
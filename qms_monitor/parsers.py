@@ -1,7 +1,30 @@
 from __future__ import annotations
 
 import re
+from collections import OrderedDict
 from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H",
+    "%Y-%m",
+)
+SERIAL_FORMAT = "serial"
+# Distinct raw date strings remembered across all ledgers.
+DATE_CACHE_SIZE = 65536
+# Consecutive rows a format must win before a column tries it first.
+DATE_FORMAT_LOCK_AFTER = 3
+
+EXCEL_EPOCH = datetime(1899, 12, 30)
+_EXCEL_EPOCH_ORDINAL = EXCEL_EPOCH.toordinal()
+_MAX_EXCEL_SERIAL = date.max.toordinal() - _EXCEL_EPOCH_ORDINAL
+_SERIAL_RE = re.compile(r"\d+(\.\d+)?")
+_WHITESPACE_RE = re.compile(r"\s+")
+_EMBEDDED_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
 
 
 def parse_tabular_text(text: str) -> list[list[str]]:
@@ -47,17 +70,21 @@ def parse_year(raw: str) -> str:
     return value
 
 
-def parse_date_cell(raw: str) -> date | None:
-    value = (raw or "").strip()
-    if not value:
+def _excel_serial_date(value: str) -> date | None:
+    serial = float(value)
+    if serial <= 0:
         return None
+    whole = int(serial)
+    if whole == serial and whole < _MAX_EXCEL_SERIAL:
+        return date.fromordinal(_EXCEL_EPOCH_ORDINAL + whole)
+    return (EXCEL_EPOCH + timedelta(days=serial)).date()
 
-    num_match = re.fullmatch(r"\d+(\.\d+)?", value)
-    if num_match:
-        serial = float(value)
-        if serial > 0:
-            origin = datetime(1899, 12, 30)
-            return (origin + timedelta(days=serial)).date()
+
+def _parse_date_value(value: str, formats: tuple[str, ...]) -> tuple[date | None, str | None]:
+    if _SERIAL_RE.fullmatch(value):
+        parsed = _excel_serial_date(value)
+        if parsed is not None:
+            return parsed, SERIAL_FORMAT
 
     normalized = (
         value.replace("年", "-")
@@ -66,32 +93,85 @@ def parse_date_cell(raw: str) -> date | None:
         .replace("/", "-")
         .replace(".", "-")
     )
-    normalized = re.sub(r"\s+", " ", normalized)
-
-    candidates = [
-        "%Y-%m-%d",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%d %H",
-        "%Y-%m",
-    ]
-    for fmt in candidates:
+    normalized = _WHITESPACE_RE.sub(" ", normalized)
+
+    for fmt in formats:
         try:
             dt = datetime.strptime(normalized, fmt)
             if fmt == "%Y-%m":
-                return date(dt.year, dt.month, 1)
-            return dt.date()
+                return date(dt.year, dt.month, 1), fmt
+            return dt.date(), fmt
         except ValueError:
             continue
 
-    match = re.search(r"(\d{4})-(\d{1,2})-(\d{1,2})", normalized)
+    match = _EMBEDDED_DATE_RE.search(normalized)
     if match:
         y, mon, day = map(int, match.groups())
         try:
-            return date(y, mon, day)
+            return date(y, mon, day), None
         except ValueError:
+            return None, None
+    return None, None
+
+
+@lru_cache(maxsize=None)
+def _format_order(preferred: str | None) -> tuple[str, ...]:
+    if preferred is None or preferred not in DATE_FORMATS:
+        return DATE_FORMATS
+    return (preferred, *(fmt for fmt in DATE_FORMATS if fmt != preferred))
+
+
+_date_memo: OrderedDict[str, tuple[date | None, str | None]] = OrderedDict()
+
+
+def _parse_date_memo(value: str, preferred: str | None) -> tuple[date | None, str | None]:
+    # Keyed on the value alone: the formats are mutually exclusive, so the column's
+    # preferred format only speeds up the first parse of a string, never its result.
+    cached = _date_memo.get(value)
+    if cached is not None:
+        try:
+            _date_memo.move_to_end(value)
+        except KeyError:
+            pass
+        return cached
+    result = _parse_date_value(value, _format_order(preferred))
+    _date_memo[value] = result
+    if len(_date_memo) > DATE_CACHE_SIZE:
+        _date_memo.popitem(last=False)
+    return result
+
+
+def parse_date_cell(raw: str) -> date | None:
+    value = (raw or "").strip()
+    if not value:
+        return None
+    return _parse_date_memo(value, None)[0]
+
+
+class DateColumnParser:
+    def __init__(self, lock_after: int = DATE_FORMAT_LOCK_AFTER):
+        self.lock_after = lock_after
+        self.format: str | None = None
+        self._last_format: str | None = None
+        self._streak = 0
+
+    def parse(self, raw: str) -> date | None:
+        value = (raw or "").strip()
+        if not value:
             return None
-    return None
+        parsed, fmt = _parse_date_memo(value, self.format)
+        if fmt is not None:
+            self._observe(fmt)
+        return parsed
+
+    def _observe(self, fmt: str) -> None:
+        if fmt == self._last_format:
+            self._streak += 1
+        else:
+            self._last_format = fmt
+            self._streak = 1
+        if self._streak >= self.lock_after:
+            self.format = fmt
 
 
 def is_leap(year: int) -> bool:
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+PDF_CACHE_VERSION = 1
+MAX_ENTRIES_PER_FILE = 32
+LOCK_POLL_SECONDS = 0.05
+
+
+def pdf_cache_dir_from_env() -> Optional[Path]:
+    if os.getenv("QMS_PDF_CACHE", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    return Path(os.getenv("QMS_PDF_CACHE_DIR", "").strip() or "artifacts/pdf_cache")
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if sys.platform == "win32":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if sys.platform == "win32":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: Path, *, blocking: bool = True) -> Iterator[bool]:
+    # Advisory lock shared by CLI runs and serve requests. Yields False when the lock
+    # file cannot be opened, or when blocking=False and another holder has it.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        yield False
+        return
+    try:
+        locked = _try_lock(fd)
+        while not locked and blocking:
+            time.sleep(LOCK_POLL_SECONDS)
+            locked = _try_lock(fd)
+        try:
+            yield locked
+        finally:
+            if locked:
+                _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _fontconfig_paths() -> list[Path]:
+    home = Path.home()
+    cache_home = Path(os.getenv("XDG_CACHE_HOME", "").strip() or home / ".cache")
+    data_home = Path(os.getenv("XDG_DATA_HOME", "").strip() or home / ".local" / "share")
+    return [
+        # fontconfig caches, rewritten by fc-cache whenever installed fonts change.
+        cache_home / "fontconfig",
+        Path("/var/cache/fontconfig"),
+        Path("/usr/local/var/cache/fontconfig"),
+        Path("/opt/homebrew/var/cache/fontconfig"),
+        # Font directories themselves, for fonts added without rerunning fc-cache.
+        data_home / "fonts",
+        home / ".fonts",
+        home / "Library" / "Fonts",
+        Path("/usr/share/fonts"),
+        Path("/usr/local/share/fonts"),
+        Path("/Library/Fonts"),
+    ]
+
+
+def fontconfig_cache_mtime() -> float:
+    latest = 0.0
+    for directory in _fontconfig_paths():
+        try:
+            latest = max(latest, directory.stat().st_mtime)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        latest = max(latest, entry.stat(follow_symlinks=False).st_mtime)
+        except OSError:
+            continue
+    return latest
+
+
+def make_cache_key(material: dict[str, Any]) -> str:
+    payload = json.dumps({"version": PDF_CACHE_VERSION, **material}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_entries(path: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    entries = payload.get("entries") if isinstance(payload, dict) else None
+    return entries if isinstance(entries, dict) else {}
+
+
+def load_cache_entry(path: Path, key: str) -> Optional[dict[str, Any]]:
+    value = _read_entries(path).get(key)
+    return value if isinstance(value, dict) else None
+
+
+def store_cache_entry(path: Path, key: str, value: dict[str, Any]) -> None:
+    # Read-modify-write under the lock so concurrent runs do not drop each other's entries.
+    with file_lock(path.with_name(f"{path.name}.lock")) as locked:
+        if not locked:
+            return
+        entries = _read_entries(path)
+        entries.pop(key, None)
+        entries[key] = value
+        # Newest entries are last; older fingerprints are dropped once the file is full.
+        while len(entries) > MAX_ENTRIES_PER_FILE:
+            entries.pop(next(iter(entries)))
+        try:
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps({"entries": entries}, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            return
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from html import escape
 from pathlib import Path
 from typing import Iterable
 
 
+PREFERRED_FONT = "STSong-Light"
+FALLBACK_FONT = "Helvetica"
+
+
 def _weighted_text_len(text: str) -> int:
     length = 0
     for ch in text:
@@ -94,6 +99,19 @@ def _to_para_markup(nodes: Iterable[object], *, code_font: str) -> str:
     return "".join(parts).strip()
 
 
+@lru_cache(maxsize=1)
+def _register_body_font() -> str:
+    # reportlab keeps registered fonts process-wide, so the CID font is set up once per process.
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+
+    try:
+        pdfmetrics.registerFont(UnicodeCIDFont(PREFERRED_FONT))
+    except Exception:
+        return FALLBACK_FONT
+    return PREFERRED_FONT
+
+
 def export_markdown_text_to_pdf(markdown_text: str, output_path: Path) -> None:
     try:
         import markdown
@@ -101,8 +119,6 @@ def export_markdown_text_to_pdf(markdown_text: str, output_path: Path) -> None:
         from reportlab.lib import colors
         from reportlab.lib.pagesizes import A4
         from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.cidfonts import UnicodeCIDFont
         from reportlab.platypus import (
             HRFlowable,
             ListFlowable,
@@ -117,16 +133,8 @@ def export_markdown_text_to_pdf(markdown_text: str, output_path: Path) -> None:
     except ModuleNotFoundError as exc:
         raise RuntimeError("缺少依赖 markdown/beautifulsoup4/reportlab，请先运行 `uv sync`") from exc
 
-    preferred_font = "STSong-Light"
-    fallback_font = "Helvetica"
     code_font = "Courier"
-
-    font_name = fallback_font
-    try:
-        pdfmetrics.registerFont(UnicodeCIDFont(preferred_font))
-        font_name = preferred_font
-    except Exception:
-        font_name = fallback_font
+    font_name = _register_body_font()
 
     styles = getSampleStyleSheet()
     body_style = ParagraphStyle(
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import shutil
 import subprocess
+import tempfile
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+from .pdf_cache import (
+    file_lock,
+    fontconfig_cache_mtime,
+    load_cache_entry,
+    make_cache_key,
+    pdf_cache_dir_from_env,
+    store_cache_entry,
+)
 
 
 def _list_available_fonts() -> set[str]:
@@ -44,6 +59,44 @@ def _pick_existing_font(available_fonts: set[str], *candidates: str) -> str:
     return ""
 
 
+LATEX_FONT_CANDIDATES: dict[str, tuple[str, tuple[str, ...]]] = {
+    "mainfont": ("QMS_LATEX_MAINFONT", ("PingFang SC", "Songti SC", "Heiti SC", "Arial Unicode MS")),
+    "sansfont": ("QMS_LATEX_SANSFONT", ("Helvetica Neue", "PingFang SC", "Helvetica")),
+    "monofont": ("QMS_LATEX_MONOFONT", ("Menlo", "Courier New", "Courier")),
+}
+
+_resolved_fonts: dict[str, dict[str, str]] = {}
+
+LATEX_JOB_NAME = "qms_report"
+LATEX_AUX_SUFFIXES = (".aux", ".toc", ".out")
+MAX_XELATEX_PASSES = 4
+
+
+def resolve_latex_fonts() -> dict[str, str]:
+    requested = {
+        variable: [os.getenv(env_name, "").strip(), *defaults]
+        for variable, (env_name, defaults) in LATEX_FONT_CANDIDATES.items()
+    }
+    # The fc-list scan only reruns when the requested fonts or the installed fonts change.
+    key = make_cache_key({"fonts": requested, "fontconfig_mtime": fontconfig_cache_mtime()})
+    fonts = _resolved_fonts.get(key)
+    if fonts is not None:
+        return fonts
+
+    cache_dir = pdf_cache_dir_from_env()
+    cache_path = cache_dir / "fonts.json" if cache_dir is not None else None
+    cached = load_cache_entry(cache_path, key) if cache_path is not None else None
+    if cached is not None and set(cached) == set(requested):
+        fonts = {variable: str(cached[variable]) for variable in requested}
+    else:
+        available_fonts = _list_available_fonts()
+        fonts = {variable: _pick_existing_font(available_fonts, *names) for variable, names in requested.items()}
+        if cache_path is not None:
+            store_cache_entry(cache_path, key, fonts)
+    _resolved_fonts[key] = fonts
+    return fonts
+
+
 @dataclass(frozen=True)
 class LatexExportResult:
     mode: str
@@ -60,6 +113,87 @@ def _compact_error_text(stderr: str, stdout: str, *, limit: int = 300) -> str:
     return single_line[: limit - 3] + "..."
 
 
+def _latex_error_text(stdout: str) -> str:
+    # xelatex reports errors on stdout as "! ..." lines; the rest is mostly package noise.
+    lines = stdout.splitlines()
+    for idx, line in enumerate(lines):
+        if line.startswith("!"):
+            return _compact_error_text("\n".join(lines[idx : idx + 3]), "")
+    return _compact_error_text("", stdout[-2000:])
+
+
+def _file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _tool_stamp(name: str) -> list[Any]:
+    path = shutil.which(name)
+    if path is None:
+        return [name, None]
+    try:
+        return [path, os.stat(path).st_mtime]
+    except OSError:
+        return [path, None]
+
+
+def _aux_snapshot(build_dir: Path) -> dict[str, bytes]:
+    snapshot: dict[str, bytes] = {}
+    for suffix in LATEX_AUX_SUFFIXES:
+        try:
+            snapshot[suffix] = (build_dir / f"{LATEX_JOB_NAME}{suffix}").read_bytes()
+        except OSError:
+            continue
+    return snapshot
+
+
+def _compile_tex(build_dir: Path) -> tuple[bool, str]:
+    # The build directory keeps .aux/.toc from the previous report, so when the headings
+    # and page breaks are unchanged a single pass already has the right TOC.
+    for _ in range(MAX_XELATEX_PASSES):
+        before = _aux_snapshot(build_dir)
+        proc = subprocess.run(
+            ["xelatex", "-interaction=nonstopmode", "-halt-on-error", f"{LATEX_JOB_NAME}.tex"],
+            cwd=build_dir,
+            capture_output=True,
+            text=True,
+            errors="replace",
+        )
+        if proc.returncode != 0:
+            # A half-written .aux can break the next compile, so a failed pass starts cold next time.
+            for suffix in LATEX_AUX_SUFFIXES:
+                (build_dir / f"{LATEX_JOB_NAME}{suffix}").unlink(missing_ok=True)
+            return False, _latex_error_text(proc.stdout) or _compact_error_text(proc.stderr, "")
+        if _aux_snapshot(build_dir) == before:
+            break
+    return True, ""
+
+
+def _build_pdf(pandoc_cmd: list[str], build_dir: Path, output_path: Path) -> tuple[bool, str]:
+    # pandoc -> xelatex -> copy runs under one lock: the warm directory is shared by CLI
+    # runs and serve requests, which would otherwise overwrite each other's .tex/.aux/.pdf.
+    with file_lock(build_dir.with_name(f"{build_dir.name}.lock"), blocking=False) as locked:
+        if locked:
+            return _build_pdf_in(pandoc_cmd, build_dir, output_path)
+    # Another run holds the warm directory; compile cold instead of waiting for it.
+    with tempfile.TemporaryDirectory(prefix="qms_latex_") as tmp:
+        return _build_pdf_in(pandoc_cmd, Path(tmp), output_path)
+
+
+def _build_pdf_in(pandoc_cmd: list[str], build_dir: Path, output_path: Path) -> tuple[bool, str]:
+    build_dir.mkdir(parents=True, exist_ok=True)
+    tex_path = build_dir / f"{LATEX_JOB_NAME}.tex"
+    proc = subprocess.run([*pandoc_cmd, "--output", str(tex_path)], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return False, _compact_error_text(proc.stderr, proc.stdout)
+    ok, error = _compile_tex(build_dir)
+    if ok:
+        shutil.copyfile(build_dir / f"{LATEX_JOB_NAME}.pdf", output_path)
+    return ok, error
+
+
 def export_markdown_file_to_pdf_latex(markdown_path: Path, output_path: Path) -> LatexExportResult:
     if not markdown_path.exists():
         raise RuntimeError(f"Markdown文件不存在: {markdown_path}")
@@ -69,39 +203,16 @@ def export_markdown_file_to_pdf_latex(markdown_path: Path, output_path: Path) ->
     toc_pagebreak_path = Path(__file__).resolve().parent / "resources" / "pandoc_toc_pagebreak.tex"
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    available_fonts = _list_available_fonts()
-
-    mainfont = _pick_existing_font(
-        available_fonts,
-        os.getenv("QMS_LATEX_MAINFONT", "").strip(),
-        "PingFang SC",
-        "Songti SC",
-        "Heiti SC",
-        "Arial Unicode MS",
-    )
-    sansfont = _pick_existing_font(
-        available_fonts,
-        os.getenv("QMS_LATEX_SANSFONT", "").strip(),
-        "Helvetica Neue",
-        "PingFang SC",
-        "Helvetica",
-    )
-    monofont = _pick_existing_font(
-        available_fonts,
-        os.getenv("QMS_LATEX_MONOFONT", "").strip(),
-        "Menlo",
-        "Courier New",
-        "Courier",
-    )
+    fonts = resolve_latex_fonts()
     base_cmd = [
         "pandoc",
         str(markdown_path),
         "--from",
         "gfm+pipe_tables+task_lists+smart",
+        "--to",
+        "latex",
+        "--standalone",
         "--syntax-highlighting=none",
-        "--pdf-engine=xelatex",
-        "--output",
-        str(output_path),
         "--toc",
         "--toc-depth=2",
         "--number-sections",
@@ -116,24 +227,57 @@ def export_markdown_file_to_pdf_latex(markdown_path: Path, output_path: Path) ->
         "--include-in-header",
         str(toc_pagebreak_path),
     ]
-    if mainfont:
-        base_cmd.append("--variable=mainfont:" + mainfont)
-    if sansfont:
-        base_cmd.append("--variable=sansfont:" + sansfont)
-    if monofont:
-        base_cmd.append("--variable=monofont:" + monofont)
+    for variable, font in fonts.items():
+        if font:
+            base_cmd.append(f"--variable={variable}:{font}")
     styled_cmd = [*base_cmd, "--include-in-header", str(header_path)]
 
-    proc = subprocess.run(styled_cmd, capture_output=True, text=True)
-    if proc.returncode == 0:
-        return LatexExportResult(mode="styled")
+    fingerprint = make_cache_key(
+        {
+            "latex_resources": [_file_digest(path) for path in (header_path, table_filter_path, toc_pagebreak_path)],
+            "fonts": fonts,
+            "tools": [_tool_stamp("pandoc"), _tool_stamp("xelatex")],
+        }
+    )
+    cache_dir = pdf_cache_dir_from_env()
+    build_context = (
+        tempfile.TemporaryDirectory(prefix="qms_latex_")
+        if cache_dir is None
+        else nullcontext(str(cache_dir / "latex_build"))
+    )
+    with build_context as build_root_name:
+        build_root = Path(build_root_name)
+        mode_path = cache_dir / "latex_mode.json" if cache_dir is not None else None
+        decision = load_cache_entry(mode_path, fingerprint) if mode_path is not None else None
+
+        recheck_seconds = float(os.getenv("QMS_PDF_MODE_RECHECK_HOURS", "24") or 0) * 3600
+        # A remembered plain fallback skips the styled attempt until the recheck interval
+        # passes, so a TeX environment missing packages no longer pays for two compiles.
+        skip_styled = (
+            decision is not None
+            and decision.get("mode") == "plain"
+            and time.time() - float(decision.get("checked_at") or 0) < recheck_seconds
+        )
+
+        if not skip_styled:
+            ok, error = _build_pdf(styled_cmd, build_root / f"styled-{fingerprint[:16]}", output_path)
+            if ok:
+                if mode_path is not None and (decision or {}).get("mode") != "styled":
+                    store_cache_entry(mode_path, fingerprint, {"mode": "styled", "checked_at": time.time()})
+                return LatexExportResult(mode="styled")
+            reason = error
+        else:
+            reason = str(decision.get("reason") or "")
 
-    fallback_proc = subprocess.run(base_cmd, capture_output=True, text=True)
-    if fallback_proc.returncode == 0:
-        reason = _compact_error_text(proc.stderr, proc.stdout)
-        return LatexExportResult(mode="plain", fallback_reason=reason)
+        ok, error = _build_pdf(base_cmd, build_root / f"plain-{fingerprint[:16]}", output_path)
+        if ok:
+            if mode_path is not None and not skip_styled:
+                store_cache_entry(
+                    mode_path, fingerprint, {"mode": "plain", "checked_at": time.time(), "reason": reason}
+                )
+            return LatexExportResult(mode="plain", fallback_reason=reason)
 
-    detail = (fallback_proc.stderr or fallback_proc.stdout or proc.stderr or proc.stdout or "").strip()
+    detail = error or reason
     if detail:
         raise RuntimeError(f"pandoc/xelatex 导出失败: {detail}")
     raise RuntimeError("pandoc/xelatex 导出失败")
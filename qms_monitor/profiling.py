@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+PROFILE_SECTIONS = ("stages", "ledgers", "reads", "parses", "llm_calls")
+SLOWEST_LEDGER_COUNT = 10
+
+
+class RunProfile:
+    def __init__(self) -> None:
+        self.started_at = datetime.now()
+        self.meta: dict[str, Any] = {}
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._lock = threading.Lock()
+        self._sections: dict[str, list[dict[str, Any]]] = {name: [] for name in PROFILE_SECTIONS}
+
+    def start(self, section: str, name: str, **fields: Any) -> dict[str, Any]:
+        # cpu_s is process CPU time, so spans that overlap (concurrent LLM calls) share it.
+        return {
+            "section": section,
+            "name": name,
+            **fields,
+            "_wall": time.perf_counter(),
+            "_cpu": time.process_time(),
+        }
+
+    def stop(self, entry: dict[str, Any]) -> dict[str, Any]:
+        section = entry.pop("section")
+        wall0 = entry.pop("_wall")
+        cpu0 = entry.pop("_cpu")
+        entry["start_s"] = round(wall0 - self._wall0, 6)
+        entry["wall_s"] = round(time.perf_counter() - wall0, 6)
+        entry["cpu_s"] = round(time.process_time() - cpu0, 6)
+        with self._lock:
+            self._sections.setdefault(section, []).append(entry)
+        return entry
+
+    @contextmanager
+    def span(self, section: str, name: str, **fields: Any) -> Iterator[dict[str, Any]]:
+        entry = self.start(section, name, **fields)
+        try:
+            yield entry
+        except Exception as exc:
+            entry["error"] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self.stop(entry)
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            sections = {name: sorted(entries, key=lambda e: e["start_s"]) for name, entries in self._sections.items()}
+        slowest = sorted(sections.get("ledgers", []), key=lambda e: e["wall_s"], reverse=True)
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self._wall0, 6),
+            "cpu_s": round(time.process_time() - self._cpu0, 6),
+            **self.meta,
+            "slowest_ledgers": slowest[:SLOWEST_LEDGER_COUNT],
+            **sections,
+        }
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+_active_profile: Optional[RunProfile] = None
+
+
+def set_active_profile(profile: Optional[RunProfile]) -> None:
+    global _active_profile
+    _active_profile = profile
+
+
+def get_active_profile() -> Optional[RunProfile]:
+    return _active_profile
+
+
+@contextmanager
+def profile_span(section: str, name: str, **fields: Any) -> Iterator[dict[str, Any]]:
+    # Lower layers report through the active profile; without one the span is a plain dict.
+    profile = _active_profile
+    if profile is None:
+        yield {}
+        return
+    with profile.span(section, name, **fields) as entry:
+        yield entry
+
+
+def profile_iter(
+    section: str,
+    items: Iterable[T],
+    describe: Callable[[T], dict[str, Any]],
+) -> Iterator[tuple[dict[str, Any], T]]:
+    # Each span runs from requesting an item until the loop asks for the next one,
+    # so it covers the producer's work (read, parse) and the loop body (stats) together.
+    profile = _active_profile
+    if profile is None:
+        for item in items:
+            yield {}, item
+        return
+    iterator = iter(items)
+    while True:
+        entry = profile.start(section, "")
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        entry.update(describe(item))
+        yield entry, item
+        profile.stop(entry)
@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .app import close_llm_clients, load_inputs, read_csv_ledger_events, write_reports
+from .ledger_reader import read_xlsx_ledger_events
+from .models import LedgerConfig, QmsEvent
+from .profiling import RunProfile, set_active_profile
+from .stats import build_report_stats
+
+
+FileStamp = Optional[tuple[int, int]]
+
+
+def _file_stamp(path: Path) -> FileStamp:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _log(message: str) -> None:
+    sys.stderr.write(f"[SERVE] {message}\n")
+    sys.stderr.flush()
+
+
+@dataclass
+class _LedgerEntry:
+    fingerprint: tuple[Any, ...]
+    events: list[QmsEvent]
+    warnings: list[str]
+    # False when the CSV is missing or unreadable; such ledgers do not register their module.
+    read_ok: bool
+
+    @property
+    def skipped(self) -> bool:
+        return not self.read_ok or bool(self.warnings and not self.events)
+
+
+class LedgerStore:
+    def __init__(self, args: argparse.Namespace, config_path: Path):
+        self.args = args
+        self.config_path = config_path
+        self.generation = 0
+        self.loaded_at: Optional[datetime] = None
+        self._lock = threading.RLock()
+        self._inputs_stamp: FileStamp = None
+        self._configs: list[LedgerConfig] = []
+        self._csv_map: dict[int, Path] = {}
+        self._csv_encodings: dict[int, str] = {}
+        self._open_status_rules: dict[str, str] = {}
+        self._input_warnings: list[str] = []
+        self._entries: dict[int, _LedgerEntry] = {}
+        self._stats_memo: Optional[tuple[tuple[int, date], Any]] = None
+
+    def _inputs_path(self) -> Path:
+        return Path(self.args.csv_manifest) if self.args.input_mode == "csv" else self.config_path
+
+    def _ledger_fingerprint(self, cfg: LedgerConfig) -> tuple[Any, ...]:
+        if self.args.input_mode == "csv":
+            csv_path = self._csv_map.get(cfg.row_no)
+            stamp = _file_stamp(csv_path) if csv_path is not None else None
+            return cfg, csv_path, stamp, self._csv_encodings.get(cfg.row_no)
+        return cfg, _file_stamp(Path(cfg.file_path))
+
+    def _read_ledger(self, cfg: LedgerConfig, fingerprint: tuple[Any, ...]) -> _LedgerEntry:
+        if self.args.input_mode == "xlsx":
+            events, ledger_warnings = read_xlsx_ledger_events(cfg)
+            return _LedgerEntry(fingerprint, events, ledger_warnings, True)
+
+        csv_path = self._csv_map.get(cfg.row_no)
+        if csv_path is None:
+            warning = f"模块[{cfg.module}] row_no={cfg.row_no} 在manifest中未找到CSV，已跳过"
+            return _LedgerEntry(fingerprint, [], [warning], False)
+        cache_dir = Path(self.args.csv_manifest).parent / "events" if self.args.event_cache else None
+        events, ledger_warnings, err = read_csv_ledger_events(
+            cfg, csv_path, cache_dir, encoding=self._csv_encodings.get(cfg.row_no)
+        )
+        if err:
+            return _LedgerEntry(fingerprint, [], [f"模块[{cfg.module}] CSV读取失败，已跳过: {csv_path} ({err})"], False)
+        return _LedgerEntry(fingerprint, list(events), ledger_warnings, True)
+
+    def refresh(self) -> dict[str, int]:
+        # Only ledgers whose config row or source file changed are read again.
+        with self._lock:
+            inputs_changed = False
+            stamp = _file_stamp(self._inputs_path())
+            if self.loaded_at is None or stamp != self._inputs_stamp:
+                configs, csv_map, csv_encodings, open_status_rules, input_warnings = load_inputs(
+                    self.args, self.config_path
+                )
+                self._configs = configs
+                self._csv_map = csv_map
+                self._csv_encodings = csv_encodings
+                self._open_status_rules = open_status_rules
+                self._input_warnings = input_warnings
+                self._inputs_stamp = stamp
+                inputs_changed = True
+
+            entries: dict[int, _LedgerEntry] = {}
+            reloaded = 0
+            for cfg in self._configs:
+                fingerprint = self._ledger_fingerprint(cfg)
+                entry = self._entries.get(cfg.row_no)
+                if entry is None or entry.fingerprint != fingerprint:
+                    entry = self._read_ledger(cfg, fingerprint)
+                    reloaded += 1
+                entries[cfg.row_no] = entry
+            removed = len(self._entries.keys() - entries.keys())
+            self._entries = entries
+            if inputs_changed or reloaded or removed:
+                self.generation += 1
+                self.loaded_at = datetime.now()
+                self._stats_memo = None
+            return {"reloaded": reloaded, "reused": len(entries) - reloaded, "removed": removed}
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "input_mode": self.args.input_mode,
+                "ledgers": len(self._entries),
+                "events": sum(len(entry.events) for entry in self._entries.values()),
+                "generation": self.generation,
+                "loaded_at": self.loaded_at.isoformat(timespec="seconds") if self.loaded_at else "",
+            }
+
+    def report_inputs(self, report_date: date) -> dict[str, Any]:
+        with self._lock:
+            warnings = list(self._input_warnings)
+            grouped: dict[str, list[QmsEvent]] = defaultdict(list)
+            processed_files = 0
+            skipped_files = 0
+            for cfg in self._configs:
+                entry = self._entries[cfg.row_no]
+                if entry.read_ok:
+                    grouped[cfg.module].extend(entry.events)
+                warnings.extend(entry.warnings)
+                if entry.skipped:
+                    skipped_files += 1
+                else:
+                    processed_files += 1
+
+            # Stats only depend on the loaded ledgers and the report date, so repeated
+            # requests for the same day reuse them until a ledger changes.
+            memo_key = (self.generation, report_date)
+            if self._stats_memo is not None and self._stats_memo[0] == memo_key:
+                module_local_results, topic_inputs = self._stats_memo[1]
+            else:
+                module_local_results, topic_inputs = build_report_stats(
+                    grouped, report_date, self._open_status_rules
+                )
+                self._stats_memo = (memo_key, (module_local_results, topic_inputs))
+
+            return {
+                "module_local_results": module_local_results,
+                "topic_inputs": topic_inputs,
+                "warnings": warnings,
+                "processed_files": processed_files,
+                "skipped_files": skipped_files,
+            }
+
+
+def _detach_rankings(
+    topic_inputs: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]],
+) -> dict[str, tuple[dict[str, Any], list[dict[str, Any]]]]:
+    # LLM person summaries are written into the ranking rows in place; give them
+    # copies so the memoized stats stay as computed.
+    detached = {}
+    for topic, (local_stats, overdue_records) in topic_inputs.items():
+        stats = dict(local_stats)
+        for key in ("overdue_by_qa", "overdue_by_qa_manager"):
+            rows = stats.get(key)
+            if isinstance(rows, list):
+                stats[key] = [dict(row) if isinstance(row, dict) else row for row in rows]
+        detached[topic] = (stats, overdue_records)
+    return detached
+
+
+TRUE_VALUES = {"1", "true", "yes", "on"}
+FALSE_VALUES = {"0", "false", "no", "off"}
+RESPONSE_FORMATS = {"json", "markdown"}
+
+
+class RequestError(Exception):
+    pass
+
+
+def _param(params: dict[str, list[str]], name: str) -> str:
+    values = params.get(name)
+    return values[-1].strip() if values else ""
+
+
+def _flag(params: dict[str, list[str]], name: str, default: bool) -> bool:
+    value = _param(params, name).lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise RequestError(f"{name} 只能是 0/1: {value}")
+
+
+class ReportService:
+    def __init__(self, store: LedgerStore, args: argparse.Namespace):
+        self.store = store
+        self.args = args
+        # One report at a time: the active profile is process-wide.
+        self._lock = threading.Lock()
+        self._generated = 0
+
+    def generate(self, params: dict[str, list[str]]) -> dict[str, Any]:
+        raw_date = _param(params, "report_date") or self.args.report_date
+        try:
+            report_date = datetime.strptime(raw_date, "%Y-%m-%d").date() if raw_date else date.today()
+        except ValueError:
+            raise RequestError(f"report_date 格式必须是 YYYY-MM-DD: {raw_date}") from None
+        skip_llm = _flag(params, "skip_llm", self.args.skip_llm)
+        export_pdf = _flag(params, "pdf", True)
+        response_format = _param(params, "format").lower() or "json"
+        if response_format not in RESPONSE_FORMATS:
+            raise RequestError(f"format 只能是 json 或 markdown: {response_format}")
+
+        with self._lock:
+            started = time.perf_counter()
+            # Several reports can be generated within one second; the counter keeps file names apart.
+            self._generated += 1
+            timestamp = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{self._generated:04d}"
+            refresh = self.store.refresh()
+            request_args = argparse.Namespace(**vars(self.args))
+            request_args.skip_llm = skip_llm
+
+            profile = RunProfile()
+            profile.meta.update(input_mode=self.args.input_mode, serve=True, report_date=report_date.isoformat())
+            set_active_profile(profile)
+            try:
+                with profile.span("stages", "stats"):
+                    inputs = self.store.report_inputs(report_date)
+                if not skip_llm:
+                    inputs["topic_inputs"] = _detach_rankings(inputs["topic_inputs"])
+                result = write_reports(
+                    request_args,
+                    self.store.config_path,
+                    report_date,
+                    profile,
+                    export_pdf=export_pdf,
+                    timestamp=timestamp,
+                    **inputs,
+                )
+            finally:
+                set_active_profile(None)
+            markdown = result["report"].read_text(encoding="utf-8") if response_format == "markdown" else None
+
+        payload: dict[str, Any] = {
+            key: str(value) if isinstance(value, Path) else value for key, value in result.items()
+        }
+        payload.update(
+            report_date=report_date.isoformat(),
+            seconds=round(time.perf_counter() - started, 3),
+            refresh=refresh,
+        )
+        if markdown is not None:
+            payload["markdown"] = markdown
+        return payload
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = "qms-monitor"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        _log(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: HTTPStatus, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _handle(self) -> None:
+        service: ReportService = self.server.service  # type: ignore[attr-defined]
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        try:
+            if url.path == "/health":
+                self._send_json(HTTPStatus.OK, {"status": "ok", **service.store.summary()})
+            elif url.path == "/refresh":
+                with service._lock:
+                    refresh = service.store.refresh()
+                self._send_json(HTTPStatus.OK, {"refresh": refresh, **service.store.summary()})
+            elif url.path == "/report":
+                result = service.generate(params)
+                if "markdown" in result:
+                    self._send(HTTPStatus.OK, result["markdown"].encode("utf-8"), "text/markdown; charset=utf-8")
+                else:
+                    self._send_json(HTTPStatus.OK, result)
+            else:
+                self._send_json(HTTPStatus.NOT_FOUND, {"error": f"未知路径: {url.path}"})
+        except RequestError as exc:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"参数无效: {exc}"})
+        except Exception as exc:
+            _log(f"请求失败: {exc}")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(exc)})
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def _watch(store: LedgerStore, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        try:
+            result = store.refresh()
+        except Exception as exc:
+            _log(f"检查台账变化失败: {exc}")
+            continue
+        if result["reloaded"] or result["removed"]:
+            _log(f"台账已更新：重新读取 {result['reloaded']} 个，移除 {result['removed']} 个")
+
+
+def _warm_imports(skip_llm: bool) -> None:
+    # The PDF exporters and the LLM client import these on first use; loading them up
+    # front keeps the first request as fast as the later ones.
+    names = ["markdown", "bs4", "reportlab.platypus"]
+    if not skip_llm:
+        names.append("qms_monitor.llm_client")
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+
+
+def create_server(args: argparse.Namespace, service: ReportService) -> tuple[ThreadingHTTPServer | _UnixHTTPServer, str]:
+    server: ThreadingHTTPServer | _UnixHTTPServer
+    if args.socket:
+        socket_path = Path(args.socket)
+        socket_path.unlink(missing_ok=True)
+        server = _UnixHTTPServer(str(socket_path), _RequestHandler)
+        address = f"unix:{socket_path}"
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), _RequestHandler)
+        address = f"http://{args.host}:{server.server_address[1]}"
+    server.service = service  # type: ignore[attr-defined]
+    return server, address
+
+
+def serve(args: argparse.Namespace) -> int:
+    if args.input_mode not in {"csv", "xlsx"}:
+        print("serve 模式仅支持 csv 与 xlsx 输入（excel 模式依赖 Excel COM 逐次读取）", file=sys.stderr)
+        return 1
+    if args.report_date:
+        try:
+            datetime.strptime(args.report_date, "%Y-%m-%d")
+        except ValueError:
+            print("--report-date 格式必须是 YYYY-MM-DD", file=sys.stderr)
+            return 1
+    if args.streaming or args.stats_engine != "python" or args.workers > 1:
+        _log("serve 模式在内存中保留全部事件并使用 python 统计引擎，已忽略 --streaming/--stats-engine/--workers")
+
+    store = LedgerStore(args, Path(args.config))
+    started = time.perf_counter()
+    try:
+        store.refresh()
+    except RuntimeError as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    summary = store.summary()
+    _log(f"已加载 {summary['ledgers']} 个台账、{summary['events']} 条事件，用时 {time.perf_counter() - started:.1f}s")
+    _warm_imports(args.skip_llm)
+
+    server, address = create_server(args, ReportService(store, args))
+
+    stop = threading.Event()
+    if args.watch_interval > 0:
+        threading.Thread(
+            target=_watch, args=(store, args.watch_interval, stop), name="qms-watch", daemon=True
+        ).start()
+
+    _log(f"服务已启动: {address}（GET /report、/refresh、/health）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        close_llm_clients()
+        if args.socket:
+            Path(args.socket).unlink(missing_ok=True)
+    return 0
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import math
 from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import date
 from typing import Any
 
@@ -10,13 +12,21 @@ from .models import QmsEvent
 
 __all__ = [
     "build_local_stats",
+    "build_report_stats",
     "build_topic_stats",
     "build_event_records",
     "build_overdue_event_records",
     "is_open_status",
+    "ReportStatsAccumulator",
+    "topic_group_key",
 ]
 
 
+RANKED_FIELDS = ("qa", "qa_manager", "owner_dept", "owner")
+# Dimensions that get an LLM summary column and a top-20% payload.
+SUMMARY_FIELDS = ("qa", "qa_manager")
+
+
 def is_open_status(module: str, status: str, open_status_rules: dict[str, str]) -> bool:
     status_value = (status or "").strip()
     open_status = open_status_rules.get(module)
@@ -25,23 +35,36 @@ def is_open_status(module: str, status: str, open_status_rules: dict[str, str])
     return status_value == open_status
 
 
+def topic_group_key(topic: str) -> str:
+    return (topic or "").strip() or "未分类"
+
+
 def _normalize_name(value: Any) -> str:
     return str(value or "").strip()
 
 
-def _build_ranked_counter(overdue_items: list[dict[str, Any]], field: str) -> list[dict[str, Any]]:
-    counter: Counter[str] = Counter()
-    for item in overdue_items:
+def _index_by_name(overdue_items: list[dict[str, Any]], field: str) -> dict[str, list[int]]:
+    index: dict[str, list[int]] = {}
+    for idx, item in enumerate(overdue_items):
         name = _normalize_name(item.get(field))
         if name:
-            counter[name] += 1
-    return [{"name": name, "count": count} for name, count in sorted(counter.items(), key=lambda x: (-x[1], x[0]))]
+            positions = index.get(name)
+            if positions is None:
+                index[name] = [idx]
+            else:
+                positions.append(idx)
+    return index
+
+
+def _build_ranked_counter(name_index: dict[str, list[int]]) -> list[dict[str, Any]]:
+    counts = [(name, len(positions)) for name, positions in name_index.items()]
+    return [{"name": name, "count": count} for name, count in sorted(counts, key=lambda x: (-x[1], x[0]))]
 
 
 def _build_top20_overdue_payload(
     overdue_items: list[dict[str, Any]],
     ranked_rows: list[dict[str, Any]],
-    field: str,
+    name_index: dict[str, list[int]],
 ) -> list[dict[str, Any]]:
     if not ranked_rows:
         return []
@@ -57,9 +80,8 @@ def _build_top20_overdue_payload(
         if not name:
             continue
         person_items: list[dict[str, Any]] = []
-        for item in overdue_items:
-            if _normalize_name(item.get(field)) != name:
-                continue
+        for idx in name_index.get(name, []):
+            item = overdue_items[idx]
             person_items.append(
                 {
                     "module": item.get("module", ""),
@@ -76,54 +98,77 @@ def _build_top20_overdue_payload(
     return payload
 
 
-def build_local_stats(
-    module: str,
-    events: list[QmsEvent],
-    report_date: date,
-    open_status_rules: dict[str, str] | None = None,
-) -> dict[str, Any]:
-    rules = open_status_rules or {}
-    yearly_counter: Counter[str] = Counter()
-    overdue_items: list[dict[str, Any]] = []
+def _overdue_item(event: QmsEvent) -> dict[str, Any]:
+    return {
+        "topic": event.topic,
+        "module": event.module,
+        "year": event.year,
+        "event_id": event.event_id,
+        "content": event.content,
+        "initiated_date": event.initiated_date_str,
+        "planned_date": event.planned_date_str,
+        "status": event.status,
+        "owner_dept": event.owner_dept,
+        "owner": event.owner,
+        "qa": event.qa,
+        "qa_manager": event.qa_manager,
+        "source": f"{event.source_file} | {event.source_sheet} | row {event.row_index}",
+    }
 
-    for event in events:
-        yearly_counter[event.year] += 1
 
-        if event.planned_date and event.planned_date < report_date and is_open_status(module, event.status, rules):
-            overdue_items.append(
-                {
-                    "topic": event.topic,
-                    "module": event.module,
-                    "year": event.year,
-                    "event_id": event.event_id,
-                    "content": event.content,
-                    "initiated_date": event.initiated_date_str,
-                    "planned_date": event.planned_date_str,
-                    "status": event.status,
-                    "owner_dept": event.owner_dept,
-                    "owner": event.owner,
-                    "qa": event.qa,
-                    "qa_manager": event.qa_manager,
-                    "source": f"{event.source_file} | {event.source_sheet} | row {event.row_index}",
-                }
-            )
+def _event_record(event: QmsEvent, is_open: bool) -> dict[str, Any]:
+    return {
+        "topic": event.topic,
+        "module": event.module,
+        "year": event.year,
+        "event_id": event.event_id,
+        "content": event.content,
+        "initiated_date": event.initiated_date_str,
+        "planned_date": event.planned_date_str,
+        "status": event.status,
+        "owner_dept": event.owner_dept,
+        "owner": event.owner,
+        "qa": event.qa,
+        "qa_manager": event.qa_manager,
+        "status_semantic": "open" if is_open else "completed",
+        "source_file": event.source_file,
+        "source_sheet": event.source_sheet,
+        "source_row": event.row_index,
+    }
+
 
+def _sort_overdue_items(overdue_items: list[dict[str, Any]]) -> None:
     overdue_items.sort(key=lambda x: (x.get("planned_date") or "9999-12-31", x.get("event_id") or ""))
-    total = len(events)
+
+
+def _build_ranked_stats(overdue_items: list[dict[str, Any]]) -> dict[str, Any]:
+    # One name -> item positions index per dimension serves both the ranking and the top-20% payload.
+    indexes = {dim: _index_by_name(overdue_items, dim) for dim in RANKED_FIELDS}
+    ranked = {dim: _build_ranked_counter(index) for dim, index in indexes.items()}
+    for dim in SUMMARY_FIELDS:
+        for row in ranked[dim]:
+            row["summary"] = ""
+
+    result = {f"overdue_by_{dim}": ranked[dim] for dim in RANKED_FIELDS}
+    for dim in SUMMARY_FIELDS:
+        result[f"overdue_by_{dim}_top20"] = _build_top20_overdue_payload(
+            overdue_items,
+            ranked[dim],
+            indexes[dim],
+        )
+    return result
+
+
+def _finalize_local_stats(
+    module: str,
+    total: int,
+    yearly_counter: Counter[str],
+    overdue_items: list[dict[str, Any]],
+) -> dict[str, Any]:
+    _sort_overdue_items(overdue_items)
     overdue_count = len(overdue_items)
     ratio = round((overdue_count / total) * 100, 2) if total else 0.0
-
     yearly_totals = [{"year": y, "count": c} for y, c in sorted(yearly_counter.items(), key=lambda x: x[0])]
-    overdue_by_qa = _build_ranked_counter(overdue_items, "qa")
-    overdue_by_qa_manager = _build_ranked_counter(overdue_items, "qa_manager")
-    overdue_by_owner_dept = _build_ranked_counter(overdue_items, "owner_dept")
-    overdue_by_owner = _build_ranked_counter(overdue_items, "owner")
-    for row in overdue_by_qa:
-        row["summary"] = ""
-    for row in overdue_by_qa_manager:
-        row["summary"] = ""
-    overdue_by_qa_top20 = _build_top20_overdue_payload(overdue_items, overdue_by_qa, "qa")
-    overdue_by_qa_manager_top20 = _build_top20_overdue_payload(overdue_items, overdue_by_qa_manager, "qa_manager")
 
     return {
         "module": module,
@@ -133,15 +178,78 @@ def build_local_stats(
             "ratio": ratio,
             "items": overdue_items,
         },
-        "overdue_by_qa": overdue_by_qa,
-        "overdue_by_qa_manager": overdue_by_qa_manager,
-        "overdue_by_owner_dept": overdue_by_owner_dept,
-        "overdue_by_owner": overdue_by_owner,
-        "overdue_by_qa_top20": overdue_by_qa_top20,
-        "overdue_by_qa_manager_top20": overdue_by_qa_manager_top20,
+        **_build_ranked_stats(overdue_items),
+    }
+
+
+def _build_ratio_rows(
+    key: str,
+    total_counter: Counter[str],
+    overdue_counter: Counter[str],
+) -> list[dict[str, Any]]:
+    rows = []
+    for name, total in sorted(total_counter.items(), key=lambda x: x[0]):
+        overdue = overdue_counter.get(name, 0)
+        ratio = round((overdue / total) * 100, 2) if total else 0.0
+        rows.append(
+            {
+                key: name,
+                "count": total,
+                "overdue_count": overdue,
+                "overdue_ratio": ratio,
+            }
+        )
+    return rows
+
+
+def _finalize_topic_stats(
+    topic: str,
+    total_count: int,
+    yearly_total_counter: Counter[str],
+    yearly_overdue_counter: Counter[str],
+    module_total_counter: Counter[str],
+    module_overdue_counter: Counter[str],
+    overdue_items: list[dict[str, Any]],
+) -> dict[str, Any]:
+    _sort_overdue_items(overdue_items)
+    overdue_count = len(overdue_items)
+    overdue_ratio = round((overdue_count / total_count) * 100, 2) if total_count else 0.0
+    yearly_totals = [{"year": y, "count": c} for y, c in sorted(yearly_total_counter.items(), key=lambda x: x[0])]
+
+    return {
+        "topic": topic,
+        "yearly_totals": yearly_totals,
+        "yearly_overdue": _build_ratio_rows("year", yearly_total_counter, yearly_overdue_counter),
+        "total": {"count": total_count},
+        "overdue": {
+            "count": overdue_count,
+            "ratio": overdue_ratio,
+            "items": overdue_items,
+        },
+        "by_module": _build_ratio_rows("module", module_total_counter, module_overdue_counter),
+        **_build_ranked_stats(overdue_items),
     }
 
 
+def build_local_stats(
+    module: str,
+    events: list[QmsEvent],
+    report_date: date,
+    open_status_rules: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    rules = open_status_rules or {}
+    yearly_counter: Counter[str] = Counter()
+    overdue_items: list[dict[str, Any]] = []
+
+    for event in events:
+        yearly_counter[event.year] += 1
+
+        if event.planned_date and event.planned_date < report_date and is_open_status(module, event.status, rules):
+            overdue_items.append(_overdue_item(event))
+
+    return _finalize_local_stats(module, len(events), yearly_counter, overdue_items)
+
+
 def build_topic_stats(
     topic: str,
     events: list[QmsEvent],
@@ -169,85 +277,17 @@ def build_topic_stats(
 
         yearly_overdue_counter[event.year] += 1
         module_overdue_counter[event.module] += 1
-        overdue_items.append(
-            {
-                "topic": event.topic,
-                "module": event.module,
-                "year": event.year,
-                "event_id": event.event_id,
-                "content": event.content,
-                "initiated_date": event.initiated_date_str,
-                "planned_date": event.planned_date_str,
-                "status": event.status,
-                "owner_dept": event.owner_dept,
-                "owner": event.owner,
-                "qa": event.qa,
-                "qa_manager": event.qa_manager,
-                "source": f"{event.source_file} | {event.source_sheet} | row {event.row_index}",
-            }
-        )
-
-    overdue_items.sort(key=lambda x: (x.get("planned_date") or "9999-12-31", x.get("event_id") or ""))
-    total_count = len(events)
-    overdue_count = len(overdue_items)
-    overdue_ratio = round((overdue_count / total_count) * 100, 2) if total_count else 0.0
-
-    yearly_totals = [{"year": y, "count": c} for y, c in sorted(yearly_total_counter.items(), key=lambda x: x[0])]
-    yearly_overdue = []
-    for year, total in sorted(yearly_total_counter.items(), key=lambda x: x[0]):
-        overdue = yearly_overdue_counter.get(year, 0)
-        ratio = round((overdue / total) * 100, 2) if total else 0.0
-        yearly_overdue.append(
-            {
-                "year": year,
-                "count": total,
-                "overdue_count": overdue,
-                "overdue_ratio": ratio,
-            }
-        )
-
-    by_module = []
-    for module, total in sorted(module_total_counter.items(), key=lambda x: x[0]):
-        overdue = module_overdue_counter.get(module, 0)
-        ratio = round((overdue / total) * 100, 2) if total else 0.0
-        by_module.append(
-            {
-                "module": module,
-                "count": total,
-                "overdue_count": overdue,
-                "overdue_ratio": ratio,
-            }
-        )
+        overdue_items.append(_overdue_item(event))
 
-    overdue_by_qa = _build_ranked_counter(overdue_items, "qa")
-    overdue_by_qa_manager = _build_ranked_counter(overdue_items, "qa_manager")
-    overdue_by_owner_dept = _build_ranked_counter(overdue_items, "owner_dept")
-    overdue_by_owner = _build_ranked_counter(overdue_items, "owner")
-    for row in overdue_by_qa:
-        row["summary"] = ""
-    for row in overdue_by_qa_manager:
-        row["summary"] = ""
-    overdue_by_qa_top20 = _build_top20_overdue_payload(overdue_items, overdue_by_qa, "qa")
-    overdue_by_qa_manager_top20 = _build_top20_overdue_payload(overdue_items, overdue_by_qa_manager, "qa_manager")
-
-    return {
-        "topic": topic,
-        "yearly_totals": yearly_totals,
-        "yearly_overdue": yearly_overdue,
-        "total": {"count": total_count},
-        "overdue": {
-            "count": overdue_count,
-            "ratio": overdue_ratio,
-            "items": overdue_items,
-        },
-        "by_module": by_module,
-        "overdue_by_qa": overdue_by_qa,
-        "overdue_by_qa_manager": overdue_by_qa_manager,
-        "overdue_by_owner_dept": overdue_by_owner_dept,
-        "overdue_by_owner": overdue_by_owner,
-        "overdue_by_qa_top20": overdue_by_qa_top20,
-        "overdue_by_qa_manager_top20": overdue_by_qa_manager_top20,
-    }
+    return _finalize_topic_stats(
+        topic,
+        len(events),
+        yearly_total_counter,
+        yearly_overdue_counter,
+        module_total_counter,
+        module_overdue_counter,
+        overdue_items,
+    )
 
 
 def build_event_records(
@@ -255,30 +295,7 @@ def build_event_records(
     open_status_rules: dict[str, str] | None = None,
 ) -> list[dict[str, Any]]:
     rules = open_status_rules or {}
-    records: list[dict[str, Any]] = []
-    for event in events:
-        is_open = is_open_status(event.module, event.status, rules)
-        records.append(
-            {
-                "topic": event.topic,
-                "module": event.module,
-                "year": event.year,
-                "event_id": event.event_id,
-                "content": event.content,
-                "initiated_date": event.initiated_date_str,
-                "planned_date": event.planned_date_str,
-                "status": event.status,
-                "owner_dept": event.owner_dept,
-                "owner": event.owner,
-                "qa": event.qa,
-                "qa_manager": event.qa_manager,
-                "status_semantic": "open" if is_open else "completed",
-                "source_file": event.source_file,
-                "source_sheet": event.source_sheet,
-                "source_row": event.row_index,
-            }
-        )
-    return records
+    return [_event_record(event, is_open_status(event.module, event.status, rules)) for event in events]
 
 
 def build_overdue_event_records(
@@ -297,24 +314,122 @@ def build_overdue_event_records(
         )
         if not is_overdue:
             continue
-        records.append(
-            {
-                "topic": event.topic,
-                "module": event.module,
-                "year": event.year,
-                "event_id": event.event_id,
-                "content": event.content,
-                "initiated_date": event.initiated_date_str,
-                "planned_date": event.planned_date_str,
-                "status": event.status,
-                "owner_dept": event.owner_dept,
-                "owner": event.owner,
-                "qa": event.qa,
-                "qa_manager": event.qa_manager,
-                "status_semantic": "open" if is_open else "completed",
-                "source_file": event.source_file,
-                "source_sheet": event.source_sheet,
-                "source_row": event.row_index,
-            }
-        )
+        records.append(_event_record(event, is_open))
     return records
+
+
+@dataclass
+class _TopicAccumulator:
+    total: int = 0
+    yearly_total: Counter[str] = field(default_factory=Counter)
+    yearly_overdue: Counter[str] = field(default_factory=Counter)
+    module_total: Counter[str] = field(default_factory=Counter)
+    module_overdue: Counter[str] = field(default_factory=Counter)
+    overdue_items: list[dict[str, Any]] = field(default_factory=list)
+    overdue_records: list[dict[str, Any]] = field(default_factory=list)
+
+    def merge(self, other: "_TopicAccumulator") -> None:
+        self.total += other.total
+        self.yearly_total.update(other.yearly_total)
+        self.yearly_overdue.update(other.yearly_overdue)
+        self.module_total.update(other.module_total)
+        self.module_overdue.update(other.module_overdue)
+        self.overdue_items.extend(other.overdue_items)
+        self.overdue_records.extend(other.overdue_records)
+
+
+@dataclass
+class _ModuleAccumulator:
+    total: int = 0
+    yearly: Counter[str] = field(default_factory=Counter)
+    overdue_items: list[dict[str, Any]] = field(default_factory=list)
+    # Topic partials stay per module so the merged topic order matches module-grouped input.
+    topics: dict[str, _TopicAccumulator] = field(default_factory=dict)
+
+
+class ReportStatsAccumulator:
+    def __init__(self, report_date: date, open_status_rules: dict[str, str] | None = None):
+        self.report_date = report_date
+        self.rules = open_status_rules or {}
+        self._modules: dict[str, _ModuleAccumulator] = {}
+
+    def add_events(self, module: str, events: Iterable[QmsEvent]) -> int:
+        acc = self._modules.get(module)
+        if acc is None:
+            acc = self._modules[module] = _ModuleAccumulator()
+        report_date = self.report_date
+        rules = self.rules
+        topics = acc.topics
+        count = 0
+
+        for event in events:
+            count += 1
+            topic = topics.get(topic_group_key(event.topic))
+            if topic is None:
+                topic = topics[topic_group_key(event.topic)] = _TopicAccumulator()
+            acc.yearly[event.year] += 1
+            topic.total += 1
+            topic.yearly_total[event.year] += 1
+            topic.module_total[event.module] += 1
+
+            is_overdue = bool(
+                event.planned_date
+                and event.planned_date < report_date
+                and is_open_status(module, event.status, rules)
+            )
+            if not is_overdue:
+                continue
+
+            # Module and topic views list the same overdue item; neither mutates it.
+            item = _overdue_item(event)
+            acc.overdue_items.append(item)
+            topic.yearly_overdue[event.year] += 1
+            topic.module_overdue[event.module] += 1
+            topic.overdue_items.append(item)
+            topic.overdue_records.append(_event_record(event, True))
+
+        acc.total += count
+        return count
+
+    def finish(self) -> tuple[dict[str, dict[str, Any]], dict[str, tuple[dict[str, Any], list[dict[str, Any]]]]]:
+        module_results: dict[str, dict[str, Any]] = {}
+        topics: dict[str, _TopicAccumulator] = {}
+        for module, acc in self._modules.items():
+            module_results[module] = _finalize_local_stats(module, acc.total, acc.yearly, acc.overdue_items)
+            for name, partial in acc.topics.items():
+                topic = topics.get(name)
+                if topic is None:
+                    topic = topics[name] = _TopicAccumulator()
+                topic.merge(partial)
+
+        topic_inputs: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
+        for name, topic in topics.items():
+            # build_overdue_event_records checks the rule of every event, dated or not.
+            missing = next((module for module in topic.module_total if module not in self.rules), None)
+            if missing is not None:
+                raise ValueError(f"模块[{missing}]未配置未完成状态值")
+            topic_stats = _finalize_topic_stats(
+                name,
+                topic.total,
+                topic.yearly_total,
+                topic.yearly_overdue,
+                topic.module_total,
+                topic.module_overdue,
+                topic.overdue_items,
+            )
+            topic_inputs[name] = (topic_stats, topic.overdue_records)
+        return module_results, topic_inputs
+
+
+def build_report_stats(
+    grouped: dict[str, list[QmsEvent]],
+    report_date: date,
+    open_status_rules: dict[str, str] | None = None,
+) -> tuple[dict[str, dict[str, Any]], dict[str, tuple[dict[str, Any], list[dict[str, Any]]]]]:
+    # One scan over the module-grouped events feeds the module stats, the topic stats
+    # and the topic overdue records; results match calling build_local_stats per module
+    # and build_topic_stats / build_overdue_event_records per topic_group_key group.
+    accumulator = ReportStatsAccumulator(report_date, open_status_rules)
+    for module, events in grouped.items():
+        accumulator.add_events(module, events)
+    return accumulator.finish()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import posixpath
+import re
+from collections.abc import Collection, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Union
+from xml.etree.ElementTree import iterparse
+from zipfile import BadZipFile, ZipFile
+
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+WORKSHEET_REL_SUFFIX = "/worksheet"
+
+# Built-in number formats that Excel renders as dates/times (incl. CJK locale ids).
+BUILTIN_DATE_FORMAT_IDS = set(range(14, 23)) | set(range(27, 37)) | {45, 46, 47} | set(range(50, 59))
+
+_CELL_REF_RE = re.compile(r"([A-Z]+)(\d+)")
+_FORMAT_LITERAL_RE = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')
+
+
+def _col_ref_to_index(letters: str) -> int:
+    result = 0
+    for ch in letters:
+        result = result * 26 + (ord(ch) - 64)
+    return result - 1
+
+
+def _is_date_format_code(code: str) -> bool:
+    cleaned = _FORMAT_LITERAL_RE.sub("", code or "")
+    return bool(re.search(r"[ydhs]", cleaned, re.IGNORECASE))
+
+
+def _format_number(raw: str) -> str:
+    # Mirror Excel COM, which hands numbers to Python as floats.
+    try:
+        return str(float(raw))
+    except ValueError:
+        return raw
+
+
+def _format_serial_date(raw: str, origin: datetime) -> str:
+    try:
+        serial = float(raw)
+    except ValueError:
+        return raw
+    try:
+        value = origin + timedelta(days=serial)
+    except OverflowError:
+        return _format_number(raw)
+    value = value.replace(microsecond=0)
+    if value.hour or value.minute or value.second:
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value.date().isoformat()
+
+
+class XlsxWorkbook:
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path).expanduser()
+        self._zip: Optional[ZipFile] = None
+        self._sheets: list[tuple[str, str]] = []
+        self._shared_strings: list[str] = []
+        self._date_styles: set[int] = set()
+        self._date_origin = datetime(1899, 12, 30)
+
+    def open(self) -> "XlsxWorkbook":
+        try:
+            self._zip = ZipFile(self.path)
+        except BadZipFile as exc:
+            raise RuntimeError(f"不是有效的xlsx/xlsm文件: {self.path}") from exc
+        self._load_workbook()
+        self._load_shared_strings()
+        self._load_styles()
+        return self
+
+    def close(self) -> None:
+        if self._zip is not None:
+            try:
+                self._zip.close()
+            finally:
+                self._zip = None
+
+    def __enter__(self) -> "XlsxWorkbook":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def sheet_names(self) -> list[str]:
+        return [name for name, _ in self._sheets]
+
+    def _require_open(self) -> ZipFile:
+        if self._zip is None:
+            raise RuntimeError("XlsxWorkbook is not opened. Call .open() first.")
+        return self._zip
+
+    def _load_workbook(self) -> None:
+        zf = self._require_open()
+        rels: dict[str, tuple[str, str]] = {}
+        with zf.open("xl/_rels/workbook.xml.rels") as fh:
+            for _, elem in iterparse(fh):
+                if elem.tag == f"{NS_PKG_REL}Relationship":
+                    target = elem.get("Target", "")
+                    if target.startswith("/"):
+                        target = target.lstrip("/")
+                    else:
+                        target = posixpath.normpath(posixpath.join("xl", target))
+                    rels[elem.get("Id", "")] = (elem.get("Type", ""), target)
+
+        with zf.open("xl/workbook.xml") as fh:
+            for _, elem in iterparse(fh):
+                if elem.tag == f"{NS_MAIN}workbookPr" and elem.get("date1904") in {"1", "true"}:
+                    self._date_origin = datetime(1904, 1, 1)
+                elif elem.tag == f"{NS_MAIN}sheet":
+                    rel_type, target = rels.get(elem.get(f"{NS_REL}id", ""), ("", ""))
+                    if rel_type.endswith(WORKSHEET_REL_SUFFIX):
+                        self._sheets.append((elem.get("name", ""), target))
+
+    def _load_shared_strings(self) -> None:
+        zf = self._require_open()
+        if "xl/sharedStrings.xml" not in zf.namelist():
+            return
+        with zf.open("xl/sharedStrings.xml") as fh:
+            for _, elem in iterparse(fh):
+                if elem.tag != f"{NS_MAIN}si":
+                    continue
+                parts: list[str] = []
+                for child in elem:
+                    if child.tag == f"{NS_MAIN}t":
+                        parts.append(child.text or "")
+                    elif child.tag == f"{NS_MAIN}r":
+                        run_text = child.find(f"{NS_MAIN}t")
+                        if run_text is not None:
+                            parts.append(run_text.text or "")
+                self._shared_strings.append("".join(parts))
+                elem.clear()
+
+    def _load_styles(self) -> None:
+        zf = self._require_open()
+        if "xl/styles.xml" not in zf.namelist():
+            return
+        custom_formats: dict[int, str] = {}
+        xf_format_ids: list[int] = []
+        in_cell_xfs = False
+        with zf.open("xl/styles.xml") as fh:
+            for event, elem in iterparse(fh, events=("start", "end")):
+                if elem.tag == f"{NS_MAIN}cellXfs":
+                    in_cell_xfs = event == "start"
+                elif event == "end" and elem.tag == f"{NS_MAIN}numFmt":
+                    custom_formats[int(elem.get("numFmtId", "0"))] = elem.get("formatCode", "")
+                elif event == "end" and in_cell_xfs and elem.tag == f"{NS_MAIN}xf":
+                    xf_format_ids.append(int(elem.get("numFmtId", "0")))
+
+        for style_idx, fmt_id in enumerate(xf_format_ids):
+            if fmt_id in custom_formats:
+                is_date = _is_date_format_code(custom_formats[fmt_id])
+            else:
+                is_date = fmt_id in BUILTIN_DATE_FORMAT_IDS
+            if is_date:
+                self._date_styles.add(style_idx)
+
+    def _resolve_sheet(self, sheet: Union[int, str]) -> tuple[str, str]:
+        if isinstance(sheet, int):
+            if 1 <= sheet <= len(self._sheets):
+                return self._sheets[sheet - 1]
+            raise RuntimeError(f"sheet序号超出范围: {sheet}")
+        wanted = sheet.strip().lower()
+        for name, target in self._sheets:
+            if name.strip().lower() == wanted:
+                return name, target
+        raise RuntimeError(f"未找到sheet: {sheet}")
+
+    def _cell_text(self, cell_type: str, style: int, value: Optional[str], inline: Optional[str]) -> str:
+        if cell_type == "inlineStr":
+            return inline or ""
+        if value is None:
+            return ""
+        if cell_type == "s":
+            try:
+                return self._shared_strings[int(value)]
+            except (ValueError, IndexError):
+                return ""
+        if cell_type == "b":
+            return "True" if value == "1" else "False"
+        if cell_type in {"str", "e", "d"}:
+            return value
+        if style in self._date_styles:
+            return _format_serial_date(value, self._date_origin)
+        return _format_number(value)
+
+    def iter_rows(
+        self,
+        sheet: Union[int, str],
+        *,
+        columns: Optional[Collection[int]] = None,
+    ) -> Iterator[list[str]]:
+        zf = self._require_open()
+        _, target = self._resolve_sheet(sheet)
+        wanted = set(columns) if columns is not None else None
+
+        row_tag = f"{NS_MAIN}row"
+        cell_tag = f"{NS_MAIN}c"
+        value_tag = f"{NS_MAIN}v"
+        inline_tag = f"{NS_MAIN}is"
+        text_tag = f"{NS_MAIN}t"
+
+        emitted = 0
+        pending_blank = 0
+        with zf.open(target) as fh:
+            sheet_data = None
+            for event, elem in iterparse(fh, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == f"{NS_MAIN}sheetData":
+                        sheet_data = elem
+                    continue
+                if elem.tag != row_tag:
+                    continue
+
+                row_attr = elem.get("r")
+                row_no = int(row_attr) if row_attr else emitted + pending_blank + 1
+                cells: list[str] = []
+                next_col = 0
+                for cell in elem.iter(cell_tag):
+                    ref = cell.get("r")
+                    match = _CELL_REF_RE.match(ref) if ref else None
+                    col_idx = _col_ref_to_index(match.group(1)) if match else next_col
+                    next_col = col_idx + 1
+                    if wanted is not None and col_idx not in wanted:
+                        continue
+                    value_elem = cell.find(value_tag)
+                    inline_elem = cell.find(inline_tag)
+                    inline_text = None
+                    if inline_elem is not None:
+                        inline_text = "".join(t.text or "" for t in inline_elem.iter(text_tag))
+                    text = self._cell_text(
+                        cell.get("t", "n"),
+                        int(cell.get("s", "0")),
+                        value_elem.text if value_elem is not None else None,
+                        inline_text,
+                    ).strip()
+                    if col_idx >= len(cells):
+                        cells.extend([""] * (col_idx - len(cells) + 1))
+                    cells[col_idx] = text
+
+                while cells and not cells[-1]:
+                    cells.pop()
+
+                if sheet_data is not None:
+                    sheet_data.clear()
+                else:
+                    elem.clear()
+
+                # Styled but empty rows past the data are not part of the used range.
+                pending_blank += max(0, row_no - (emitted + pending_blank) - 1)
+                if not cells:
+                    pending_blank += 1
+                    continue
+                for _ in range(pending_blank):
+                    yield []
+                emitted += pending_blank + 1
+                pending_blank = 0
+                yield cells
+
+
+def read_xlsx_rows(path: Union[str, Path], sheet: Union[int, str] = 1) -> list[list[str]]:
+    with XlsxWorkbook(path) as workbook:
+        return list(workbook.iter_rows(sheet))
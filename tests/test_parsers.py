@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import unittest
+from datetime import date
+from unittest import mock
+
+from qms_monitor import parsers
+from qms_monitor.parsers import SERIAL_FORMAT, DateColumnParser, parse_date_cell
+
+
+class DateMemoTest(unittest.TestCase):
+    def setUp(self) -> None:
+        parsers._date_memo.clear()
+        self.addCleanup(parsers._date_memo.clear)
+
+    def test_hit_keeps_entry_over_older_ones(self) -> None:
+        with mock.patch.object(parsers, "DATE_CACHE_SIZE", 2):
+            parse_date_cell("2025-01-01")
+            parse_date_cell("2025-01-02")
+            parse_date_cell("2025-01-01")
+            parse_date_cell("2025-01-03")
+        self.assertEqual(list(parsers._date_memo), ["2025-01-01", "2025-01-03"])
+
+    def test_cached_result_ignores_preferred_format(self) -> None:
+        value = "2025-03-04 08:30"
+        first = parsers._parse_date_memo(value, "%Y-%m")
+        with mock.patch.object(parsers, "_parse_date_value", side_effect=AssertionError("not cached")):
+            self.assertEqual(parsers._parse_date_memo(value, None), first)
+        self.assertEqual(first, (date(2025, 3, 4), "%Y-%m-%d %H:%M"))
+
+
+class DateColumnParserTest(unittest.TestCase):
+    def test_format_locks_after_consecutive_wins(self) -> None:
+        parser = DateColumnParser(lock_after=3)
+        parser.parse("2025-01-01 08:00:00")
+        parser.parse("2025-01-02 08:00:00")
+        parser.parse("2025/01/03")
+        parser.parse("2025-01-04 08:00:00")
+        parser.parse("2025-01-05 08:00:00")
+        self.assertIsNone(parser.format)
+        self.assertEqual(parser.parse("2025-01-06 08:00:00"), date(2025, 1, 6))
+        self.assertEqual(parser.format, "%Y-%m-%d %H:%M:%S")
+        self.assertEqual(parser.parse("2025年1月7日"), date(2025, 1, 7))
+        self.assertEqual(parser.parse(""), None)
+
+    def test_locked_format_is_tried_first_on_a_miss(self) -> None:
+        parser = DateColumnParser(lock_after=1)
+        parser.parse("2031-05-01 10:00")
+        parsers._date_memo.pop("2031-05-02 10:00", None)
+        with mock.patch.object(parsers, "_parse_date_value", wraps=parsers._parse_date_value) as parse_value:
+            parser.parse("2031-05-02 10:00")
+        self.assertEqual(parse_value.call_args.args[1][0], "%Y-%m-%d %H:%M")
+
+
+class ExcelSerialTest(unittest.TestCase):
+    def test_whole_serial_uses_ordinal_path(self) -> None:
+        self.assertEqual(parsers._parse_date_value("45000", parsers.DATE_FORMATS), (date(2023, 3, 15), SERIAL_FORMAT))
+        self.assertEqual(parse_date_cell("1"), date(1899, 12, 31))
+
+    def test_fractional_serial_matches_timedelta(self) -> None:
+        self.assertEqual(parse_date_cell("45000.75"), date(2023, 3, 15))
+
+    def test_non_positive_serial_is_not_a_date(self) -> None:
+        self.assertIsNone(parse_date_cell("0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import csv
+import json
+import tempfile
+import threading
+import unittest
+from dataclasses import asdict
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from qms_monitor.cli import parse_serve_args
+from qms_monitor.models import LedgerConfig
+from qms_monitor.server import LedgerStore, ReportService, create_server
+
+
+def _write_csv_cache(root: Path) -> Path:
+    cfg = LedgerConfig(
+        row_no=2,
+        topic="偏差",
+        module="偏差管理",
+        year="2025",
+        file_path="D:/ledgers/deviation.xlsx",
+        sheet_name="Sheet1",
+        id_col=0,
+        content_col=1,
+        initiated_col=2,
+        planned_col=3,
+        planned_due_days=None,
+        status_col=4,
+        owner_dept_col=5,
+        owner_col=6,
+        qa_col=7,
+        qa_manager_col=8,
+        open_status_value="进行中",
+        data_start_row=2,
+    )
+    rows = [
+        ["编号", "内容", "发起日期", "计划完成日期", "状态", "责任部门", "责任人", "QA", "QA经理"],
+        ["D-001", "偏差一", "2025-01-05", "2025-02-01", "进行中", "生产部", "张三", "李四", "王五"],
+        ["D-002", "偏差二", "2025-02-10", "2025-04-01", "进行中", "质量部", "赵六", "李四", "王五"],
+        ["D-003", "偏差三", "2025-01-20", "2025-02-20", "已关闭", "生产部", "张三", "李四", "王五"],
+    ]
+    (root / "rows").mkdir()
+    with (root / "rows" / "row_0002.csv").open("w", encoding="utf-8-sig", newline="") as fh:
+        csv.writer(fh).writerows(rows)
+    manifest = {
+        "items": [
+            {
+                "row_no": cfg.row_no,
+                "config": asdict(cfg),
+                "ok": True,
+                "csv_path": "rows/row_0002.csv",
+                "encoding": "utf-8-sig",
+            }
+        ]
+    }
+    manifest_path = root / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    return manifest_path
+
+
+class ServeReportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        args = parse_serve_args(
+            [
+                "--input-mode",
+                "csv",
+                "--csv-manifest",
+                str(_write_csv_cache(root)),
+                "--output-dir",
+                str(root / "outputs"),
+                "--skip-llm",
+                "--no-event-cache",
+                "--port",
+                "0",
+            ]
+        )
+        store = LedgerStore(args, Path(args.config))
+        store.refresh()
+        self.server, _ = create_server(args, ReportService(store, args))
+        self.addCleanup(self.server.server_close)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def _get(self, path: str) -> bytes:
+        with urlopen(f"{self.base_url}{path}", timeout=60) as response:
+            return response.read()
+
+    def test_back_to_back_reports_keep_their_own_outputs(self) -> None:
+        first = json.loads(self._get("/report?report_date=2025-03-01&pdf=0"))
+        second = json.loads(self._get("/report?report_date=2025-05-01&pdf=0"))
+
+        for key in ("report", "detail", "overdue_excel"):
+            self.assertNotEqual(first[key], second[key])
+        self.assertIn("报告日期: 2025-03-01", Path(first["report"]).read_text(encoding="utf-8"))
+        self.assertIn("报告日期: 2025-05-01", Path(second["report"]).read_text(encoding="utf-8"))
+        self.assertEqual(first["overdue_event_count"], 1)
+        self.assertEqual(second["overdue_event_count"], 2)
+
+    def test_markdown_body_matches_requested_date(self) -> None:
+        for report_date in ("2025-03-01", "2025-05-01"):
+            body = self._get(f"/report?report_date={report_date}&pdf=0&format=markdown").decode("utf-8")
+            self.assertIn(f"报告日期: {report_date}", body)
+
+    def test_invalid_parameters_are_client_errors(self) -> None:
+        for query in ("report_date=2025-13-01", "pdf=maybe", "format=html"):
+            with self.assertRaises(HTTPError) as ctx:
+                self._get(f"/report?{query}")
+            self.assertEqual(ctx.exception.code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()